@@ -1,18 +1,24 @@
 """Initialize WiCan Integration."""
 
 import logging
+import secrets
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_IP_ADDRESS, Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import CONF_PUSH_TOKEN, DATA_SHARED, DOMAIN, PUSH_MODE_HTTP
 from .coordinator import WiCanCoordinator
+from .profiler import async_register_profile_service
+from .scheduler import async_get_scheduler
 from .wican import WiCan
 
 PLATFORMS: list[str] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 _LOGGER = logging.getLogger(__name__)
 
+# Coordinators of entries being reloaded, handed to the new coordinator
+DATA_HANDOFF = "handoff"
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """WiCan entry in HomeAssistant.
@@ -31,27 +37,91 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     """
 
-    wican = WiCan(entry.data[CONF_IP_ADDRESS])
-
-    coordinator = WiCanCoordinator(hass, entry, wican)
-
-    # Preload snapshot if available so entities can be created in offline restarts
-    try:
-        await coordinator.async_preload_snapshot()
-    except Exception:
-        # Snapshot preload failures should not block setup; coordinator handles fallback
-        _LOGGER.debug("Snapshot preload skipped due to error", exc_info=True)
-
-    # First refresh may use live data or the preloaded snapshot; if neither
-    # is available, the coordinator raises ConfigEntryNotReady to trigger retry
-    await coordinator.async_config_entry_first_refresh()
+    previous = hass.data.get(DATA_SHARED, {}).get(DATA_HANDOFF, {}).pop(entry.entry_id, None)
+    if previous is not None and previous.api.ip == entry.data[CONF_IP_ADDRESS]:
+        # Reload after an options change: keep the pooled session and car config cache
+        wican = previous.api
+    else:
+        previous = None
+        wican = WiCan(entry.data[CONF_IP_ADDRESS])
+
+    # Shared by all entries: staggers polls and caps concurrent device requests
+    coordinator = WiCanCoordinator(hass, entry, wican, async_get_scheduler(hass))
+
+    if previous is not None:
+        # Warm handoff: reuse the in-memory data instead of reading the snapshot
+        # and blocking on a first refresh; polling starts with the first entity
+        coordinator.adopt(previous)
+    else:
+        # Preload snapshot if available so entities can be created in offline restarts
+        try:
+            preloaded = await coordinator.async_preload_snapshot()
+        except Exception:
+            # Snapshot preload failures should not block setup; coordinator handles fallback
+            _LOGGER.debug("Snapshot preload skipped due to error", exc_info=True)
+            preloaded = False
+
+        if preloaded and coordinator.data.get("pid"):
+            # Fast start: create entities from the snapshot (stale) and keep the
+            # device off the startup path; the first live refresh runs in the background
+            coordinator.async_serve_snapshot()
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{DOMAIN}_{entry.entry_id}_first_refresh",
+            )
+        else:
+            # First refresh may use live data or the preloaded snapshot; if neither
+            # is available, the coordinator raises ConfigEntryNotReady to trigger retry
+            await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    await _async_start_push(hass, coordinator)
+
+    async_register_profile_service(hass)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
+async def _async_start_push(hass: HomeAssistant, coordinator: WiCanCoordinator) -> None:
+    """Start optional push ingestion (MQTT / HTTP); polling keeps running as liveness check and fallback."""
+    if coordinator.push_mode == PUSH_MODE_HTTP:
+        from .view import async_register_push_view
+
+        entry = coordinator.config_entry
+        if not entry.data.get(CONF_PUSH_TOKEN):
+            # Token authenticating HTTP pushes; shown in the options dialog
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_PUSH_TOKEN: secrets.token_urlsafe(32)}
+            )
+        async_register_push_view(hass)
+    await coordinator.async_start_push()
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator, reloading the entry only if needed.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        HomeAssistant object.
+    entry: ConfigEntry
+        WiCan configuration entry in HomeAssistant.
+
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if await coordinator.async_apply_options():
+        await _async_start_push(hass, coordinator)
+        return
+
+    # Entities change: reload, handing the warm coordinator to the new instance
+    hass.data.setdefault(DATA_SHARED, {}).setdefault(DATA_HANDOFF, {})[entry.entry_id] = coordinator
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload WiCan integration.
 
@@ -70,6 +140,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop_push()
+        coordinator.scheduler.unregister(entry.entry_id)
+        await coordinator.async_flush_snapshot()
+        if entry.entry_id not in hass.data.get(DATA_SHARED, {}).get(DATA_HANDOFF, {}):
+            await coordinator.api.async_close()
 
     return unload_ok
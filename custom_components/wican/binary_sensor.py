@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .entity import WiCanPidEntity, WiCanStatusEntity
+from .entity_plan import BINARY_SENSOR, WiCanEntityDescription
 
 
 def binary_state(target_state: str):
@@ -28,6 +29,64 @@ def binary_state(target_state: str):
     return lambda state: STATE_ON if state == target_state else STATE_OFF
 
 
+# Device status binary sensors, independent of the car configuration
+STATUS_BINARY_SENSORS = [
+    (
+        WiCanEntityDescription(
+            key="ble_status",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:bluetooth",
+        ),
+        binary_state("enable"),
+    ),
+    (
+        WiCanEntityDescription(
+            key="sleep_status",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:power-sleep",
+            attributes=(("voltage", "sleep_volt"),),
+        ),
+        binary_state("enable"),
+    ),
+    (
+        WiCanEntityDescription(
+            key="batt_alert",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:battery-alert",
+            attributes=(
+                ("wifi", "batt_alert_ssid"),
+                ("voltage", "batt_alert_volt"),
+                ("url", "batt_alert_url"),
+                ("port", "batt_alert_port"),
+                ("user", "batt_mqtt_user"),
+            ),
+        ),
+        binary_state("enable"),
+    ),
+    (
+        WiCanEntityDescription(
+            key="mqtt_en",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:broadcast",
+            attributes=(
+                ("url", "mqtt_url"),
+                ("port", "mqtt_port"),
+                ("user", "mqtt_user"),
+            ),
+        ),
+        binary_state("enable"),
+    ),
+    (
+        WiCanEntityDescription(
+            key="ecu_status",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:chip",
+        ),
+        binary_state("online"),
+    ),
+]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """Create and provide list of binary sensors containing WiCanStatusEntities and WiCanPidEntities.
 
@@ -48,99 +107,19 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
     if not coordinator.data["status"]:
         return None
 
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "ble_status",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:bluetooth",
-            },
-            binary_state("enable"),
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "sleep_status",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:power-sleep",
-                "attributes": {"voltage": "sleep_volt"},
-            },
-            binary_state("enable"),
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "batt_alert",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:battery-alert",
-                "attributes": {
-                    "wifi": "batt_alert_ssid",
-                    "voltage": "batt_alert_volt",
-                    "url": "batt_alert_url",
-                    "port": "batt_alert_port",
-                    "user": "batt_mqtt_user",
-                },
-            },
-            binary_state("enable"),
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "mqtt_en",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:broadcast",
-                "attributes": {
-                    "url": "mqtt_url",
-                    "port": "mqtt_port",
-                    "user": "mqtt_user",
-                },
-            },
-            binary_state("enable"),
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "ecu_status",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:chip",
-                "target_state": "online",
-            },
-            binary_state("online"),
-        )
-    )
+    entities = [
+        WiCanStatusEntity(coordinator, description, process_state)
+        for description, process_state in STATUS_BINARY_SENSORS
+    ]
 
-    if not coordinator.ecu_online:
-        async_add_entities(entities)
-
-    if not coordinator.data["pid"]:
-        return async_add_entities(entities)
-
-    for key in coordinator.data["pid"]:
-        if coordinator.data["pid"][key].get("sensor_type") is not None:
-            if coordinator.data["pid"][key]["sensor_type"] == "binary_sensor":
-                entities.append(
-                    WiCanPidEntity(
-                        coordinator,
-                        {
-                            "key": key,
-                            "name": key,
-                            "class": coordinator.data["pid"][key]["class"],
-                        },
-                        binary_state("on"),
-                    )
-                )
+    # PID binary sensors come from the entity plan shared with the sensor platform
+    pid_state = binary_state("on")
+    entities.extend(
+        WiCanPidEntity(coordinator, description, pid_state)
+        for description in coordinator.entity_plan().pids[BINARY_SENSOR]
+    )
 
     return async_add_entities(entities)
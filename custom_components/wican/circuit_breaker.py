@@ -0,0 +1,86 @@
+"""Circuit breaker for WiCAN device API calls.
+
+Purpose: stop spending full request timeouts on a device that is known to be
+unreachable (e.g. car away from home) and only send cheap probes until it
+answers again.
+"""
+
+from __future__ import annotations
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker.
+
+    Attributes
+    ----------
+    failure_threshold: int
+        Consecutive failures after which the circuit opens.
+    reset_timeout: float
+        Seconds the circuit stays open before a half-open probe is allowed.
+    state: str
+        Current state, one of "closed", "open" or "half_open".
+
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0) -> None:
+        """Initialize a closed circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now.
+
+        While open, this moves the circuit to half-open once ``reset_timeout``
+        has passed, so exactly one probe is let through.
+        """
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN:
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = STATE_HALF_OPEN
+                return True
+            return False
+        # Half-open: the probe decides, no further requests until it reports back
+        return False
+
+    def record_success(self) -> bool:
+        """Close the circuit after a successful request.
+
+        Returns
+        -------
+        bool
+            True if the circuit was not closed before (device recovered).
+
+        """
+        recovered = self.state != STATE_CLOSED
+        self.state = STATE_CLOSED
+        self.failures = 0
+        return recovered
+
+    def record_failure(self) -> bool:
+        """Count a failed request and open the circuit if the threshold is reached.
+
+        Returns
+        -------
+        bool
+            True if the circuit has just opened.
+
+        """
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED and self.failures >= self.failure_threshold
+        ):
+            opened = self.state == STATE_CLOSED
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
+            return opened
+        return False
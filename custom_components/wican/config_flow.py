@@ -10,7 +10,31 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_IP_ADDRESS, CONF_SCAN_INTERVAL
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import CONF_DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_BACKOFF_MAX_INTERVAL,
+    CONF_DEFAULT_BACKOFF_MAX_INTERVAL,
+    CONF_DEFAULT_DIAGNOSTIC_SENSORS,
+    CONF_DEFAULT_FAILURE_THRESHOLD,
+    CONF_DEFAULT_HISTORY_SAMPLES,
+    CONF_DEFAULT_MQTT_TOPIC,
+    CONF_DEFAULT_SCAN_INTERVAL,
+    CONF_DEFAULT_SCAN_INTERVAL_ECU_OFFLINE,
+    CONF_DEFAULT_SCAN_INTERVAL_UNREACHABLE,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FAILURE_THRESHOLD,
+    CONF_HISTORY_SAMPLES,
+    CONF_MAX_HISTORY_SAMPLES,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MQTT_TOPIC,
+    CONF_PUSH_MODE,
+    CONF_PUSH_TOKEN,
+    CONF_SCAN_INTERVAL_ECU_OFFLINE,
+    CONF_SCAN_INTERVAL_UNREACHABLE,
+    DOMAIN,
+    PUSH_MODE_POLL,
+    PUSH_MODES,
+    PUSH_URL,
+)
 from .wican import WiCan
 
 DATA_SCHEMA = vol.Schema(
@@ -19,7 +43,33 @@ DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL, default=CONF_DEFAULT_SCAN_INTERVAL): int,
     }
 )
-OPTIONS_SCHEMA = vol.Schema({vol.Required(CONF_SCAN_INTERVAL): int})
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SCAN_INTERVAL): int,
+        vol.Required(
+            CONF_SCAN_INTERVAL_ECU_OFFLINE,
+            default=CONF_DEFAULT_SCAN_INTERVAL_ECU_OFFLINE,
+        ): int,
+        vol.Required(
+            CONF_SCAN_INTERVAL_UNREACHABLE,
+            default=CONF_DEFAULT_SCAN_INTERVAL_UNREACHABLE,
+        ): int,
+        vol.Required(
+            CONF_BACKOFF_MAX_INTERVAL, default=CONF_DEFAULT_BACKOFF_MAX_INTERVAL
+        ): int,
+        vol.Required(
+            CONF_FAILURE_THRESHOLD, default=CONF_DEFAULT_FAILURE_THRESHOLD
+        ): int,
+        vol.Required(CONF_PUSH_MODE, default=PUSH_MODE_POLL): vol.In(PUSH_MODES),
+        vol.Required(CONF_MQTT_TOPIC, default=CONF_DEFAULT_MQTT_TOPIC): str,
+        vol.Required(
+            CONF_DIAGNOSTIC_SENSORS, default=CONF_DEFAULT_DIAGNOSTIC_SENSORS
+        ): bool,
+        vol.Required(
+            CONF_HISTORY_SAMPLES, default=CONF_DEFAULT_HISTORY_SAMPLES
+        ): vol.All(int, vol.Range(min=0, max=CONF_MAX_HISTORY_SAMPLES)),
+    }
+)
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -54,13 +104,13 @@ class WiCanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             ip = user_input[CONF_IP_ADDRESS]
+            wican = WiCan(ip)
             try:
-                wican = WiCan(ip)
                 info = await wican.test()
 
                 if info:
                     user_input[CONF_SCAN_INTERVAL] = max(
-                        5, user_input[CONF_SCAN_INTERVAL]
+                        CONF_MIN_SCAN_INTERVAL, user_input[CONF_SCAN_INTERVAL]
                     )
                     return self.async_create_entry(title="WiCAN", data=user_input)
                 else:
@@ -71,6 +121,8 @@ class WiCanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            finally:
+                await wican.async_close()
 
         return self.async_show_form(
             step_id="user", data_schema=DATA_SCHEMA, errors=errors
@@ -92,7 +144,18 @@ class WiCanOptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            user_input[CONF_SCAN_INTERVAL] = max(5, user_input[CONF_SCAN_INTERVAL])
+            for key in (
+                CONF_SCAN_INTERVAL,
+                CONF_SCAN_INTERVAL_ECU_OFFLINE,
+                CONF_SCAN_INTERVAL_UNREACHABLE,
+            ):
+                user_input[key] = max(CONF_MIN_SCAN_INTERVAL, user_input[key])
+            # Backoff never waits less than the first unreachable retry
+            user_input[CONF_BACKOFF_MAX_INTERVAL] = max(
+                user_input[CONF_SCAN_INTERVAL_UNREACHABLE],
+                user_input[CONF_BACKOFF_MAX_INTERVAL],
+            )
+            user_input[CONF_FAILURE_THRESHOLD] = max(1, user_input[CONF_FAILURE_THRESHOLD])
             return self.async_create_entry(data=user_input)
 
         return self.async_show_form(
@@ -100,5 +163,9 @@ class WiCanOptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=self.add_suggested_values_to_schema(
                 OPTIONS_SCHEMA, self.config_entry.options
             ),
+            description_placeholders={
+                "push_url": PUSH_URL.format(entry_id=self.config_entry.entry_id),
+                "push_token": self.config_entry.data.get(CONF_PUSH_TOKEN, "-"),
+            },
         )
 
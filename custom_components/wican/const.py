@@ -1,4 +1,43 @@
 """Constants for WiCAN integration."""
 
 DOMAIN = "wican"
+# hass.data key of the objects shared by all entries (scheduler, profiler, ...);
+# hass.data[DOMAIN] only holds the coordinators, keyed by entry ID
+DATA_SHARED = f"{DOMAIN}_shared"
 CONF_DEFAULT_SCAN_INTERVAL = 30
+
+# Adaptive polling: separate intervals per device / ECU state
+CONF_SCAN_INTERVAL_ECU_OFFLINE = "scan_interval_ecu_offline"
+CONF_SCAN_INTERVAL_UNREACHABLE = "scan_interval_unreachable"
+CONF_BACKOFF_MAX_INTERVAL = "backoff_max_interval"
+CONF_DEFAULT_SCAN_INTERVAL_ECU_OFFLINE = 60
+CONF_DEFAULT_SCAN_INTERVAL_UNREACHABLE = 30
+CONF_DEFAULT_BACKOFF_MAX_INTERVAL = 900
+CONF_MIN_SCAN_INTERVAL = 5
+
+# Circuit breaker: consecutive failed polls before requests are paused
+CONF_FAILURE_THRESHOLD = "failure_threshold"
+CONF_DEFAULT_FAILURE_THRESHOLD = 3
+
+# Push ingestion: receive AutoPID values instead of polling them over HTTP
+CONF_PUSH_MODE = "push_mode"
+PUSH_MODE_POLL = "poll"
+PUSH_MODE_MQTT = "mqtt"
+PUSH_MODE_HTTP = "http"
+PUSH_MODES = [PUSH_MODE_POLL, PUSH_MODE_MQTT, PUSH_MODE_HTTP]
+CONF_MQTT_TOPIC = "mqtt_topic"
+CONF_DEFAULT_MQTT_TOPIC = "wican/{device_id}/autopid"
+
+# HTTP push endpoint: per-entry token and maximum accepted payload size
+CONF_PUSH_TOKEN = "push_token"
+PUSH_URL = "/api/wican/push/{entry_id}"
+PUSH_MAX_PAYLOAD_BYTES = 64 * 1024
+
+# Optional diagnostic sensors for poll performance (duration, failures, data age)
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_DEFAULT_DIAGNOSTIC_SENSORS = False
+
+# Optional rolling PID history: samples kept per PID for min/max/mean/stddev/rate attributes
+CONF_HISTORY_SAMPLES = "history_samples"
+CONF_DEFAULT_HISTORY_SAMPLES = 0
+CONF_MAX_HISTORY_SAMPLES = 3600
@@ -6,24 +6,67 @@ snapshot to support offline startup with cached state.
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Mapping
+from contextlib import nullcontext
 from datetime import timedelta
+import json
 import logging
+import random
+import time
 from typing import Any, Optional, TypedDict
 
 from homeassistant.const import CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
-from .const import CONF_DEFAULT_SCAN_INTERVAL, DOMAIN
+from .circuit_breaker import STATE_HALF_OPEN, CircuitBreaker
+from .const import (
+    CONF_BACKOFF_MAX_INTERVAL,
+    CONF_DEFAULT_BACKOFF_MAX_INTERVAL,
+    CONF_DEFAULT_DIAGNOSTIC_SENSORS,
+    CONF_DEFAULT_FAILURE_THRESHOLD,
+    CONF_DEFAULT_HISTORY_SAMPLES,
+    CONF_DEFAULT_SCAN_INTERVAL,
+    CONF_DEFAULT_SCAN_INTERVAL_ECU_OFFLINE,
+    CONF_DEFAULT_SCAN_INTERVAL_UNREACHABLE,
+    CONF_DEFAULT_MQTT_TOPIC,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FAILURE_THRESHOLD,
+    CONF_HISTORY_SAMPLES,
+    CONF_MQTT_TOPIC,
+    CONF_PUSH_MODE,
+    CONF_SCAN_INTERVAL_ECU_OFFLINE,
+    CONF_SCAN_INTERVAL_UNREACHABLE,
+    DOMAIN,
+    PUSH_MODE_MQTT,
+    PUSH_MODE_POLL,
+)
+from .cycle_view import CycleView
+from .entity_plan import EntityPlan, pid_fingerprint
+from .history import PidHistory
+from .metrics import WiCanMetrics
+from .pid_table import PidTable
 
 _LOGGER = logging.getLogger(__name__)
 
+# Half-open probes only need to tell whether the device answers at all
+PROBE_TIMEOUT = 2.0
+BREAKER_RESET_TIMEOUT = 60.0
+# Without a push for this long, PIDs are polled over HTTP again
+PUSH_MAX_AGE = 60.0
+# Listener context for entities depending on several status keys (attributes)
+CONTEXT_ANY_STATUS = ("status", "*")
+
+
+SNAPSHOT_VERSION = 2
+
 
 class Snapshot(TypedDict):
-    """Minimal persisted snapshot schema for offline startup.
+    """In-memory snapshot schema for offline startup.
 
     Keys
     ----
@@ -43,6 +86,127 @@ class Snapshot(TypedDict):
     timestamp: str
 
 
+class StoredSnapshot(TypedDict):
+    """Compact on-disk snapshot schema (storage version 2).
+
+    Keys
+    ----
+    device_id: str
+        Device identifier used in entity unique_id.
+    status: dict
+        Last known device status payload from `/check_status`.
+    car_config: dict
+        Car configuration metadata stored once: {"fingerprint": str, "pids": {PID: metadata}}.
+    values: dict
+        Last known good value per PID.
+    timestamp: str
+        UTC ISO8601 timestamp when the snapshot was written.
+    """
+
+    device_id: str
+    status: dict
+    car_config: dict
+    values: dict
+    timestamp: str
+
+
+def compact_snapshot(
+    snapshot: Snapshot, values: dict, fingerprint: str | None = None
+) -> StoredSnapshot:
+    """Split a snapshot into car configuration metadata and a value table.
+
+    Parameters
+    ----------
+    snapshot: Snapshot
+        Snapshot with combined metadata + value per PID.
+    values: dict
+        Values to store per PID; PIDs without a value are left out.
+    fingerprint: str, optional
+        Fingerprint of the car configuration (e.g. ``WiCan.car_config_fingerprint``);
+        hashed from the metadata if None.
+
+    """
+    pid = snapshot.get("pid") if isinstance(snapshot.get("pid"), Mapping) else {}
+    meta = {
+        key: {k: v for k, v in entry.items() if k != "value"}
+        for key, entry in pid.items()
+        if isinstance(entry, dict)
+    }
+    return {
+        "device_id": snapshot.get("device_id"),
+        "status": snapshot.get("status"),
+        "car_config": {"fingerprint": fingerprint or pid_fingerprint(meta), "pids": meta},
+        "values": {key: values[key] for key in meta if key in values},
+        "timestamp": snapshot.get("timestamp"),
+    }
+
+
+def expand_snapshot(stored: StoredSnapshot) -> Snapshot:
+    """Combine car configuration metadata and value table into a snapshot."""
+    values = stored.get("values") or {}
+    pids = (stored.get("car_config") or {}).get("pids") or {}
+    return {
+        "device_id": stored.get("device_id"),
+        "status": stored.get("status"),
+        "pid": {key: {**meta, "value": values.get(key)} for key, meta in pids.items()},
+        "timestamp": stored.get("timestamp"),
+    }
+
+
+def migrate_snapshot_v1(snapshot: dict) -> dict:
+    """Convert a version 1 snapshot (metadata duplicated next to every value) to version 2."""
+    pid = snapshot.get("pid") if isinstance(snapshot.get("pid"), dict) else {}
+    values = {
+        key: entry["value"]
+        for key, entry in pid.items()
+        if isinstance(entry, dict)
+        and entry.get("value") is not None
+        and entry.get("value") is not False
+    }
+    return compact_snapshot(snapshot, values)  # type: ignore[arg-type]
+
+
+class SnapshotStore(Store):
+    """Store for WiCAN snapshots, migrating older storage versions."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Migrate a stored snapshot to the current storage version."""
+        if old_major_version == 1 and isinstance(old_data, dict):
+            return migrate_snapshot_v1(old_data)
+        return old_data
+
+
+def read_options(config_entry) -> dict:
+    """Return the runtime options of a config entry (options first, then entry data, then defaults)."""
+
+    def option(key, default):
+        return config_entry.options.get(key, config_entry.data.get(key, default))
+
+    return {
+        CONF_SCAN_INTERVAL: option(CONF_SCAN_INTERVAL, CONF_DEFAULT_SCAN_INTERVAL),
+        CONF_SCAN_INTERVAL_ECU_OFFLINE: option(
+            CONF_SCAN_INTERVAL_ECU_OFFLINE, CONF_DEFAULT_SCAN_INTERVAL_ECU_OFFLINE
+        ),
+        CONF_SCAN_INTERVAL_UNREACHABLE: option(
+            CONF_SCAN_INTERVAL_UNREACHABLE, CONF_DEFAULT_SCAN_INTERVAL_UNREACHABLE
+        ),
+        CONF_BACKOFF_MAX_INTERVAL: option(
+            CONF_BACKOFF_MAX_INTERVAL, CONF_DEFAULT_BACKOFF_MAX_INTERVAL
+        ),
+        CONF_FAILURE_THRESHOLD: option(
+            CONF_FAILURE_THRESHOLD, CONF_DEFAULT_FAILURE_THRESHOLD
+        ),
+        CONF_PUSH_MODE: option(CONF_PUSH_MODE, PUSH_MODE_POLL),
+        CONF_MQTT_TOPIC: option(CONF_MQTT_TOPIC, CONF_DEFAULT_MQTT_TOPIC),
+        CONF_DIAGNOSTIC_SENSORS: option(
+            CONF_DIAGNOSTIC_SENSORS, CONF_DEFAULT_DIAGNOSTIC_SENSORS
+        ),
+        CONF_HISTORY_SAMPLES: option(
+            CONF_HISTORY_SAMPLES, CONF_DEFAULT_HISTORY_SAMPLES
+        ),
+    }
+
+
 class WiCanCoordinator(DataUpdateCoordinator):
     """WiCAN Coordinator class based on HomeAssistant DataUpdateCoordinator.
 
@@ -53,36 +217,355 @@ class WiCanCoordinator(DataUpdateCoordinator):
     data: dict
         Inherited from DataUpdateCoordinator.
         dict is created and filled from WiCan API with first call of method "_async_update_data".
+    pipelined_poll: bool
+        Request status and PIDs concurrently while the ECU is known to be online.
+    scheduler: WiCanScheduler | None
+        Integration-wide scheduler staggering and limiting polls, if any.
+    metrics: WiCanMetrics
+        Poll, entity fan-out and snapshot persistence timings and counters.
+    history: PidHistory | None
+        Rolling PID history for statistics attributes, None if disabled.
 
     """
 
     ecu_online = False
+    pipelined_poll = True
 
-    def __init__(self, hass: HomeAssistant, config_entry, api) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry, api, scheduler=None) -> None:
         """Initialize a WiCanCoordinator and set the WiCan device API."""
-        SCAN_INTERVAL = timedelta(
-            seconds=config_entry.options.get(
-                CONF_SCAN_INTERVAL,
-                config_entry.data.get(CONF_SCAN_INTERVAL, CONF_DEFAULT_SCAN_INTERVAL),
-            )
-        )
+        options = read_options(config_entry)
+        # Adaptive polling intervals in seconds, chosen after every poll
+        self._set_polling_options(options)
+        SCAN_INTERVAL = timedelta(seconds=self.interval_ecu_online)
         super().__init__(
             hass, _LOGGER, name="WiCAN Coordinator", update_interval=SCAN_INTERVAL
         )
         self.api = api
+        self.config_entry = config_entry
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.register(config_entry.entry_id)
+        # Consecutive polls with the device unreachable, drives exponential backoff
+        self._unreachable_polls: int = 0
+        self._breaker = CircuitBreaker(
+            failure_threshold=options[CONF_FAILURE_THRESHOLD],
+            reset_timeout=BREAKER_RESET_TIMEOUT,
+        )
         # Storage for last-known snapshot
-        self._store: Store = Store(
-            hass, 1, f"{DOMAIN}_{config_entry.entry_id}_snapshot"
+        self._store: Store = SnapshotStore(
+            hass, SNAPSHOT_VERSION, f"{DOMAIN}_{config_entry.entry_id}_snapshot"
         )
-        self._last_persist_utc: Optional[str] = None
-        # Debounce writes to avoid excessive I/O
+        # In-memory snapshot, written behind to storage to avoid excessive I/O
+        self._snapshot: Optional[Snapshot] = None
+        self._persisted_revision: Optional[tuple] = None
+        self._pending_revision: Optional[tuple] = None
+        self._persist_scheduled: bool = False
+        # Last known good value per PID, updated as values arrive
+        self._last_good: dict[str, Any] = {}
+        self._last_good_version: int = 0
         self._persist_min_interval_sec: int = 30
         # Offline tolerance tracking
         self._stale: bool = False
         self.last_successful_update: Optional[dt_util.datetime] = None
+        self._last_ecu_status: Optional[str] = None
+        # Push ingestion (MQTT): HTTP is then only used for status and car config
+        self.push_mode: str = options[CONF_PUSH_MODE]
+        self.mqtt_topic: str = options[CONF_MQTT_TOPIC]
+        self._last_push: Optional[float] = None
+        # Pushed keys outside the car configuration that already triggered a reload
+        self._unknown_push_keys: set = set()
+        self._unsub_push = None
+        # Changed-only dispatch: listeners indexed by ("status" | "pid", key)
+        self._key_listeners: dict[tuple, list] = {}
+        self._generic_listeners: list = []
+        self._changed_contexts: Optional[set] = None
+        self._dispatched_stale: bool = False
+        self.metrics = WiCanMetrics()
+        # Optional sensors exposing poll performance (see get_metric)
+        self.diagnostic_sensors: bool = options[CONF_DIAGNOSTIC_SENSORS]
+        self._pids_last_poll: Optional[int] = None
+        # Set by the wican.profile service while this coordinator is profiled
+        self.profiler = None
+        # A profiled poll cycle ends with the dispatch of its result, not with a push
+        self._profiled_dispatch_pending = False
+        # Entities to create for the current car configuration, see entity_plan()
+        self._entity_plan: Optional[EntityPlan] = None
+        # Values shared by all entities until the next update, see cycle_view()
+        self._cycle_view: Optional[CycleView] = None
+        self.history: Optional[PidHistory] = None
+        self._set_history(options[CONF_HISTORY_SAMPLES])
+
+    def _set_polling_options(self, options: dict) -> None:
+        """Set the adaptive polling intervals from the given options."""
+        self.interval_ecu_online: int = options[CONF_SCAN_INTERVAL]
+        self.interval_ecu_offline: int = options[CONF_SCAN_INTERVAL_ECU_OFFLINE]
+        self.interval_unreachable: int = options[CONF_SCAN_INTERVAL_UNREACHABLE]
+        self.backoff_max_interval: int = options[CONF_BACKOFF_MAX_INTERVAL]
+
+    def _set_history(self, samples: int) -> None:
+        """Enable, resize or disable the rolling PID history."""
+        if not samples:
+            self.history = None
+        elif self.history is None:
+            self.history = PidHistory(samples)
+        elif self.history.size != samples:
+            self.history.resize(samples)
+
+    async def async_apply_options(self) -> bool:
+        """Apply the current options of the config entry to this running coordinator.
+
+        Polling intervals, the failure threshold, the PID history and the push
+        settings change in place. The caller starts push ingestion again afterwards.
+
+        Returns
+        -------
+        bool
+            False if an option changes the set of entities and the entry has to be reloaded.
+
+        """
+        options = read_options(self.config_entry)
+        if options[CONF_DIAGNOSTIC_SENSORS] != self.diagnostic_sensors:
+            return False
+
+        polling = (
+            self.interval_ecu_online,
+            self.interval_ecu_offline,
+            self.interval_unreachable,
+            self.backoff_max_interval,
+        )
+        self._set_polling_options(options)
+        self._breaker.failure_threshold = options[CONF_FAILURE_THRESHOLD]
+        self._set_history(options[CONF_HISTORY_SAMPLES])
+        if (self.push_mode, self.mqtt_topic) != (
+            options[CONF_PUSH_MODE],
+            options[CONF_MQTT_TOPIC],
+        ):
+            self.async_stop_push()
+            self.push_mode = options[CONF_PUSH_MODE]
+            self.mqtt_topic = options[CONF_MQTT_TOPIC]
+
+        if polling != (
+            self.interval_ecu_online,
+            self.interval_ecu_offline,
+            self.interval_unreachable,
+            self.backoff_max_interval,
+        ):
+            # Poll now so the next poll is scheduled with the new interval
+            self.update_interval = timedelta(seconds=self.next_poll_interval())
+            await self.async_request_refresh()
+        return True
+
+    def adopt(self, previous: WiCanCoordinator) -> None:
+        """Take over the in-memory state of the coordinator replaced by an entry reload.
+
+        The new coordinator starts with the previous data, snapshot and
+        last-known-good values, so no first refresh or storage read is needed.
+        """
+        self.data = previous.data
+        self.ecu_online = previous.ecu_online
+        self.last_successful_update = previous.last_successful_update
+        self.metrics = previous.metrics
+        self._stale = previous._stale
+        self._last_ecu_status = previous._last_ecu_status
+        self._unreachable_polls = previous._unreachable_polls
+        self._breaker = previous._breaker
+        self._breaker.failure_threshold = read_options(self.config_entry)[
+            CONF_FAILURE_THRESHOLD
+        ]
+        self._snapshot = previous._snapshot
+        self._persisted_revision = previous._persisted_revision
+        self._pending_revision = previous._pending_revision
+        self._last_good = previous._last_good
+        self._last_good_version = previous._last_good_version
+        self._pids_last_poll = previous._pids_last_poll
+        self._entity_plan = previous._entity_plan
+        self._cycle_view = None
+        if (
+            self.history is not None
+            and previous.history is not None
+            and previous.history.size == self.history.size
+        ):
+            # Keep the recorded samples
+            self.history = previous.history
+        self.update_interval = timedelta(seconds=self.next_poll_interval())
 
     async def _async_update_data(self):
-        return await self.get_data()
+        if self.profiler is None:
+            return await self._async_poll()
+        # Profiled cycle: from the poll to the end of the entity fan-out
+        self.profiler.start_cycle(self)
+        try:
+            data = await self._async_poll()
+        except BaseException:
+            if self.profiler is not None:
+                self.profiler.end_cycle(self)
+            raise
+        self._profiled_dispatch_pending = True
+        return data
+
+    def _profile_section(self):
+        """Return a context profiling a synchronous section while the profiler is attached."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.section()
+
+    async def _async_poll(self):
+        # Failed refreshes notify every entity (availability changes)
+        self._changed_contexts = None
+        started = time.perf_counter()
+        try:
+            if self.scheduler is None:
+                data = await self.get_data()
+            else:
+                async with self.scheduler.poll_slot():
+                    data = await self.get_data()
+        finally:
+            self.metrics.record("poll", time.perf_counter() - started)
+            self.update_interval = timedelta(seconds=self.next_poll_interval())
+        ok = not self._unreachable_polls
+        self.metrics.increment("poll.success" if ok else "poll.unreachable")
+        if self.scheduler is not None:
+            self.scheduler.record_poll(ok, len(data.get("pid") or {}) if ok else 0)
+        with self._profile_section():
+            self._changed_contexts = self._diff_contexts(self.data, data)
+        return data
+
+    def _diff_contexts(self, old, new) -> set | None:
+        """Return the listener contexts whose values differ between two data dicts.
+
+        Returns None if every entity has to be notified: on the first update,
+        when the stale flag flipped or when the set of status / PID keys changed.
+        """
+        old_pid = (old or {}).get("pid") or {}
+        new_pid = (new or {}).get("pid") or {}
+        # Tables updated in place track their changed PIDs; always consume them
+        pid_changes = new_pid.take_changes() if isinstance(new_pid, PidTable) else None
+        if not old or not new or self._stale != self._dispatched_stale:
+            return None
+        old_status = old.get("status") or {}
+        new_status = new.get("status") or {}
+        if old_status.keys() != new_status.keys() or old_pid.keys() != new_pid.keys():
+            return None
+
+        changed = {
+            ("status", key)
+            for key, value in new_status.items()
+            if old_status[key] != value
+        }
+        if changed:
+            changed.add(CONTEXT_ANY_STATUS)
+        if self.history is not None:
+            # History attributes move with every sample, also for unchanged values
+            changed.update(("pid", key) for key in new_pid)
+        elif new_pid is old_pid and pid_changes is not None:
+            changed.update(("pid", key) for key in pid_changes)
+        else:
+            for key, entry in new_pid.items():
+                if old_pid[key].get("value") != entry.get("value"):
+                    changed.add(("pid", key))
+        return changed
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for data updates, indexed by context.
+
+        Entities pass ("status", key) or ("pid", key) as context and are only
+        called when that key changed; other listeners are called on every update.
+        """
+        remove = super().async_add_listener(update_callback, context)
+        if isinstance(context, tuple):
+            listeners = self._key_listeners.setdefault(context, [])
+        else:
+            listeners = self._generic_listeners
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            listeners.remove(update_callback)
+            if not listeners and isinstance(context, tuple):
+                self._key_listeners.pop(context, None)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners of the keys changed in this cycle, or all if unknown."""
+        changed = self._changed_contexts
+        self._changed_contexts = None
+        self._dispatched_stale = self._stale
+        self._cycle_view = None
+        started = time.perf_counter()
+        with self._profile_section():
+            if changed is None:
+                super().async_update_listeners()
+            else:
+                for update_callback in list(self._generic_listeners):
+                    update_callback()
+                for context in changed:
+                    for update_callback in list(self._key_listeners.get(context, ())):
+                        update_callback()
+        self.metrics.record("fan_out", time.perf_counter() - started)
+        if self._profiled_dispatch_pending:
+            self._profiled_dispatch_pending = False
+            if self.profiler is not None:
+                self.profiler.end_cycle(self)
+
+    def next_poll_interval(self) -> float:
+        """Return the delay in seconds until the next poll, based on the last poll result.
+
+        Uses the ECU online interval while the car is on, the ECU offline interval
+        while only the WiCAN answers, and exponential backoff with jitter starting
+        at the unreachable interval while the device cannot be reached.
+        """
+        if self._unreachable_polls:
+            backoff = self.interval_unreachable * 2 ** (self._unreachable_polls - 1)
+            backoff = min(backoff, self.backoff_max_interval)
+            # +/-20% jitter so several devices do not retry in lockstep
+            jittered = backoff * random.uniform(0.8, 1.2)
+            return min(
+                self.backoff_max_interval, max(self.interval_unreachable, jittered)
+            )
+        if self._last_ecu_status == "online":
+            interval = self.interval_ecu_online
+        else:
+            interval = self.interval_ecu_offline
+        if self.scheduler is not None:
+            # Keep regular polls on this entry's phase so entries do not poll in bursts
+            return self.scheduler.align(self.config_entry.entry_id, interval)
+        return interval
+
+    async def _check_status(self):
+        """Request the device status through the circuit breaker.
+
+        While the circuit is open no request is sent at all; once the reset
+        timeout has passed a single probe with a short timeout is let through.
+        """
+        if not self._breaker.allow_request():
+            return False
+
+        try:
+            if self._breaker.state == STATE_HALF_OPEN:
+                status = await self.api.check_status(timeout_total=PROBE_TIMEOUT)
+            else:
+                status = await self.api.check_status()
+        except asyncio.CancelledError:
+            # Never leave the breaker half open, or no probe is ever sent again
+            self._breaker.record_failure()
+            raise
+        except Exception as err:  # e.g. a body that is not JSON
+            _LOGGER.debug("WiCAN status request failed: %s", err)
+            status = False
+
+        if status:
+            if self._breaker.record_success():
+                _LOGGER.info("WiCAN device reachable again")
+        elif self._breaker.record_failure():
+            _LOGGER.warning(
+                "WiCAN device unreachable after %s attempts; only probing on each poll until it answers",
+                self._breaker.failures,
+            )
+        return status
 
     async def get_data(self):
         """Check, if WiCan API is available and return data dictionary containing car configuration and data (PIDs) using the WiCan API.
@@ -95,21 +578,43 @@ class WiCanCoordinator(DataUpdateCoordinator):
 
         """
         data: dict[str, Any] = {}
-        status = await self.api.check_status()
+        pid = None
+        # Optimistic pipelining: while the ECU was online in the previous cycle,
+        # request status and PIDs together and drop the PIDs if status fails.
+        # The values are only merged into the shared PID table once status succeeded.
+        fetch_pid = not self.push_fresh()
+        pipelined = (
+            fetch_pid
+            and self.pipelined_poll
+            and self._last_ecu_status == "online"
+            and not self._stale
+        )
+        if pipelined:
+            status, values = await asyncio.gather(
+                self._check_status(), self.api.fetch_pid_values()
+            )
+            if status and values is not False:
+                pid = self.api.merge_pid_values(values)
+        else:
+            status = await self._check_status()
 
         if not status:
+            self._last_ecu_status = None
+            self._unreachable_polls += 1
+            # Only the first failed poll of an outage is logged as warning
+            log_level = logging.WARNING if self._unreachable_polls == 1 else logging.DEBUG
             # Device offline/unreachable: prefer in-memory data, then snapshot, else first-run failure
             if self.data and isinstance(self.data.get("status"), dict):
-                _LOGGER.warning("WiCAN device offline; serving stale in-memory data")
+                _LOGGER.log(log_level, "WiCAN device offline; serving stale in-memory data")
                 self._stale = True
                 return self.data
 
             snapshot = await self._load_snapshot()
             if snapshot is not None:
-                _LOGGER.warning("WiCAN device offline; using cached snapshot")
+                _LOGGER.log(log_level, "WiCAN device offline; using cached snapshot")
                 self._stale = True
                 data["status"] = snapshot.get("status")
-                data["pid"] = snapshot.get("pid")
+                data["pid"] = PidTable.from_entries(snapshot.get("pid") or {})
                 # Best-effort ECU marker from snapshot
                 self.ecu_online = (
                     isinstance(data["status"], dict)
@@ -125,6 +630,12 @@ class WiCanCoordinator(DataUpdateCoordinator):
             )
 
         data["status"] = status
+        self._unreachable_polls = 0
+        ecu_status = status.get("ecu_status")
+        if ecu_status == "online" and self._last_ecu_status != "online":
+            # ECU (re)connected: the car profile may have changed while it was off
+            self.api.invalidate_car_config()
+        self._last_ecu_status = ecu_status
         self.ecu_online = True
         # self.ecu_online = data['status']['ecu_status'] == 'online'
 
@@ -139,8 +650,24 @@ class WiCanCoordinator(DataUpdateCoordinator):
             )
             return data
 
-        pid = await self.api.get_pid()
-        data["pid"] = pid if pid else {}
+        if not fetch_pid:
+            # Values arrive via push; keep the latest pushed PIDs
+            pid = self.data.get("pid") if self.data else None
+        elif not pipelined:
+            pid = await self.api.get_pid()
+        with self._profile_section():
+            previous = (self.data or {}).get("pid")
+            data["pid"] = self._as_pid_table(pid) if pid else PidTable(())
+            if fetch_pid:
+                # Same table as before: only the slots this poll changed can hold new values
+                self._record_pid_values(
+                    data["pid"], data["pid"].changed_keys() if data["pid"] is previous else None
+                )
+                self._check_entity_plan(data["pid"])
+                self._pids_last_poll = data["pid"].valid_count()
+                # A failed PID fetch is no sample; its empty table would reset the history
+                if self.history is not None and pid:
+                    self.history.record(data["pid"], time.monotonic())
 
         # Persist minimal snapshot after a successful poll
         try:
@@ -163,11 +690,116 @@ class WiCanCoordinator(DataUpdateCoordinator):
 
         return data
 
+    def push_fresh(self) -> bool:
+        """Return True if PID values were pushed recently enough to skip HTTP polling."""
+        return (
+            self._last_push is not None
+            and time.monotonic() - self._last_push < PUSH_MAX_AGE
+        )
+
+    async def async_start_push(self) -> None:
+        """Subscribe to the AutoPID MQTT topic of the device, if push mode is MQTT."""
+        if self.push_mode != PUSH_MODE_MQTT or self._unsub_push is not None:
+            return
+
+        from homeassistant.components import mqtt
+
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.warning("MQTT not available; WiCAN falls back to HTTP polling")
+            return
+
+        device_id = (self.data or {}).get("status", {}).get("device_id", "")
+        topic = self.mqtt_topic.format(device_id=device_id)
+        self._unsub_push = await mqtt.async_subscribe(
+            self.hass, topic, self._async_mqtt_message
+        )
+        _LOGGER.debug("Subscribed to WiCAN AutoPID topic %s", topic)
+
+    @callback
+    def async_stop_push(self) -> None:
+        """Unsubscribe from pushed AutoPID data."""
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
+        self._last_push = None
+
+    @callback
+    def _async_mqtt_message(self, msg) -> None:
+        """Handle an AutoPID MQTT message containing a JSON object of PID values."""
+        try:
+            with self._profile_section():
+                values = json.loads(msg.payload)
+        except ValueError:
+            _LOGGER.debug("Ignoring malformed WiCAN MQTT payload on %s", msg.topic)
+            return
+        if not isinstance(values, dict):
+            _LOGGER.debug("Ignoring WiCAN MQTT payload that is not an object on %s", msg.topic)
+            return
+        self.async_push_pid_values(values)
+
+    @callback
+    def async_push_pid_values(self, values: dict) -> None:
+        """Merge pushed PID values into the coordinator data and notify entities.
+
+        Parameters
+        ----------
+        values: dict
+            PID values keyed by PID (e.g. {"SOC_BMS": 38}). PIDs missing from the
+            push keep their previous value.
+
+        """
+        if not self.data or not isinstance(self.data.get("status"), dict):
+            return
+
+        with self._profile_section():
+            pid = self._as_pid_table(self.data.get("pid") or {})
+            unknown = [
+                key for key in pid.update_partial(values) if key not in self._unknown_push_keys
+            ]
+            if unknown:
+                # Car configuration changed on the device; pick it up with the next poll.
+                # Keys still unknown afterwards are not configured PIDs and are ignored.
+                self._unknown_push_keys.update(unknown)
+                self.api.invalidate_car_config()
+                self._last_push = None
+            else:
+                self._last_push = time.monotonic()
+
+            self._stale = False
+            self.last_successful_update = dt_util.utcnow()
+            pushed = [key for key in values if key in pid.slots]
+            self._record_pid_values(pid, pushed)
+            if self.history is not None:
+                # PIDs missing from the push were not sampled
+                self.history.record(pid, time.monotonic(), [pid.slots[key] for key in pushed])
+            new_data = {**self.data, "pid": pid}
+            self._changed_contexts = self._diff_contexts(self.data, new_data)
+            # Not async_set_updated_data: that reschedules the refresh, and a steady
+            # stream of pushes would then keep /check_status from ever running
+            self.data = new_data
+            self.async_update_listeners()
+            # Polls skip the PID fetch while pushes are fresh, so persist from here as well
+            status = self.data["status"]
+            self.hass.async_create_task(
+                self._persist_snapshot(
+                    {
+                        "device_id": status.get("device_id", "unknown"),
+                        "status": status,
+                        "pid": pid,
+                        "timestamp": dt_util.utcnow().isoformat(),
+                    }
+                )
+            )
+
     async def _load_snapshot(self) -> Optional[Snapshot]:
         """Load last-known snapshot from Home Assistant storage.
 
-        Returns None if loading fails or the data is invalid.
+        Returns None if loading fails or the data is invalid. Once a snapshot
+        is held in memory, storage is not read again.
         """
+        if self._snapshot is not None:
+            return self._build_snapshot()
+
         try:
             snapshot = await self._store.async_load()
         except Exception as err:  # file corruption or read error
@@ -179,53 +811,150 @@ class WiCanCoordinator(DataUpdateCoordinator):
                 _LOGGER.warning("Ignoring malformed WiCAN snapshot: not a dict")
             return None
 
+        if "pid" in snapshot:
+            # Version 1 layout that did not pass through storage migration
+            snapshot = migrate_snapshot_v1(snapshot)
+
         # Basic shape validation
-        required = {"device_id", "status", "pid", "timestamp"}
-        if not required.issubset(set(snapshot.keys())):
+        required = {"device_id", "status", "car_config", "values", "timestamp"}
+        if not required.issubset(set(snapshot.keys())) or not isinstance(
+            snapshot["values"], dict
+        ):
             _LOGGER.warning("Ignoring malformed WiCAN snapshot: missing keys")
             return None
-        return snapshot  # type: ignore[return-value]
+
+        # Stored values are last known good values: seed the index directly
+        self._last_good.update(snapshot["values"])
+        self._last_good_version += 1
+        self._snapshot = expand_snapshot(snapshot)  # type: ignore[arg-type]
+        self._persisted_revision = self._pending_revision = self._snapshot_revision()
+        return self._snapshot
+
+    def _as_pid_table(self, pid: Mapping) -> PidTable:
+        """Return PID entries as PidTable.
+
+        Tables (e.g. from the WiCan API) are used as they are. Plain dicts
+        with the layout of the current table are written into it in place,
+        other dicts get a new table.
+        """
+        if isinstance(pid, PidTable):
+            return pid
+        current = (self.data or {}).get("pid")
+        if isinstance(current, PidTable) and current.same_layout(pid):
+            current.update_entries(pid)
+            return current
+        return PidTable.from_entries(pid)
+
+    def _record_pid_values(self, pid: PidTable, keys=None) -> None:
+        """Update the last-known-good index with valid PID values.
+
+        Parameters
+        ----------
+        pid: PidTable
+            Current PID values.
+        keys: Any, optional
+            Only look at these PIDs (e.g. the ones in a push); all if None.
+
+        """
+        last_good = self._last_good
+        values = pid.values
+        valid = pid.valid
+        keys_by_slot = pid.keys_by_slot
+        slots = range(len(keys_by_slot)) if keys is None else [pid.slots[key] for key in keys]
+        for slot in slots:
+            if not valid[slot]:
+                continue
+            key = keys_by_slot[slot]
+            value = values[slot]
+            if key not in last_good or last_good[key] != value:
+                last_good[key] = value
+                self._last_good_version += 1
+
+    def _snapshot_revision(self) -> tuple:
+        """Return a cheap marker that changes whenever the persisted content would change."""
+        snapshot = self._snapshot or {}
+        return (
+            self._last_good_version,
+            getattr(self.api, "car_config_fingerprint", None),
+            snapshot.get("device_id"),
+            snapshot.get("status"),
+        )
+
+    def _build_snapshot(self) -> Snapshot:
+        """Return the in-memory snapshot with missing PID values filled from the last-known-good index."""
+        snapshot = self._snapshot
+        last_good = self._last_good
+        pid = snapshot.get("pid")
+        if isinstance(pid, Mapping):
+            pid = {
+                key: {**entry, "value": last_good[key]} if key in last_good else entry
+                for key, entry in pid.items()
+            }
+        return {**snapshot, "pid": pid}
 
     async def _persist_snapshot(self, snapshot: Snapshot) -> None:
-        """Persist snapshot with simple time-based debouncing.
+        """Update the in-memory snapshot and write it behind to storage.
 
-        To prevent excessive disk writes, this method will not write more than
-        once every ``_persist_min_interval_sec`` seconds.
+        The in-memory snapshot is the authoritative copy. The first snapshot is
+        written immediately so an offline restart has something to start from;
+        later changes are written at most once every ``_persist_min_interval_sec``
+        seconds, and not at all if the content (ignoring the timestamp) is unchanged.
+        Pending writes are flushed on Home Assistant stop and on entry unload.
+        PID values are taken from the last-known-good index when the snapshot
+        is written, so missing readings never overwrite good ones.
         """
-        now_iso = dt_util.utcnow().isoformat()
-        if self._last_persist_utc is not None:
-            try:
-                # Compare using parsed datetimes; fall back to write on parse errors
-                last = dt_util.parse_datetime(self._last_persist_utc)
-                now = dt_util.parse_datetime(now_iso)
-                if last and now:
-                    delta = (now - last).total_seconds()
-                    if delta < self._persist_min_interval_sec:
-                        return
-            except Exception:
-                # On parsing failure, continue to save
-                pass
-
-        # Merge with previous snapshot to preserve last good PID values when new values are missing
-        try:
-            existing = await self._store.async_load()
-        except Exception:
-            existing = None
-
-        if isinstance(snapshot.get("pid"), dict) and isinstance(existing, dict):
-            prev_pid = existing.get("pid", {}) if isinstance(existing.get("pid"), dict) else {}
-            for key, pid_entry in snapshot["pid"].items():
-                if not isinstance(pid_entry, dict):
-                    continue
-                # If new value is None/False, keep previous good value if present
-                new_val = pid_entry.get("value") if "value" in pid_entry else None
-                prev_entry = prev_pid.get(key, {}) if isinstance(prev_pid, dict) else {}
-                prev_val = prev_entry.get("value") if isinstance(prev_entry, dict) else None
-                if (new_val is None or new_val is False) and (prev_val is not None and prev_val is not False):
-                    pid_entry["value"] = prev_val
-
-        await self._store.async_save(snapshot)
-        self._last_persist_utc = now_iso
+        self._snapshot = snapshot
+        revision = self._snapshot_revision()
+        if revision == self._persisted_revision:
+            return
+        self._pending_revision = revision
+
+        if self._persisted_revision is None and not self._persist_scheduled:
+            await self._save_snapshot()
+            self._persisted_revision = revision
+            return
+
+        if not self._persist_scheduled:
+            self._persist_scheduled = True
+            self._store.async_delay_save(
+                self._snapshot_to_save, self._persist_min_interval_sec
+            )
+
+    def _stored_snapshot(self) -> StoredSnapshot:
+        """Return the compact on-disk form of the in-memory snapshot."""
+        started = time.perf_counter()
+        with self._profile_section():
+            # The API already fingerprinted the car configuration; don't hash it per write
+            stored = compact_snapshot(
+                self._snapshot,
+                self._last_good,
+                getattr(self.api, "car_config_fingerprint", None),
+            )
+        self.metrics.record("snapshot.build", time.perf_counter() - started)
+        self.metrics.increment("snapshot.writes")
+        return stored
+
+    async def _save_snapshot(self) -> None:
+        """Write the in-memory snapshot to storage now."""
+        started = time.perf_counter()
+        await self._store.async_save(self._stored_snapshot())
+        self.metrics.record("snapshot.save", time.perf_counter() - started)
+
+    @callback
+    def _snapshot_to_save(self) -> StoredSnapshot:
+        """Provide the current snapshot to the store when the delayed write runs."""
+        self._persist_scheduled = False
+        self._persisted_revision = self._pending_revision
+        return self._stored_snapshot()
+
+    async def async_flush_snapshot(self) -> None:
+        """Write a pending snapshot change to storage now (e.g. on entry unload)."""
+        if self._snapshot is None or self._pending_revision == self._persisted_revision:
+            return
+        # async_save cancels the pending delayed write
+        await self._save_snapshot()
+        self._persist_scheduled = False
+        self._persisted_revision = self._pending_revision
 
     async def async_preload_snapshot(self) -> bool:
         """Preload snapshot into coordinator data if available.
@@ -239,10 +968,75 @@ class WiCanCoordinator(DataUpdateCoordinator):
         # Do not set stale here; staleness is determined on refresh paths
         self.data = {
             "status": snapshot.get("status"),
-            "pid": snapshot.get("pid", {}),
+            "pid": PidTable.from_entries(snapshot.get("pid") or {}),
         }
+        self._cycle_view = None
         return True
 
+    def poll_state(self) -> dict:
+        """Return the current polling and backoff state, e.g. for diagnostics."""
+        return {
+            "ecu_status": self._last_ecu_status,
+            "stale": self._stale,
+            "last_successful_update": self.last_successful_update.isoformat()
+            if self.last_successful_update
+            else None,
+            "update_interval": self.update_interval.total_seconds()
+            if self.update_interval
+            else None,
+            "unreachable_polls": self._unreachable_polls,
+            "circuit_breaker": self._breaker.state,
+            "consecutive_failures": self._breaker.failures,
+            "push_mode": self.push_mode,
+            "push_fresh": self.push_fresh(),
+        }
+
+    def entity_plan(self) -> EntityPlan:
+        """Return the PID entity descriptors for the current car configuration.
+
+        The plan is built once per car configuration fingerprint and shared by
+        the sensor and binary_sensor platforms.
+        """
+        pid = (self.data or {}).get("pid") or {}
+        fingerprint = getattr(self.api, "car_config_fingerprint", None)
+        plan = self._entity_plan
+        if plan is not None and fingerprint is not None and plan.fingerprint == fingerprint:
+            return plan
+        if fingerprint is None:
+            # Not downloaded from the device yet (e.g. started from a snapshot)
+            fingerprint = pid_fingerprint(pid)
+            if plan is not None and plan.fingerprint == fingerprint:
+                return plan
+        self._entity_plan = EntityPlan(fingerprint, pid)
+        return self._entity_plan
+
+    def _check_entity_plan(self, pid: dict) -> None:
+        """Warn once if a polled car configuration no longer matches the entities that were set up."""
+        plan = self._entity_plan
+        fingerprint = getattr(self.api, "car_config_fingerprint", None)
+        if plan is None or fingerprint is None or fingerprint == plan.fingerprint:
+            return
+        new_plan = EntityPlan(fingerprint, pid)
+        if not new_plan.same_entities(plan):
+            _LOGGER.warning(
+                "WiCAN car configuration changed (%s PIDs); reload the integration to update its entities",
+                len(pid),
+            )
+        self._entity_plan = new_plan
+
+    @callback
+    def async_serve_snapshot(self) -> None:
+        """Serve the preloaded snapshot as stale data until the first live refresh.
+
+        Entities created from it start out stale, so a successful refresh
+        notifies all of them to clear the stale marker.
+        """
+        self._stale = True
+        self._dispatched_stale = True
+        self._cycle_view = None
+        # The snapshot holds PIDs, so the device was polled successfully before
+        self.ecu_online = True
+
     def device_info(self):
         """Return basic device information shown in HomeAssistant "Device Info" section of the WiCan device.
 
@@ -252,15 +1046,29 @@ class WiCanCoordinator(DataUpdateCoordinator):
             Dictionary containing details about the device (e.g. Device URL, Software Version).
 
         """
-        return {
-            "identifiers": {(DOMAIN, self.data["status"]["device_id"])},
-            "name": "WiCAN",
-            "manufacturer": "MeatPi",
-            "model": self.data["status"]["hw_version"],
-            "configuration_url": "http://" + self.data["status"]["sta_ip"],
-            "sw_version": self.data["status"]["fw_version"],
-            "hw_version": self.data["status"]["hw_version"],
-        }
+        return self.cycle_view().device_info
+
+    def cycle_view(self) -> CycleView:
+        """Return the values shared by all entities in the current cycle.
+
+        The view is built on first use after each update, so device info and
+        freshness attributes are formatted once per cycle, not once per entity.
+
+        Returns
+        -------
+        CycleView
+            Device info, freshness and resolved status attributes.
+
+        """
+        view = self._cycle_view
+        if view is None:
+            view = self._cycle_view = CycleView(
+                DOMAIN,
+                (self.data or {}).get("status"),
+                self._stale,
+                self.last_successful_update,
+            )
+        return view
 
     def available(self) -> bool:
         """Check, if WiCan device is available, based on the data received from earlier API calls.
@@ -297,13 +1105,68 @@ class WiCanCoordinator(DataUpdateCoordinator):
 
         return self.data["status"][key]
 
-    def get_pid_value(self, key) -> str | bool | None:
+    def get_metric(self, key) -> float | int | None:
+        """Return a poll performance value for the diagnostic sensors.
+
+        Parameters
+        ----------
+        key: Any
+            One of "poll_duration", "poll_duration_p95" (milliseconds),
+            "consecutive_failures", "data_age" (seconds since the last
+            successful update) or "pids_per_poll".
+
+        Returns
+        -------
+        float | int | None
+            Current value, None if not known yet.
+
+        """
+        if key == "poll_duration":
+            seconds = self.metrics.timing("poll").last
+        elif key == "poll_duration_p95":
+            seconds = self.metrics.timing("poll").percentile(0.95)
+        elif key == "consecutive_failures":
+            return self._unreachable_polls
+        elif key == "data_age":
+            if self.last_successful_update is None:
+                return None
+            return round(
+                (dt_util.utcnow() - self.last_successful_update).total_seconds()
+            )
+        elif key == "pids_per_poll":
+            return self._pids_last_poll
+        else:
+            return None
+        return round(seconds * 1000, 1) if seconds is not None else None
+
+    def get_pid_history(self, slot: int) -> dict:
+        """Return the rolling statistics attributes of the PID in a slot of ``pid_table()``.
+
+        Returns
+        -------
+        dict
+            History attributes, empty if the history is disabled or has too few samples.
+
+        """
+        table = self.pid_table()
+        if self.history is None or table is None:
+            return {}
+        return self.history.attributes(table, slot)
+
+    def pid_table(self) -> PidTable | None:
+        """Return the table holding the current PID values, None if there is none."""
+        pid = (self.data or {}).get("pid")
+        return pid if isinstance(pid, PidTable) else None
+
+    def get_pid_value(self, key, slot: int | None = None) -> str | bool | None:
         """Check, if device status is available from previous API call and get value for a given PID-key.
 
         Parameters
         ----------
         key: Any
             PID-key (e.g. "SOC_BMS") to be checked for available data.
+        slot: int, optional
+            Slot of the PID in ``pid_table()``, saves the lookup by key.
 
         Returns
         -------
@@ -315,10 +1178,17 @@ class WiCanCoordinator(DataUpdateCoordinator):
         if not self.data["status"]:
             return False
 
-        if self.data["pid"].get(key) is None:
-            return None
-
-        value = self.data["pid"][key].get("value")
-        if value is False:
-            return None
+        pid = self.data.get("pid") or {}
+        if slot is None and isinstance(pid, PidTable):
+            slot = pid.slot(key)
+        if slot is not None:
+            value = pid.values[slot]
+        else:
+            entry = pid.get(key)
+            if entry is None:
+                return None
+            value = entry.get("value")
+        if value is None or value is False:
+            # While offline, fall back to the last known good reading
+            return self._last_good.get(key) if self._stale else None
         return value
@@ -0,0 +1,96 @@
+"""Per-cycle view of WiCAN coordinator data.
+
+Purpose: build the values every entity reads on a state write (device info,
+freshness attributes, resolved status attributes) once per coordinator cycle
+instead of once per entity.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping
+
+
+class CycleView:
+    """Values shared by all entities of a coordinator until its next update.
+
+    Attributes
+    ----------
+    freshness : Mapping
+        Read-only "wican_data_stale" and "last_successful_update" attributes.
+
+    """
+
+    __slots__ = ("freshness", "_device_info", "_domain", "_status", "_status_attributes")
+
+    def __init__(
+        self,
+        domain: str,
+        status: dict | None,
+        stale: bool,
+        last_successful_update: datetime | None,
+    ) -> None:
+        """Build the view from the coordinator state of the current cycle."""
+        self._status = status
+        self._status_attributes: dict = {}
+        self._domain = domain
+        self._device_info: dict | None = None
+        self.freshness = MappingProxyType(
+            {
+                "wican_data_stale": stale,
+                "last_successful_update": last_successful_update.isoformat()
+                if last_successful_update
+                else None,
+            }
+        )
+
+    @property
+    def device_info(self) -> dict | None:
+        """Return the device registry information, None without device status.
+
+        The dict is shared by all entities and must not be modified.
+        """
+        status = self._status
+        if self._device_info is None and status:
+            self._device_info = {
+                "identifiers": {(self._domain, status["device_id"])},
+                "name": "WiCAN",
+                "manufacturer": "MeatPi",
+                "model": status["hw_version"],
+                "configuration_url": "http://" + status["sta_ip"],
+                "sw_version": status["fw_version"],
+                "hw_version": status["hw_version"],
+            }
+        return self._device_info
+
+    def status_attributes(self, attributes: tuple | None) -> Mapping:
+        """Return freshness plus the given status attributes, resolved once per cycle.
+
+        Parameters
+        ----------
+        attributes : tuple, optional
+            Pairs of (attribute name, status key), see ``WiCanEntityDescription``.
+
+        Returns
+        -------
+        Mapping
+            Read-only attributes; False for each attribute without device status.
+
+        """
+        if attributes is None:
+            return self.freshness
+        resolved = self._status_attributes.get(attributes)
+        if resolved is None:
+            status = self._status
+            resolved = MappingProxyType(
+                {
+                    **self.freshness,
+                    **{
+                        name: status[key] if status else False
+                        for name, key in attributes
+                    },
+                }
+            )
+            self._status_attributes[attributes] = resolved
+        return resolved
@@ -0,0 +1,64 @@
+"""Diagnostics support for WiCan Integration.
+
+Purpose: let users download poll timings, payload sizes, outcome counters and
+the current backoff state of a WiCAN config entry, to tell whether slow polls
+are caused by the device, the network or Home Assistant.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PUSH_TOKEN, DOMAIN
+
+TO_REDACT = {
+    CONF_PUSH_TOKEN,
+    "batt_alert_ssid",
+    "batt_mqtt_user",
+    "mqtt_user",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a WiCAN config entry.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        HomeAssistant object.
+    entry: ConfigEntry
+        WiCan configuration entry in HomeAssistant.
+
+    Returns
+    -------
+    dict
+        Redacted configuration, device status, polling state and metrics.
+
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    api_metrics = getattr(coordinator.api, "metrics", None)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "device": async_redact_data(data.get("status") or {}, TO_REDACT),
+        "pid_count": len(data.get("pid") or {}),
+        "car_config_fingerprint": getattr(coordinator.api, "car_config_fingerprint", None),
+        "polling": coordinator.poll_state(),
+        "metrics": {
+            "api": api_metrics.as_dict() if api_metrics is not None else {},
+            "coordinator": coordinator.metrics.as_dict(),
+        },
+        "scheduler": coordinator.scheduler.throughput()
+        if coordinator.scheduler is not None
+        else None,
+    }
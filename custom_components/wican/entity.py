@@ -9,9 +9,9 @@ from __future__ import annotations
 from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
-from .coordinator import WiCanCoordinator
+from .coordinator import CONTEXT_ANY_STATUS, WiCanCoordinator
+from .entity_plan import WiCanEntityDescription, describe
 
 
 class WiCanEntityBase(CoordinatorEntity, RestoreEntity):
@@ -21,37 +21,39 @@ class WiCanEntityBase(CoordinatorEntity, RestoreEntity):
     ----------
     coordinator: WiCanCoordinator
         WiCan coordinator handling the device integration via the WiCan API.
-    data : dict
-        Data to be stored in the entity.
+    description : WiCanEntityDescription
+        Shared static metadata of the entity (key, unit, class, ...).
     process_state: Any, optional
         Method to convert status values (e.g. type conversion to float).
 
     """
 
-    data = {}
+    description: WiCanEntityDescription
     coordinator: WiCanCoordinator
     _state = False
     process_state = None
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, data, process_state=None) -> None:
-        """Initialize a WiCanEntity with data, coordinator, process_state and identifiers for HomeAssistant."""
+    def __init__(self, coordinator, description, process_state=None) -> None:
+        """Initialize a WiCanEntity with description, coordinator, process_state and identifiers for HomeAssistant.
+
+        ``description`` may also be given as dict of metadata, see ``entity_plan.describe``.
+        """
         super().__init__(coordinator)
-        self.data = data
+        if not isinstance(description, WiCanEntityDescription):
+            description = describe(description)
+        self.description = description
         self.coordinator = coordinator
         self.process_state = process_state
 
         device_id = self.coordinator.data["status"]["device_id"]
 
-        key = self.get_data("key")
+        key = description.key
         self._attr_unique_id = "wican_" + device_id + "_" + key
         self.id = "wican_" + device_id[-3:] + "_" + key
-        if data.get("icon") is not None:
-            self._attr_icon = data["icon"]
-        if data.get("translation_key") is not None:
-            self._attr_translation_key = data["translation_key"]
-        else:
-            self._attr_translation_key = data["key"]
+        if description.icon is not None:
+            self._attr_icon = description.icon
+        self._attr_translation_key = description.translation_key or key
         self.set_state()
 
     async def async_added_to_hass(self) -> None:
@@ -63,19 +65,6 @@ class WiCanEntityBase(CoordinatorEntity, RestoreEntity):
                 self._state = last_state.state
                 self.async_write_ha_state()
 
-    def get_data(self, key):
-        """Provide data for a given key.
-
-        Parameters
-        ----------
-        key : Any
-            key to be used to retrieve data from the dictionary.
-
-        """
-        if key in self.data:
-            return self.data[key]
-        return None
-
     def get_new_state(self):
         """Return data from coordinator. Method defined for implementation in child classes of WiCanEntityBase.
 
@@ -140,7 +129,7 @@ class WiCanEntityBase(CoordinatorEntity, RestoreEntity):
             Category of the entity (e.g. DIAGNOSTIC for some WiCan entities like "IP-Address").
 
         """
-        return self.get_data("category")
+        return self.description.category
 
     @property
     def state(self):
@@ -150,76 +139,93 @@ class WiCanEntityBase(CoordinatorEntity, RestoreEntity):
     @property
     def unit_of_measurement(self):
         """Return the unit of measurement of this WiCanEntity, if any."""
-        if self.get_data("unit") == "none":
-            return None
-        else:
-            return self.get_data("unit")
+        return self.description.unit
 
     @property
     def device_class(self):
         """Return the class of this device, from component DEVICE_CLASSES."""
-        if self.get_data("class") == "none":
-            return None
-        else:
-            return self.get_data("class")
+        return self.description.device_class
 
-    def _freshness_attributes(self) -> dict:
-        last = self.coordinator.last_successful_update
-        return {
-            "wican_data_stale": self.coordinator.stale(),
-            "last_successful_update": last.isoformat() if last else None,
-        }
+    def _freshness_attributes(self):
+        return self.coordinator.cycle_view().freshness
 
 
 class WiCanStatusEntity(WiCanEntityBase):
     """WiCan Status Entity based on WiCanEntityBase."""
 
-    def __init__(self, coordinator, data, process_state=None) -> None:
+    def __init__(self, coordinator, description, process_state=None) -> None:
         """Initialize the status entity same as WiCanEntityBase."""
-        super().__init__(coordinator, data, process_state)
+        super().__init__(coordinator, description, process_state)
+        # Only woken by the coordinator when its status key (or any, with attributes) changed
+        if self.description.attributes is not None:
+            self.coordinator_context = CONTEXT_ANY_STATUS
+        else:
+            self.coordinator_context = ("status", self.description.key)
 
     def get_new_state(self):
         """Provide entity status from coordindator based on key of this entity (e.g. "fw_version")."""
-        return self.coordinator.get_status(self.get_data("key"))
+        return self.coordinator.get_status(self.description.key)
 
     @property
     def extra_state_attributes(self):
         """Provide state attributes from WiCan device status via coordinator, if defined for entity, plus freshness metadata."""
-        attributes = self.get_data("attributes")
-        base = self._freshness_attributes()
-        if attributes is None:
-            return base
+        # Resolved once per cycle and shared by all entities with the same attributes
+        return self.coordinator.cycle_view().status_attributes(
+            self.description.attributes
+        )
 
-        return_attrs = {}
-        for key in attributes:
-            return_attrs[key] = self.coordinator.get_status(attributes[key])
 
-        return {**base, **return_attrs}
+class WiCanMetricEntity(WiCanEntityBase):
+    """WiCan poll performance entity based on WiCanEntityBase."""
+
+    _state = None
+
+    def get_new_state(self):
+        """Provide poll performance value from coordinator based on key of this entity (e.g. "poll_duration")."""
+        return self.coordinator.get_metric(self.description.key)
+
+    @property
+    def available(self) -> bool:
+        """Keep the entity available while the device is unreachable; that is when it matters."""
+        return True
 
 
 class WiCanPidEntity(WiCanEntityBase):
     """WiCan Data Entity based on WiCanEntityBase."""
 
-    def __init__(self, coordinator, data, process_state=None) -> None:
+    # PID table and slot the value of this entity is read from
+    _pid_table = None
+    _slot = None
+
+    def __init__(self, coordinator, description, process_state=None) -> None:
         """Initialize the data entity same as WiCanEntityBase."""
-        super().__init__(coordinator, data, process_state)
-        self._attr_name = self.get_data("name")
+        super().__init__(coordinator, description, process_state)
+        self._attr_name = self.description.name
+        # Only woken by the coordinator when the value of this PID changed
+        self.coordinator_context = ("pid", self.description.key)
 
     def get_new_state(self):
         """Provide entity value from coordindator based on key of this entity (e.g. "SOC_BMS")."""
-        return self.coordinator.get_pid_value(self.get_data("key"))
+        table = self.coordinator.pid_table()
+        if table is not self._pid_table:
+            # Car configuration (re)loaded: resolve the slot of this PID once
+            self._pid_table = table
+            self._slot = table.slot(self.description.key) if table is not None else None
+        return self.coordinator.get_pid_value(self.description.key, self._slot)
 
     @property
     def extra_state_attributes(self):
-        """Provide state attributes from WiCan device PID via coordinator, if defined for entity, plus freshness metadata."""
-        attributes = self.get_data("attributes")
+        """Provide state attributes from WiCan device PID via coordinator, if defined for entity, plus freshness metadata and rolling history statistics."""
+        attributes = self.description.attributes
         base = self._freshness_attributes()
+        if self._slot is not None and self.coordinator.history is not None:
+            base = {**base, **self.coordinator.get_pid_history(self._slot)}
         if attributes is None:
             return base
 
         return_attrs = {}
-        for key in attributes:
-            return_attrs[key] = self.coordinator.get_pid_value(attributes[key])
+        for name, key in attributes:
+            return_attrs[name] = self.coordinator.get_pid_value(key)
 
         return {**base, **return_attrs}
 
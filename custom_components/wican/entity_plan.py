@@ -0,0 +1,145 @@
+"""Entity plan for WiCAN car configurations.
+
+Purpose: classify the PIDs of a car configuration into sensor and binary
+sensor descriptors once, so both platforms create their entities from the
+same pre-validated lists instead of walking the PID data themselves.
+Descriptors are immutable and interned, so entities of identical PIDs (e.g.
+several cars with the same configuration) share one object.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+from typing import Any
+import weakref
+
+BINARY_SENSOR = "binary_sensor"
+SENSOR = "sensor"
+
+
+def pid_fingerprint(pid: dict) -> str:
+    """Return a hash of the PID metadata (values ignored) identifying a car configuration."""
+    meta = {
+        key: {k: v for k, v in entry.items() if k != "value"}
+        for key, entry in pid.items()
+        if isinstance(entry, dict)
+    }
+    return hashlib.sha1(
+        json.dumps(meta, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class WiCanEntityDescription:
+    """Static metadata of a WiCAN entity.
+
+    Attributes
+    ----------
+    key : str
+        Status or PID key the entity reads its state from.
+    name : str, optional
+        Entity name, used for PID entities.
+    device_class : Any, optional
+        Device class, None instead of the WiCAN placeholder "none".
+    unit : str, optional
+        Unit of measurement, None instead of the WiCAN placeholder "none".
+    category : EntityCategory, optional
+        Entity category (e.g. DIAGNOSTIC).
+    icon : str, optional
+        Material design icon.
+    translation_key : str, optional
+        Translation key, the entity uses ``key`` if not set.
+    attributes : tuple, optional
+        Pairs of (attribute name, status or PID key) for extra state attributes.
+
+    """
+
+    key: str
+    name: str | None = None
+    device_class: Any = None
+    unit: str | None = None
+    category: Any = None
+    icon: str | None = None
+    translation_key: str | None = None
+    attributes: tuple[tuple[str, str], ...] | None = None
+
+
+# Descriptions in use, so equal descriptions are shared instead of duplicated
+_DESCRIPTIONS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def describe(data: dict) -> WiCanEntityDescription:
+    """Return the shared description for a dict of entity metadata.
+
+    Parameters
+    ----------
+    data : dict
+        Metadata with the keys "key" and optionally "name", "class", "unit",
+        "category", "icon", "translation_key" and "attributes".
+
+    Returns
+    -------
+    WiCanEntityDescription
+        Interned description; "none" class and unit are resolved to None.
+
+    """
+    device_class = data.get("class")
+    unit = data.get("unit")
+    attributes = data.get("attributes")
+    description = WiCanEntityDescription(
+        key=data["key"],
+        name=data.get("name"),
+        device_class=None if device_class == "none" else device_class,
+        unit=None if unit == "none" else unit,
+        category=data.get("category"),
+        icon=data.get("icon"),
+        translation_key=data.get("translation_key"),
+        attributes=tuple(attributes.items()) if attributes is not None else None,
+    )
+    return _DESCRIPTIONS.setdefault(description, description)
+
+
+class EntityPlan:
+    """PID entity descriptors of one car configuration, per platform.
+
+    Attributes
+    ----------
+    fingerprint : str
+        Car configuration the plan was built for.
+    pids : dict
+        WiCanEntityDescription lists keyed by platform ("sensor", "binary_sensor"), in PID order.
+
+    """
+
+    __slots__ = ("fingerprint", "pids")
+
+    def __init__(self, fingerprint: str, pid: dict) -> None:
+        """Classify the PIDs of a car configuration in a single pass."""
+        self.fingerprint = fingerprint
+        sensors = []
+        binary_sensors = []
+        for key, entry in pid.items():
+            if not isinstance(entry, dict):
+                continue
+            if entry.get("sensor_type") == BINARY_SENSOR:
+                binary_sensors.append(
+                    describe({"key": key, "name": key, "class": entry.get("class")})
+                )
+            else:
+                sensors.append(
+                    describe(
+                        {
+                            "key": key,
+                            "name": key,
+                            "class": entry.get("class"),
+                            "unit": entry.get("unit"),
+                        }
+                    )
+                )
+        self.pids = {SENSOR: sensors, BINARY_SENSOR: binary_sensors}
+
+    def same_entities(self, other: EntityPlan) -> bool:
+        """Return True if both plans create the same entities."""
+        return self.pids == other.pids
@@ -0,0 +1,163 @@
+"""Rolling PID history for WiCAN Integration.
+
+Purpose: keep the last N samples of every PID in one NumPy ring buffer and
+compute rolling min / max / mean / standard deviation and rate of change for
+all PIDs at once, exposed as attributes of the PID sensors. This replaces
+separate ``statistics`` / ``derivative`` helper sensors per PID.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from .pid_table import PidTable
+
+# Fewer valid samples than this give no statistics for a PID
+MIN_SAMPLES = 2
+
+
+class PidHistory:
+    """Ring buffer of the last ``size`` samples of all PIDs of a PID table.
+
+    Samples are stored column-wise: one row per PID slot, one column per
+    sample, plus one timestamp per column. Non-numeric values (e.g. "on") and
+    missing readings are stored as NaN and ignored by the statistics, as are
+    PIDs left out of a partial sample (e.g. a push).
+
+    Attributes
+    ----------
+    size : int
+        Number of samples kept per PID.
+    count : int
+        Number of samples recorded, at most ``size``.
+
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty history keeping ``size`` samples per PID."""
+        self.size = size
+        self.count = 0
+        self._table: PidTable | None = None
+        self._values = None
+        self._times = None
+        self._next = 0
+        self._stats: dict | None = None
+
+    def _reset(self, table: PidTable) -> None:
+        """Allocate the buffer for the layout of ``table`` (slots differ per car configuration)."""
+        self._table = table
+        self._values = np.full((len(table), self.size), np.nan)
+        self._times = np.full(self.size, np.nan)
+        self._next = 0
+        self.count = 0
+        self._stats = None
+
+    def resize(self, size: int) -> None:
+        """Change the number of samples kept per PID, dropping the recorded samples."""
+        self.size = size
+        self._table = None
+        self.count = 0
+        self._stats = None
+
+    def record(self, table: PidTable, timestamp: float, slots=None) -> None:
+        """Add the current values of the PIDs as one sample.
+
+        Parameters
+        ----------
+        table : PidTable
+            Current PID values.
+        timestamp : float
+            Monotonic time of the sample in seconds.
+        slots : Any, optional
+            Only sample these slots (e.g. the PIDs in a push); all if None.
+
+        """
+        if table is not self._table:
+            self._reset(table)
+        column = self._next
+        values = table.values
+        if slots is None:
+            self._values[:, column] = [_numeric(value) for value in values]
+        else:
+            self._values[:, column] = np.nan
+            for slot in slots:
+                self._values[slot, column] = _numeric(values[slot])
+        self._times[column] = timestamp
+        self._next = (column + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self._stats = None
+
+    def _compute(self) -> dict:
+        """Compute the statistics of all PIDs at once, oldest to newest sample."""
+        order = np.roll(np.arange(self.size), -self._next)[self.size - self.count :]
+        values = self._values[:, order]
+        times = self._times[order]
+        valid = ~np.isnan(values)
+        samples = valid.sum(axis=1)
+        enough = samples >= MIN_SAMPLES
+
+        stats = {"samples": samples}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            masked = np.where(valid, values, 0.0)
+            mean = masked.sum(axis=1) / samples
+            stats["mean"] = mean
+            stats["stddev"] = np.sqrt(
+                np.where(valid, (values - mean[:, None]) ** 2, 0.0).sum(axis=1) / samples
+            )
+            stats["min"] = np.where(valid, values, np.inf).min(axis=1)
+            stats["max"] = np.where(valid, values, -np.inf).max(axis=1)
+            # Rate of change between the oldest and the newest valid sample
+            first = valid.argmax(axis=1)
+            last = valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+            rows = np.arange(values.shape[0])
+            elapsed = times[last] - times[first]
+            stats["rate"] = np.where(
+                elapsed > 0, (values[rows, last] - values[rows, first]) / elapsed, np.nan
+            )
+        stats["enough"] = enough
+        return stats
+
+    def attributes(self, table: PidTable, slot: int) -> dict:
+        """Return the rolling statistics of one PID as state attributes.
+
+        Parameters
+        ----------
+        table : PidTable
+            PID table the slot belongs to; nothing is returned for another table.
+        slot : int
+            Slot of the PID in ``table``.
+
+        Returns
+        -------
+        dict
+            "history_min", "history_max", "history_mean", "history_stddev",
+            "history_rate" (change per second) and "history_samples"; empty if
+            the PID has fewer than two numeric samples.
+
+        """
+        if table is not self._table or self.count == 0:
+            return {}
+        if self._stats is None:
+            # Computed for all PIDs on first use after a sample was added
+            self._stats = self._compute()
+        stats = self._stats
+        if not stats["enough"][slot]:
+            return {}
+        rate = stats["rate"][slot]
+        return {
+            "history_min": round(float(stats["min"][slot]), 3),
+            "history_max": round(float(stats["max"][slot]), 3),
+            "history_mean": round(float(stats["mean"][slot]), 3),
+            "history_stddev": round(float(stats["stddev"][slot]), 3),
+            "history_rate": None if math.isnan(rate) else round(float(rate), 6),
+            "history_samples": int(stats["samples"][slot]),
+        }
+
+
+def _numeric(value) -> float:
+    """Return a PID value as float, NaN if it is not a number (e.g. "on" or None)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return math.nan
@@ -0,0 +1,107 @@
+"""Timing and payload metrics for WiCAN polls.
+
+Purpose: record latency, payload size and outcome counters on every poll with
+constant work per sample. Percentiles are only computed when the metrics are
+read, e.g. for the config entry diagnostics.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+# Recent samples kept per timing for percentiles
+SAMPLE_WINDOW = 256
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Return the nearest-rank percentile of an ascending list of values."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Timing:
+    """Duration samples of one measured step.
+
+    Keeps all-time count and total plus a window of the most recent samples.
+    """
+
+    __slots__ = ("count", "total", "_recent")
+
+    def __init__(self) -> None:
+        """Initialize an empty timing."""
+        self.count = 0
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        """Add one sample in seconds."""
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent sample in seconds, None if there is none."""
+        return self._recent[-1] if self._recent else None
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a percentile of the recent samples in seconds, None if there are none."""
+        if not self._recent:
+            return None
+        return percentile(sorted(self._recent), fraction)
+
+    def summary(self) -> dict:
+        """Return count, mean and p50/p95/p99/max of the recent samples in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        recent = sorted(self._recent)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "last_ms": round(self._recent[-1] * 1000, 3),
+            "p50_ms": round(percentile(recent, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(recent, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(recent, 0.99) * 1000, 3),
+            "max_ms": round(recent[-1] * 1000, 3),
+        }
+
+
+class WiCanMetrics:
+    """Named timings, counters and byte totals.
+
+    Names are free-form, e.g. ``/autopid_data.latency`` for a timing or
+    ``/autopid_data.timeout`` for a counter.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.timings: dict[str, Timing] = {}
+        self.counters: dict[str, int] = {}
+        self.bytes_received: dict[str, int] = {}
+
+    def timing(self, name: str) -> Timing:
+        """Return the timing with the given name, creating it on first use."""
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+        return timing
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a duration sample in seconds."""
+        self.timing(name).add(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_bytes(self, name: str, amount: int) -> None:
+        """Add received bytes to a total."""
+        self.bytes_received[name] = self.bytes_received.get(name, 0) + amount
+
+    def as_dict(self) -> dict:
+        """Return all metrics as JSON serializable dict."""
+        return {
+            "timings": {name: timing.summary() for name, timing in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "bytes_received": dict(sorted(self.bytes_received.items())),
+        }
@@ -0,0 +1,155 @@
+"""Columnar PID value table for WiCAN car configurations.
+
+Purpose: keep the current PID values of a car configuration in flat,
+slot-indexed columns that are updated in place on every poll or push. The
+table is still a read-only mapping of PID -> metadata combined with value, so
+code that expects the ``/autopid_data`` dict shape keeps working.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+
+class PidTable(Mapping):
+    """PID values of one car configuration, stored by slot.
+
+    Each PID key gets a stable integer slot from the car configuration order.
+    Values live in one list, with a parallel validity mask marking slots that
+    hold a reading (not None / False). ``table[key]`` builds the combined
+    metadata + value dict on demand; hot paths read ``value(slot)`` instead.
+
+    Attributes
+    ----------
+    keys_by_slot : tuple
+        PID key of every slot.
+    slots : dict
+        Slot of every PID key.
+    meta : tuple
+        Car configuration metadata (without value) of every slot.
+    values : list
+        Current value of every slot, None if there is no reading.
+    valid : bytearray
+        1 for every slot holding a reading, 0 otherwise.
+
+    """
+
+    __slots__ = ("keys_by_slot", "slots", "meta", "values", "valid", "_changed")
+
+    def __init__(self, layout: Iterable[tuple[str, dict]]) -> None:
+        """Create an empty table from (PID key, metadata) pairs in car configuration order."""
+        layout = tuple(layout)
+        self.keys_by_slot = tuple(key for key, _ in layout)
+        self.slots = {key: slot for slot, key in enumerate(self.keys_by_slot)}
+        self.meta = tuple(meta for _, meta in layout)
+        self.values: list[Any] = [None] * len(layout)
+        self.valid = bytearray(len(layout))
+        # Slots changed since the last take_changes()
+        self._changed: set[int] = set()
+
+    @classmethod
+    def from_entries(cls, entries: Mapping) -> PidTable:
+        """Create a table from a dict of PID entries (metadata combined with value).
+
+        Parameters
+        ----------
+        entries : Mapping
+            PID entries keyed by PID, e.g. a snapshot or ``/autopid_data`` merged with metadata.
+
+        Returns
+        -------
+        PidTable
+            Table with the layout and values of ``entries``.
+
+        """
+        if isinstance(entries, PidTable):
+            return entries
+        table = cls(
+            (key, {k: v for k, v in entry.items() if k != "value"})
+            for key, entry in entries.items()
+            if isinstance(entry, dict)
+        )
+        table.update_entries(entries)
+        table._changed.clear()
+        return table
+
+    def same_layout(self, entries: Mapping) -> bool:
+        """Return True if ``entries`` has exactly the PID keys of this table, in the same order."""
+        return len(entries) == len(self.keys_by_slot) and all(
+            a == b for a, b in zip(entries, self.keys_by_slot)
+        )
+
+    def _set(self, slot: int, value: Any) -> None:
+        # Treat falsey readings as None so HA renders "unknown"
+        if value is False:
+            value = None
+        if self.values[slot] != value:
+            self.values[slot] = value
+            self.valid[slot] = value is not None
+            self._changed.add(slot)
+
+    def update(self, values: Mapping) -> None:
+        """Set every slot from a dict of raw values (e.g. ``/autopid_data``); missing PIDs become None."""
+        get = values.get
+        for slot, key in enumerate(self.keys_by_slot):
+            self._set(slot, get(key))
+
+    def update_partial(self, values: Mapping) -> list:
+        """Set the slots of the given PIDs only (e.g. a push) and return the PIDs not in this table."""
+        unknown = []
+        slots = self.slots
+        for key, value in values.items():
+            slot = slots.get(key)
+            if slot is None:
+                unknown.append(key)
+            else:
+                self._set(slot, value)
+        return unknown
+
+    def update_entries(self, entries: Mapping) -> None:
+        """Set every slot from a dict of PID entries (metadata combined with value)."""
+        for slot, key in enumerate(self.keys_by_slot):
+            entry = entries.get(key)
+            self._set(slot, entry.get("value") if isinstance(entry, dict) else None)
+
+    def changed_keys(self) -> list:
+        """Return the PID keys whose value changed since the last take_changes(), keeping the tracking."""
+        keys = self.keys_by_slot
+        return [keys[slot] for slot in self._changed]
+
+    def take_changes(self) -> set:
+        """Return the PID keys whose value changed since the last call and reset the tracking."""
+        keys = self.keys_by_slot
+        changed = {keys[slot] for slot in self._changed}
+        self._changed.clear()
+        return changed
+
+    def slot(self, key: str) -> int | None:
+        """Return the slot of a PID, None if it is not part of the car configuration."""
+        return self.slots.get(key)
+
+    def value(self, slot: int) -> Any:
+        """Return the current value of a slot, None if there is no reading."""
+        return self.values[slot]
+
+    def valid_count(self) -> int:
+        """Return the number of PIDs holding a reading."""
+        return self.valid.count(1)
+
+    def __getitem__(self, key: str) -> dict:
+        """Return the metadata combined with the current value of a PID."""
+        slot = self.slots[key]
+        return {**self.meta[slot], "value": self.values[slot]}
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the PID keys in slot order."""
+        return iter(self.keys_by_slot)
+
+    def __len__(self) -> int:
+        """Return the number of PIDs."""
+        return len(self.keys_by_slot)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the PID is part of the car configuration."""
+        return key in self.slots
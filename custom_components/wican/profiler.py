@@ -0,0 +1,204 @@
+"""On-demand profiling of WiCAN coordinator cycles.
+
+Purpose: provide the ``wican.profile`` service, which runs cProfile around the
+synchronous WiCAN code of the next N coordinator cycles (PID merge, change
+detection, snapshot building and entity updates) and writes the profile plus a
+text summary to the config directory.
+"""
+
+from __future__ import annotations
+
+import cProfile
+from contextlib import contextmanager
+import io
+import logging
+import pstats
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .const import DATA_SHARED, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_ENTRY_ID = "entry_id"
+DATA_PROFILER = "profiler"
+# Profiling stops after this many seconds even if fewer cycles ran
+PROFILE_MAX_DURATION = 600
+SUMMARY_LINES = 40
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_ENTRY_ID): str,
+    }
+)
+
+
+def async_register_profile_service(hass: HomeAssistant) -> None:
+    """Register the ``wican.profile`` service once for all WiCAN config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        shared = hass.data.setdefault(DATA_SHARED, {})
+        if shared.get(DATA_PROFILER) is not None:
+            raise HomeAssistantError("WiCAN profiling is already running")
+
+        entry_id = call.data.get(ATTR_ENTRY_ID)
+        coordinators = [
+            coordinator
+            for key, coordinator in hass.data.get(DOMAIN, {}).items()
+            if entry_id in (None, key)
+        ]
+        if not coordinators:
+            raise HomeAssistantError("No loaded WiCAN config entry to profile")
+
+        profiler = CycleProfiler(hass, call.data[ATTR_CYCLES])
+        shared[DATA_PROFILER] = profiler
+        profiler.attach(coordinators)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA
+    )
+
+
+class CycleProfiler:
+    """cProfile session covering a number of coordinator cycles.
+
+    The profiler is only enabled inside ``section()``, which coordinators wrap
+    around their synchronous work (PID merge, change detection, snapshot
+    building, entity fan-out). Sections never span an ``await``, so other tasks
+    running on the event loop while a poll waits for the device are not
+    recorded. A cycle lasts from the start of ``_async_update_data`` to the end
+    of its entity fan-out; pushes received meanwhile are profiled, not counted.
+
+    Attributes
+    ----------
+    remaining : int
+        Coordinator cycles still to be profiled.
+
+    """
+
+    def __init__(self, hass: HomeAssistant, cycles: int) -> None:
+        """Initialize a profiling session for ``cycles`` coordinator cycles."""
+        self.hass = hass
+        self.remaining = cycles
+        self.cycles = cycles
+        self._profile = cProfile.Profile()
+        self._coordinators: list = []
+        self._active: set = set()
+        self._enabled = False
+        self._finished = False
+        self._cancel_timeout = None
+
+    @callback
+    def attach(self, coordinators: list) -> None:
+        """Start profiling the next cycles of the given coordinators."""
+        self._coordinators = coordinators
+        for coordinator in coordinators:
+            coordinator.profiler = self
+        self._cancel_timeout = async_call_later(
+            self.hass, PROFILE_MAX_DURATION, self._async_timeout
+        )
+        _LOGGER.info(
+            "Profiling the next %s WiCAN coordinator cycles (at most %ss)",
+            self.cycles,
+            PROFILE_MAX_DURATION,
+        )
+
+    @callback
+    def start_cycle(self, coordinator) -> None:
+        """Mark the start of a coordinator cycle."""
+        if self._finished:
+            return
+        self._active.add(coordinator)
+
+    @callback
+    def end_cycle(self, coordinator) -> None:
+        """Mark the end of a coordinator cycle; finish after N cycles."""
+        if coordinator not in self._active:
+            return
+        self._active.discard(coordinator)
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.hass.async_create_task(self.async_finish())
+
+    @contextmanager
+    def section(self):
+        """Profile a synchronous section; the block must not ``await``.
+
+        Nested sections are part of the outermost one.
+        """
+        if self._finished or self._enabled:
+            yield
+            return
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # Python 3.12+ allows one active profiler only; never block polling
+            _LOGGER.warning("Cannot start WiCAN profiling: %s", err)
+            self._detach()
+            yield
+            return
+        self._enabled = True
+        try:
+            yield
+        finally:
+            self._profile.disable()
+            self._enabled = False
+
+    async def _async_timeout(self, _now) -> None:
+        self._cancel_timeout = None
+        _LOGGER.info("WiCAN profiling timed out with %s cycles left", self.remaining)
+        await self.async_finish()
+
+    @callback
+    def _detach(self) -> None:
+        """Stop profiling and detach from all coordinators."""
+        self._finished = True
+        self._active.clear()
+        if self._cancel_timeout is not None:
+            self._cancel_timeout()
+            self._cancel_timeout = None
+        for coordinator in self._coordinators:
+            coordinator.profiler = None
+        self.hass.data.get(DATA_SHARED, {}).pop(DATA_PROFILER, None)
+
+    async def async_finish(self) -> None:
+        """Detach from all coordinators and write the profile and its summary."""
+        if self._finished:
+            return
+        self._detach()
+        base = self.hass.config.path(
+            f"wican_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        )
+        await self.hass.async_add_executor_job(self._write, base)
+        _LOGGER.info(
+            "WiCAN profile of %s cycles written to %s.prof and %s.txt",
+            self.cycles - max(self.remaining, 0),
+            base,
+            base,
+        )
+
+    def _write(self, base: str) -> None:
+        """Write the raw profile (for snakeviz / pstats) and a text summary."""
+        self._profile.dump_stats(f"{base}.prof")
+        stream = io.StringIO()
+        try:
+            stats = pstats.Stats(self._profile, stream=stream)
+        except TypeError:
+            # No calls were recorded (no cycle ran before the timeout)
+            stream.write("No WiCAN coordinator cycle ran while profiling.\n")
+        else:
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_LINES)
+        with open(f"{base}.txt", "w", encoding="utf-8") as summary:
+            summary.write(stream.getvalue())
@@ -0,0 +1,160 @@
+"""Integration-wide poll scheduler for WiCAN devices.
+
+Purpose: keep the polls of many WiCAN config entries spread out instead of
+drifting into bursts, cap how many devices are polled at the same time and
+count aggregate throughput across all entries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_SHARED
+
+DATA_SCHEDULER = "scheduler"
+# Polls running at once across all WiCAN entries; the rest wait for a slot
+MAX_CONCURRENT_POLLS = 4
+# Window in seconds for the throughput rates
+THROUGHPUT_WINDOW = 60.0
+
+
+def async_get_scheduler(hass: HomeAssistant) -> WiCanScheduler:
+    """Return the scheduler shared by all WiCAN config entries, creating it on first use."""
+    shared = hass.data.setdefault(DATA_SHARED, {})
+    scheduler = shared.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = shared[DATA_SCHEDULER] = WiCanScheduler()
+    return scheduler
+
+
+def slot_phase(slot: int) -> float:
+    """Return the phase of a slot as fraction of the poll interval.
+
+    Uses the base-2 van der Corput sequence (0, 1/2, 1/4, 3/4, 1/8, ...), so
+    every new slot lands in the largest gap and existing slots never move.
+    """
+    phase = 0.0
+    denominator = 1.0
+    while slot:
+        denominator *= 2
+        slot, remainder = divmod(slot, 2)
+        phase += remainder / denominator
+    return phase
+
+
+class WiCanScheduler:
+    """Phase-stagger and rate-limit the polls of all WiCAN coordinators.
+
+    Attributes
+    ----------
+    max_concurrent : int
+        Number of polls allowed to run at the same time.
+    polls : int
+        Polls completed since startup, across all entries.
+    failed_polls : int
+        Polls that found the device unreachable.
+    pids_received : int
+        PID readings received by successful polls.
+    max_wait : float
+        Longest time in seconds a poll waited for a free slot.
+
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_POLLS) -> None:
+        """Initialize the scheduler without registered entries."""
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._slots: dict[str, int] = {}
+        self._recent: deque[tuple[float, int]] = deque()
+        self.in_flight = 0
+        self.polls = 0
+        self.failed_polls = 0
+        self.pids_received = 0
+        self.max_wait = 0.0
+
+    def register(self, entry_id: str) -> None:
+        """Assign the lowest free phase slot to a config entry."""
+        if entry_id in self._slots:
+            return
+        taken = set(self._slots.values())
+        self._slots[entry_id] = next(
+            slot for slot in range(len(taken) + 1) if slot not in taken
+        )
+
+    def unregister(self, entry_id: str) -> None:
+        """Release the phase slot of a config entry."""
+        self._slots.pop(entry_id, None)
+
+    def align(self, entry_id: str, interval: float) -> float:
+        """Return the delay until the next poll of an entry, snapped to its phase.
+
+        The next poll is moved by at most half an interval so that it lands on
+        ``phase * interval`` of the entry's poll grid; polls of different entries
+        therefore stay apart instead of drifting together.
+
+        Parameters
+        ----------
+        entry_id : str
+            Config entry the poll belongs to.
+        interval : float
+            Regular poll interval in seconds.
+
+        Returns
+        -------
+        float
+            Delay in seconds, between half and one and a half intervals.
+
+        """
+        slot = self._slots.get(entry_id)
+        if slot is None or interval <= 0:
+            return interval
+        target = time.monotonic() + interval
+        offset = (slot_phase(slot) * interval - target) % interval
+        if offset > interval / 2:
+            offset -= interval
+        return interval + offset
+
+    @asynccontextmanager
+    async def poll_slot(self):
+        """Wait for a free poll slot and hold it while the device is polled."""
+        started = time.monotonic()
+        async with self._semaphore:
+            self.max_wait = max(self.max_wait, time.monotonic() - started)
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def record_poll(self, ok: bool, pids: int = 0) -> None:
+        """Count a finished poll and the number of PID readings it returned."""
+        self.polls += 1
+        if not ok:
+            self.failed_polls += 1
+            return
+        self.pids_received += pids
+        now = time.monotonic()
+        self._recent.append((now, pids))
+        while self._recent and now - self._recent[0][0] > THROUGHPUT_WINDOW:
+            self._recent.popleft()
+
+    def throughput(self) -> dict:
+        """Return aggregate poll counters and rates over the last minute."""
+        now = time.monotonic()
+        recent = [pids for polled, pids in self._recent if now - polled <= THROUGHPUT_WINDOW]
+        return {
+            "entries": len(self._slots),
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "polls": self.polls,
+            "failed_polls": self.failed_polls,
+            "pids_received": self.pids_received,
+            "polls_per_minute": len(recent) * 60.0 / THROUGHPUT_WINDOW,
+            "pids_per_second": sum(recent) / THROUGHPUT_WINDOW,
+            "max_wait": round(self.max_wait, 3),
+        }
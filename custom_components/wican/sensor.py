@@ -10,7 +10,8 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .entity import WiCanPidEntity, WiCanStatusEntity
+from .entity import WiCanMetricEntity, WiCanPidEntity, WiCanStatusEntity
+from .entity_plan import SENSOR, WiCanEntityDescription
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +33,73 @@ def process_status_voltage(i):
     return float(i[:-1])
 
 
+# Device status sensors, independent of the car configuration
+STATUS_SENSORS = [
+    (
+        WiCanEntityDescription(
+            key="batt_voltage",
+            device_class=NumberDeviceClass.VOLTAGE,
+            unit="V",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:battery-charging",
+        ),
+        process_status_voltage,
+    ),
+    (
+        WiCanEntityDescription(
+            key="sta_ip",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:ip-network",
+        ),
+        None,
+    ),
+    (
+        WiCanEntityDescription(
+            key="protocol",
+            category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:protocol",
+        ),
+        None,
+    ),
+]
+
+
+# Optional poll performance sensors, see WiCanCoordinator.get_metric
+METRIC_SENSORS = [
+    WiCanEntityDescription(
+        key="poll_duration",
+        device_class=NumberDeviceClass.DURATION,
+        unit="ms",
+        category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+    ),
+    WiCanEntityDescription(
+        key="poll_duration_p95",
+        device_class=NumberDeviceClass.DURATION,
+        unit="ms",
+        category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-alert-outline",
+    ),
+    WiCanEntityDescription(
+        key="consecutive_failures",
+        category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:lan-disconnect",
+    ),
+    WiCanEntityDescription(
+        key="data_age",
+        device_class=NumberDeviceClass.DURATION,
+        unit="s",
+        category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:clock-outline",
+    ),
+    WiCanEntityDescription(
+        key="pids_per_poll",
+        category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:counter",
+    ),
+]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """Create and provide list of sensors containing WiCanStatusEntities and WiCanPidEntities.
 
@@ -52,69 +120,23 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = []
     if not coordinator.data["status"]:
         return None
 
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "batt_voltage",
-                "class": NumberDeviceClass.VOLTAGE,
-                "unit": "V",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:battery-charging",
-            },
-            process_status_voltage,
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "sta_ip",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:ip-network",
-            },
-        )
-    )
-    entities.append(
-        WiCanStatusEntity(
-            coordinator,
-            {
-                "key": "protocol",
-                "category": EntityCategory.DIAGNOSTIC,
-                "icon": "mdi:protocol",
-            },
+    entities = [
+        WiCanStatusEntity(coordinator, description, process_state)
+        for description, process_state in STATUS_SENSORS
+    ]
+
+    if coordinator.diagnostic_sensors:
+        entities.extend(
+            WiCanMetricEntity(coordinator, description) for description in METRIC_SENSORS
         )
-    )
 
-    if not coordinator.ecu_online:
-        async_add_entities(entities)
-
-    if not coordinator.data["pid"]:
-        return async_add_entities(entities)
-
-    for key in coordinator.data["pid"]:
-        append = False
-        if coordinator.data["pid"][key].get("sensor_type") is not None:
-            if coordinator.data["pid"][key]["sensor_type"] != "binary_sensor":
-                append = True
-        else:
-            append = True
-
-        if append:
-            entities.append(
-                WiCanPidEntity(
-                    coordinator,
-                    {
-                        "key": key,
-                        "name": key,
-                        "class": coordinator.data["pid"][key]["class"],
-                        "unit": coordinator.data["pid"][key]["unit"],
-                    },
-                )
-            )
+    # PID sensors come from the entity plan shared with the binary_sensor platform
+    entities.extend(
+        WiCanPidEntity(coordinator, description)
+        for description in coordinator.entity_plan().pids[SENSOR]
+    )
 
     return async_add_entities(entities)
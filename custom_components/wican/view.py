@@ -0,0 +1,102 @@
+"""HTTP push endpoint for WiCAN AutoPID data.
+
+Purpose: let the device (or a relay) POST AutoPID values directly to Home
+Assistant, so entities update without polling the device.
+"""
+
+from __future__ import annotations
+
+import hmac
+from http import HTTPStatus
+import json
+import logging
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_PUSH_TOKEN,
+    DATA_SHARED,
+    DOMAIN,
+    PUSH_MAX_PAYLOAD_BYTES,
+    PUSH_MODE_HTTP,
+    PUSH_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PUSH_VIEW = "push_view"
+
+
+def async_register_push_view(hass: HomeAssistant) -> None:
+    """Register the push view once for all WiCAN config entries."""
+    shared = hass.data.setdefault(DATA_SHARED, {})
+    if shared.get(DATA_PUSH_VIEW):
+        return
+    hass.http.register_view(WiCanPushView(hass))
+    shared[DATA_PUSH_VIEW] = True
+
+
+class WiCanPushView(HomeAssistantView):
+    """Accept AutoPID JSON pushed for a WiCAN config entry.
+
+    The device cannot log in to Home Assistant, so requests are authenticated
+    with the per-entry push token, sent as ``Authorization: Bearer <token>``
+    header or as ``token`` query parameter.
+    """
+
+    url = PUSH_URL
+    name = "api:wican:push"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view with the HomeAssistant object to look up coordinators."""
+        self.hass = hass
+
+    async def post(self, request, entry_id: str):
+        """Handle a push of AutoPID values (e.g. {"SOC_BMS": 38}) for one config entry."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if (
+            coordinator is None
+            or coordinator.push_mode != PUSH_MODE_HTTP
+            or not coordinator.config_entry.data.get(CONF_PUSH_TOKEN)
+        ):
+            return self.json_message("Unknown WiCAN entry", HTTPStatus.NOT_FOUND)
+
+        if not _token_valid(request, coordinator.config_entry.data[CONF_PUSH_TOKEN]):
+            return self.json_message("Invalid token", HTTPStatus.UNAUTHORIZED)
+
+        if (request.content_length or 0) > PUSH_MAX_PAYLOAD_BYTES:
+            return self.json_message(
+                "Payload too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            )
+        # Content-Length may be missing (chunked); never read more than the limit.
+        # read(n) returns what is buffered so far, so read until EOF.
+        body = bytearray()
+        while len(body) <= PUSH_MAX_PAYLOAD_BYTES:
+            chunk = await request.content.read(PUSH_MAX_PAYLOAD_BYTES + 1 - len(body))
+            if not chunk:
+                break
+            body += chunk
+        if len(body) > PUSH_MAX_PAYLOAD_BYTES:
+            return self.json_message(
+                "Payload too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            )
+
+        try:
+            values = json.loads(body)
+        except ValueError:
+            return self.json_message("Invalid JSON", HTTPStatus.BAD_REQUEST)
+        if not isinstance(values, dict):
+            return self.json_message("Expected a JSON object", HTTPStatus.BAD_REQUEST)
+
+        coordinator.async_push_pid_values(values)
+        _LOGGER.debug("Received %s pushed WiCAN PID values", len(values))
+        return self.json({"received": len(values)})
+
+
+def _token_valid(request, token: str) -> bool:
+    """Compare the token from the request with the entry token in constant time."""
+    auth = request.headers.get("Authorization", "")
+    provided = auth[7:] if auth.startswith("Bearer ") else request.query.get("token", "")
+    return hmac.compare_digest(provided.encode(), token.encode())
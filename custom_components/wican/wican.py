@@ -4,13 +4,26 @@ Adds bounded timeouts and robust exception handling so callers can
 reliably detect unreachable devices and trigger stale/snapshot fallback.
 """
 
+import hashlib
+import json
 import logging
+import time
 
 import aiohttp
 import asyncio
 
+from .metrics import WiCanMetrics
+from .pid_table import PidTable
+
 _LOGGER = logging.getLogger(__name__)
 
+# The ESP32 HTTP server only keeps a handful of sockets open, so keep the
+# pool small and hold connections open between polls.
+CONNECTION_LIMIT_PER_HOST = 2
+KEEPALIVE_TIMEOUT = 60.0
+# The car configuration rarely changes; refresh it on this schedule at most
+CAR_CONFIG_MAX_AGE = 600.0
+
 
 class WiCan:
     """WiCan device connection via API endpoints.
@@ -19,14 +32,46 @@ class WiCan:
     ----------
     ip : Any
         IP-Address or hostname / mDNS name of the WiCAN device.
+    car_config_fingerprint : str | None
+        Hash of the cached car configuration, changes whenever the profile changes.
+    metrics : WiCanMetrics
+        Latency, decode time, payload size and outcome counters per endpoint.
 
     """
 
     ip = ""
+    car_config_fingerprint: str | None = None
 
     def __init__(self, ip) -> None:
         """Initialize the WiCan API integration with the device IP / name."""
         self.ip = ip
+        self._session: aiohttp.ClientSession | None = None
+        self._car_config: dict | None = None
+        self._pid_table: PidTable | None = None
+        self._car_config_fetched: float = 0.0
+        # PID keys known at the last car configuration download, incl. extra /autopid_data keys
+        self._known_pid_keys: frozenset = frozenset()
+        self.metrics = WiCanMetrics()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the long-lived session for this device, creating it on first use.
+
+        The session owns a keep-alive connector limited per host, so consecutive
+        calls reuse the same TCP connection instead of a new handshake per request.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def async_close(self) -> None:
+        """Close the pooled session and release its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def call(self, endpoint, params=None, method="get", timeout_total: float = 5.0):
         """Call WiCan device HTTP-API endpoint and provide response.
@@ -39,6 +84,8 @@ class WiCan:
             Parameters to be passed to call the device endpoint.
         method : str
             HTTP method (e.g. GET, POST, PUT) to be used when calling the endpoint. Default: GET
+        timeout_total : float
+            Total time in seconds allowed for the request, including reading the body.
 
         Returns
         -------
@@ -49,22 +96,63 @@ class WiCan:
         if params is None:
             params = {}
         url = "http://" + self.ip + endpoint
+        metrics = self.metrics
+        started = time.perf_counter()
         try:
             timeout = aiohttp.ClientTimeout(total=timeout_total)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                if method.lower() == "get":
-                    async with session.get(url, params=params) as resp:
-                        resp.data = await resp.json(content_type=None)
-                        return resp
-                else:
-                    # Fallback to GET for unsupported methods in this client
-                    async with session.get(url, params=params) as resp:
-                        resp.data = await resp.json(content_type=None)
-                        return resp
-        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            session = self._get_session()
+            # Only GET is supported by this client; other methods fall back to GET
+            async with session.get(url, params=params, timeout=timeout) as resp:
+                body = await resp.read()
+                received = time.perf_counter()
+                resp.data = json.loads(body) if body.strip() else None
+        except asyncio.TimeoutError as err:
+            metrics.increment(f"{endpoint}.timeout")
+            _LOGGER.debug("WiCAN API call timed out for %s: %s", url, err)
+            raise
+        except (aiohttp.ClientError, OSError) as err:
+            metrics.increment(f"{endpoint}.failure")
             _LOGGER.debug("WiCAN API call failed for %s: %s", url, err)
             raise
 
+        metrics.increment(f"{endpoint}.success")
+        metrics.record(f"{endpoint}.latency", received - started)
+        metrics.record(f"{endpoint}.decode", time.perf_counter() - received)
+        metrics.add_bytes(endpoint, len(body))
+        return resp
+
+    async def call_concurrently(self, *endpoints, timeout_total: float = 5.0) -> list:
+        """Call several endpoints at the same time under one shared deadline.
+
+        Parameters
+        ----------
+        endpoints : Any
+            Paths / endpoints to be called on the WiCAN device API.
+        timeout_total : float
+            Total time in seconds allowed for all requests together.
+
+        Returns
+        -------
+        list
+            Responses in the same order as the given endpoints.
+
+        Raises the first error encountered; requests still in flight are cancelled.
+
+        """
+        tasks = [
+            asyncio.ensure_future(self.call(endpoint, timeout_total=timeout_total))
+            for endpoint in endpoints
+        ]
+        try:
+            async with asyncio.timeout(timeout_total):
+                return await asyncio.gather(*tasks)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Reap cancelled/failed siblings so their errors are not reported as unretrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def test(self) -> bool:
         """Test, if the WiCan device API is reachable and the protocal is set to "auto_pid".
 
@@ -82,9 +170,14 @@ class WiCan:
 
         return result.status == 200 and result.data.get("protocol") == "auto_pid"
 
-    async def check_status(self):
+    async def check_status(self, timeout_total: float = 5.0):
         """Check, if the WiCan device API is reachable.
 
+        Parameters
+        ----------
+        timeout_total : float
+            Total time in seconds allowed for the status request.
+
         Returns
         -------
         bool
@@ -92,7 +185,7 @@ class WiCan:
 
         """
         try:
-            result = await self.call("/check_status")
+            result = await self.call("/check_status", timeout_total=timeout_total)
         except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
             _LOGGER.debug("WiCAN check_status failed: %s", err)
             return False
@@ -102,32 +195,115 @@ class WiCan:
 
         return result.data
 
+    def car_config_expired(self) -> bool:
+        """Return True if the cached car configuration must be downloaded again."""
+        if self._car_config is None:
+            return True
+        return time.monotonic() - self._car_config_fetched >= CAR_CONFIG_MAX_AGE
+
+    def invalidate_car_config(self) -> None:
+        """Drop the cached car configuration so the next poll downloads it again (e.g. on ECU reconnect)."""
+        self._car_config = None
+
+    def _set_car_config(self, meta: dict) -> None:
+        """Cache parsed car configuration metadata and the PID table built from its layout."""
+        fingerprint = hashlib.sha1(
+            json.dumps(meta, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        changed = fingerprint != self.car_config_fingerprint
+        if changed:
+            _LOGGER.debug("WiCAN car configuration changed: %s", fingerprint)
+        self.car_config_fingerprint = fingerprint
+        self._car_config = {
+            key: {k: v for k, v in entry.items() if k != "value"}
+            if isinstance(entry, dict)
+            else {}
+            for key, entry in meta.items()
+        }
+        if changed or self._pid_table is None:
+            # Same configuration downloaded again: keep the table and its values
+            self._pid_table = PidTable(self._car_config.items())
+        self._car_config_fetched = time.monotonic()
+
     async def get_pid(self):
         """Call the WiCan API to receive the car configuration metadata (e.g. class and unit of each parameter) and the current values (e.g. SOC_BMS: 38%).
 
+        The car configuration is cached and only downloaded again after
+        ``CAR_CONFIG_MAX_AGE`` seconds, after ``invalidate_car_config`` or when
+        the device reports PIDs that are not part of the cached configuration.
+
+        Returns
+        PidTable | bool
+            If data can be retrieved from the API: Mapping of car configuration metadata combined with current data.
+            Otherwise returns False.
+
+        """
+        values = await self.fetch_pid_values()
+        if values is False:
+            return False
+        return self.merge_pid_values(values)
+
+    async def fetch_pid_values(self):
+        """Call the WiCan API to receive the current PID values without merging them into the PID table.
+
+        Refreshes the cached car configuration like ``get_pid``. Used when the
+        values may still be dropped (e.g. polled together with a status request
+        that can fail); ``merge_pid_values`` commits them.
+
         Returns
         dict | bool
-            If data can be retrieved from the API: Dictionary of car configuration metadata combined with current data.
+            If data can be retrieved from the API: PID values as returned by ``/autopid_data``.
             Otherwise returns False.
 
         """
+        refresh = self.car_config_expired()
         try:
-            pid_data = await self.call("/autopid_data")
-            pid_meta = await self.call("/load_car_config")
+            if refresh:
+                pid_data, pid_meta = await self.call_concurrently(
+                    "/autopid_data", "/load_car_config"
+                )
+            else:
+                pid_data = await self.call("/autopid_data")
         except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
             _LOGGER.debug("WiCAN get_pid failed: %s", err)
             return False
 
-        if not isinstance(pid_meta.data, dict):
-            return False
+        if refresh:
+            if not isinstance(pid_meta.data, dict):
+                return False
+            self._set_car_config(pid_meta.data)
+
+        values = pid_data.data if isinstance(pid_data.data, dict) else {}
+
+        if refresh:
+            # Keys the device reports without configuring them are ignored, not a change
+            self._known_pid_keys = frozenset(self._car_config).union(values)
+        elif not values.keys() <= self._known_pid_keys:
+            # Device reports PIDs we didn't see before: the car configuration changed
+            _LOGGER.debug("WiCAN reported unknown PIDs; reloading car configuration")
+            self.invalidate_car_config()
+            return await self.fetch_pid_values()
+
+        return values
+
+    def merge_pid_values(self, values: dict) -> PidTable:
+        """Combine cached car configuration metadata with current PID values.
+
+        The values are written in place into the PID table of the car
+        configuration, so polling does not allocate a new dict per PID.
 
-        result = {}
-        for key in pid_meta.data:
-            result[key] = pid_meta.data[key]
-            # Treat missing or falsey readings as None so HA renders "unknown"
-            value = pid_data.data[key] if key in pid_data.data else None
-            if value is False:
-                value = None
-            result[key]["value"] = value
+        Parameters
+        ----------
+        values : dict
+            PID values as returned by ``/autopid_data`` (e.g. {"SOC_BMS": 38}).
+
+        Returns
+        -------
+        PidTable
+            Mapping of car configuration metadata combined with current data.
+            The same table is returned (and updated) until the car configuration changes.
 
-        return result
+        """
+        # Missing or falsey readings become None so HA renders "unknown"
+        self._pid_table.update(values)
+        return self._pid_table
@@ -0,0 +1,469 @@
+"""Benchmarks for the WiCAN coordinator update cycle at scale.
+
+Drives ``WiCanCoordinator.get_data``, ``_persist_snapshot``, entity creation in
+the sensor / binary_sensor platforms and the coordinator -> entity fan-out with
+synthetic car profiles of 10, 100, 1,000 and 5,000 PIDs. Reports time per
+cycle, allocations per cycle and state writes per cycle.
+
+Not collected by the default test run. Run with either of:
+
+    PYTHONPATH=. pytest -q -s tests/benchmarks/bench_update_cycle.py
+    PYTHONPATH=. python tests/benchmarks/bench_update_cycle.py
+"""
+
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime, timezone
+from enum import StrEnum
+
+import pytest
+
+PROFILE_SIZES = (10, 100, 1000, 5000)
+ROUNDS = 20
+
+
+def install_ha_stubs():
+    """Install minimal Home Assistant stubs that behave like HA where it matters for cost."""
+    ha_pkg = types.ModuleType("homeassistant")
+
+    const_mod = types.ModuleType("homeassistant.const")
+    const_mod.CONF_IP_ADDRESS = "ip_address"
+    const_mod.CONF_SCAN_INTERVAL = "scan_interval"
+    const_mod.STATE_ON = "on"
+    const_mod.STATE_OFF = "off"
+
+    class Platform(StrEnum):
+        BINARY_SENSOR = "binary_sensor"
+        SENSOR = "sensor"
+
+    class EntityCategory(StrEnum):
+        CONFIG = "config"
+        DIAGNOSTIC = "diagnostic"
+
+    const_mod.Platform = Platform
+    const_mod.EntityCategory = EntityCategory
+
+    core_mod = types.ModuleType("homeassistant.core")
+
+    class HomeAssistant:
+        def __init__(self):
+            self.data = {}
+            self.tasks = []
+
+        def async_create_task(self, coro):
+            task = asyncio.ensure_future(coro)
+            self.tasks.append(task)
+            return task
+
+    core_mod.HomeAssistant = HomeAssistant
+    core_mod.callback = lambda fn: fn
+
+    exceptions_mod = types.ModuleType("homeassistant.exceptions")
+
+    class ConfigEntryNotReady(Exception):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args)
+
+    exceptions_mod.ConfigEntryNotReady = ConfigEntryNotReady
+
+    helpers_pkg = types.ModuleType("homeassistant.helpers")
+    update_coordinator_mod = types.ModuleType("homeassistant.helpers.update_coordinator")
+
+    class DataUpdateCoordinator:
+        """Listener bookkeeping modelled on Home Assistant's coordinator."""
+
+        def __init__(self, hass, logger, name=None, update_interval=None):
+            self.hass = hass
+            self.logger = logger
+            self.name = name
+            self.update_interval = update_interval
+            self.data = None
+            self._listeners = {}
+
+        def async_add_listener(self, update_callback, context=None):
+            def remove_listener():
+                self._listeners.pop(remove_listener)
+
+            self._listeners[remove_listener] = (update_callback, context)
+            return remove_listener
+
+        def async_update_listeners(self):
+            for update_callback, _ in list(self._listeners.values()):
+                update_callback()
+
+        async def async_refresh(self):
+            self.data = await self._async_update_data()
+            self.async_update_listeners()
+
+        def async_set_updated_data(self, data):
+            self.data = data
+            self.async_update_listeners()
+
+    class CoordinatorEntity:
+        def __init__(self, coordinator, context=None):
+            self.coordinator = coordinator
+            self.coordinator_context = context
+
+        async def async_added_to_hass(self):
+            self.coordinator.async_add_listener(
+                self._handle_coordinator_update, self.coordinator_context
+            )
+
+        def async_write_ha_state(self):
+            # Read what Home Assistant reads on every state write
+            STATE_WRITES[0] += 1
+            _ = (
+                self.state,
+                self.available,
+                self.device_info,
+                self.unit_of_measurement,
+                self.device_class,
+                self.entity_category,
+                self.extra_state_attributes,
+            )
+
+    update_coordinator_mod.DataUpdateCoordinator = DataUpdateCoordinator
+    update_coordinator_mod.CoordinatorEntity = CoordinatorEntity
+
+    restore_state_mod = types.ModuleType("homeassistant.helpers.restore_state")
+
+    class RestoreEntity:
+        async def async_get_last_state(self):
+            return None
+
+    restore_state_mod.RestoreEntity = RestoreEntity
+
+    storage_mod = types.ModuleType("homeassistant.helpers.storage")
+
+    class Store:
+        def __init__(self, hass, version, key, *args, **kwargs):
+            self.hass = hass
+            self.version = version
+            self.key = key
+            self.data = None
+            self.save_calls = 0
+            self._delayed = None
+
+        async def async_load(self):
+            return self.data
+
+        async def async_save(self, data):
+            self.save_calls += 1
+            self.data = data
+
+        def async_delay_save(self, data_func, delay=0):
+            self._delayed = data_func
+
+        async def flush_delayed(self):
+            if self._delayed is not None:
+                data_func, self._delayed = self._delayed, None
+                await self.async_save(data_func())
+
+    storage_mod.Store = Store
+
+    util_pkg = types.ModuleType("homeassistant.util")
+    dt_mod = types.ModuleType("homeassistant.util.dt")
+    dt_mod.utcnow = lambda: datetime.now(timezone.utc)
+    dt_mod.parse_datetime = lambda s: datetime.fromisoformat(s)
+    dt_mod.datetime = datetime
+
+    components_pkg = types.ModuleType("homeassistant.components")
+    number_mod = types.ModuleType("homeassistant.components.number")
+
+    class NumberDeviceClass(StrEnum):
+        DURATION = "duration"
+        VOLTAGE = "voltage"
+
+    number_mod.NumberDeviceClass = NumberDeviceClass
+
+    config_entries_mod = types.ModuleType("homeassistant.config_entries")
+    config_entries_mod.ConfigEntry = object
+
+    sys.modules.update(
+        {
+            "homeassistant": ha_pkg,
+            "homeassistant.const": const_mod,
+            "homeassistant.core": core_mod,
+            "homeassistant.exceptions": exceptions_mod,
+            "homeassistant.helpers": helpers_pkg,
+            "homeassistant.helpers.update_coordinator": update_coordinator_mod,
+            "homeassistant.helpers.restore_state": restore_state_mod,
+            "homeassistant.helpers.storage": storage_mod,
+            "homeassistant.util": util_pkg,
+            "homeassistant.util.dt": dt_mod,
+            "homeassistant.components": components_pkg,
+            "homeassistant.components.number": number_mod,
+            "homeassistant.config_entries": config_entries_mod,
+        }
+    )
+
+
+STATE_WRITES = [0]
+
+
+def load_integration():
+    """Load the integration modules without importing the package __init__."""
+    install_ha_stubs()
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    cc_pkg = types.ModuleType("custom_components")
+    cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = types.ModuleType("custom_components.wican")
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+    sys.modules["custom_components"] = cc_pkg
+    sys.modules["custom_components.wican"] = wican_pkg
+
+    modules = {}
+    for name in ("const", "circuit_breaker", "coordinator", "entity", "sensor", "binary_sensor"):
+        full_name = f"custom_components.wican.{name}"
+        spec = importlib.util.spec_from_file_location(
+            full_name, os.path.join(repo_root, "custom_components", "wican", f"{name}.py")
+        )
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[full_name] = mod
+        spec.loader.exec_module(mod)
+        modules[name] = mod
+    return modules
+
+
+def synthetic_profile(size: int) -> dict:
+    """Return a car configuration with ``size`` PIDs, every tenth one a binary sensor."""
+    profile = {}
+    for i in range(size):
+        if i % 10 == 9:
+            profile[f"PID_{i}"] = {"class": "none", "unit": "none", "sensor_type": "binary_sensor"}
+        else:
+            profile[f"PID_{i}"] = {"class": "none", "unit": "%", "sensor_type": "sensor"}
+    return profile
+
+
+class SyntheticAPI:
+    """Fake WiCan API serving a synthetic profile; a tenth of the values change per poll."""
+
+    ip = "127.0.0.1"
+    car_config_fingerprint = "bench"
+
+    def __init__(self, size: int) -> None:
+        self.profile = synthetic_profile(size)
+        self.keys = list(self.profile)
+        self.cycle = 0
+        self.table = None
+        self.last_values = {}
+        # Number of PIDs whose value differs from the previous poll, per poll
+        self.changes = []
+        self.status = {
+            "device_id": "bench000000",
+            "ecu_status": "online",
+            "hw_version": "WiCAN-OBD",
+            "fw_version": "4.0",
+            "sta_ip": "127.0.0.1",
+            "batt_voltage": "12.6V",
+            "protocol": "auto_pid",
+            "ble_status": "disable",
+            "sleep_status": "enable",
+            "sleep_volt": "13.1",
+            "batt_alert": "disable",
+            "batt_alert_ssid": "",
+            "batt_alert_volt": "11.0",
+            "batt_alert_url": "",
+            "batt_alert_port": "1883",
+            "batt_mqtt_user": "",
+            "mqtt_en": "disable",
+            "mqtt_url": "",
+            "mqtt_port": "1883",
+            "mqtt_user": "",
+        }
+
+    async def check_status(self, **kwargs):
+        return dict(self.status)
+
+    async def get_pid(self):
+        return self.merge_pid_values(await self.fetch_pid_values())
+
+    async def fetch_pid_values(self):
+        self.cycle += 1
+        changed = self.cycle % 10
+        values = {
+            key: i + (self.cycle if i % 10 == changed else 0)
+            for i, key in enumerate(self.profile)
+        }
+        last = self.last_values
+        self.changes.append(sum(1 for key, value in values.items() if last.get(key) != value))
+        self.last_values = values
+        return values
+
+    def merge_pid_values(self, values):
+        # Like WiCan: raw values written in place into the car config's PID table
+        if self.table is None:
+            PidTable = sys.modules["custom_components.wican.pid_table"].PidTable
+            self.table = PidTable(self.profile.items())
+        self.table.update(values)
+        return self.table
+
+    def invalidate_car_config(self):
+        pass
+
+
+class BenchEntry:
+    def __init__(self) -> None:
+        self.entry_id = "bench"
+        self.data = {"ip_address": "127.0.0.1"}
+        self.options = {}
+
+
+def measure(run, rounds: int = ROUNDS) -> dict:
+    """Run an async callable ``rounds`` times; return median time, allocations and state writes per call.
+
+    Time is measured in its own rounds with tracemalloc off, since tracing
+    slows down every allocation; allocations are counted in separate rounds.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        durations = []
+        writes = []
+        for _ in range(rounds):
+            STATE_WRITES[0] = 0
+            start = time.perf_counter()
+            loop.run_until_complete(run())
+            durations.append(time.perf_counter() - start)
+            writes.append(STATE_WRITES[0])
+        allocations = []
+        for _ in range(rounds):
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            loop.run_until_complete(run())
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            allocations.append(
+                sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+            )
+    finally:
+        loop.close()
+    return {
+        "time_ms": statistics.median(durations) * 1000,
+        "allocations": int(statistics.median(allocations)),
+        "state_writes": int(statistics.median(writes)),
+    }
+
+
+def build(size: int):
+    """Create a coordinator with live data and the entities of both platforms added to it."""
+    modules = load_integration()
+    hass = sys.modules["homeassistant.core"].HomeAssistant()
+    api = SyntheticAPI(size)
+    coordinator = modules["coordinator"].WiCanCoordinator(hass, BenchEntry(), api)
+    entities = []
+
+    async def setup():
+        await coordinator.async_refresh()
+        hass.data.setdefault("wican", {})["bench"] = coordinator
+        for platform in ("sensor", "binary_sensor"):
+            await modules[platform].async_setup_entry(hass, BenchEntry(), entities.extend)
+        for entity in entities:
+            await entity.async_added_to_hass()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(setup())
+    loop.close()
+    return modules, hass, coordinator, entities
+
+
+def bench_get_data(size: int) -> dict:
+    _, _, coordinator, _ = build(size)
+
+    async def run():
+        coordinator.data = await coordinator.get_data()
+
+    return measure(run)
+
+
+def bench_persist_snapshot(size: int) -> dict:
+    _, _, coordinator, _ = build(size)
+    api = coordinator.api
+
+    async def run():
+        # One changed poll worth of snapshot work, including the delayed write
+        pid = await api.get_pid()
+        coordinator._record_pid_values(pid)
+        await coordinator._persist_snapshot(
+            {"device_id": "bench000000", "status": api.status, "pid": pid, "timestamp": "now"}
+        )
+        await coordinator._store.flush_delayed()
+
+    return measure(run)
+
+
+def bench_entity_creation(size: int) -> dict:
+    modules, hass, coordinator, _ = build(size)
+
+    async def run():
+        entities = []
+        for platform in ("sensor", "binary_sensor"):
+            await modules[platform].async_setup_entry(hass, BenchEntry(), entities.extend)
+
+    return measure(run, rounds=5)
+
+
+def bench_update_fan_out(size: int) -> dict:
+    _, _, coordinator, _ = build(size)
+    api = coordinator.api
+
+    async def run():
+        await coordinator.async_refresh()
+
+    result = measure(run)
+    result["changed_pids"] = int(statistics.median(api.changes[-ROUNDS:]))
+    return result
+
+
+BENCHMARKS = {
+    "get_data": bench_get_data,
+    "persist_snapshot": bench_persist_snapshot,
+    "entity_creation": bench_entity_creation,
+    "update_fan_out": bench_update_fan_out,
+}
+# Benchmarks of the work done on every poll, as opposed to once per setup
+CYCLE_BENCHMARKS = ("get_data", "persist_snapshot", "update_fan_out")
+# Allowed growth of allocations per PID from 1,000 to 5,000 PIDs; quadratic work would be 5x
+ALLOCATION_GROWTH = 1.5
+
+
+@pytest.mark.parametrize("size", PROFILE_SIZES)
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark(name, size):
+    result = BENCHMARKS[name](size)
+    print(
+        f"\n{name:>18} {size:>5} PIDs: {result['time_ms']:9.3f} ms/cycle "
+        f"{result['allocations']:>8} allocs/cycle {result['state_writes']:>6} state writes/cycle"
+    )
+    if name == "update_fan_out":
+        # Changed-only dispatch: one state write per changed PID, none for unchanged ones
+        assert result["state_writes"] == result["changed_pids"]
+    else:
+        assert result["state_writes"] == 0
+
+
+@pytest.mark.parametrize("name", CYCLE_BENCHMARKS)
+def test_allocations_per_cycle_scale_linearly(name):
+    small, large = (BENCHMARKS[name](size)["allocations"] for size in (1000, 5000))
+    assert large / 5000 <= ALLOCATION_GROWTH * small / 1000
+
+
+def main() -> None:
+    print(f"{'benchmark':>18} {'PIDs':>5} {'ms/cycle':>10} {'allocs':>9} {'writes':>7}")
+    for name, bench in BENCHMARKS.items():
+        for size in PROFILE_SIZES:
+            result = bench(size)
+            print(
+                f"{name:>18} {size:>5} {result['time_ms']:10.3f} "
+                f"{result['allocations']:>9} {result['state_writes']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
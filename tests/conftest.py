@@ -0,0 +1,24 @@
+import sys
+
+import pytest
+import pytest_asyncio
+
+
+def import_real_aiohttp():
+    """Import the installed aiohttp, replacing the stub some tests put in sys.modules."""
+    stub = sys.modules.get("aiohttp")
+    if stub is not None and getattr(stub, "__file__", None) is None:
+        del sys.modules["aiohttp"]
+    return pytest.importorskip("aiohttp.web")
+
+
+@pytest_asyncio.fixture
+async def wican_simulator():
+    """Start a fake WiCAN device on a free local port; configure it through the yielded object."""
+    import_real_aiohttp()
+    from wican_simulator import WiCanSimulator
+
+    simulator = WiCanSimulator(seed=0)
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
@@ -20,9 +20,20 @@ def load_wican_module():
         def __init__(self, total=None):
             self.total = total
 
+    class TCPConnector:
+        def __init__(self, limit_per_host=0, keepalive_timeout=None):
+            self.limit_per_host = limit_per_host
+            self.keepalive_timeout = keepalive_timeout
+
     class ClientSession:
-        def __init__(self, timeout=None):
+        def __init__(self, timeout=None, connector=None):
             self.timeout = timeout
+            self.connector = connector
+            self.closed = False
+            self.get_calls = 0
+
+        async def close(self):
+            self.closed = True
 
         async def __aenter__(self):
             return self
@@ -31,6 +42,8 @@ def load_wican_module():
             return False
 
         def get(self, *args, **kwargs):
+            self.get_calls += 1
+
             class _Resp:
                 async def __aenter__(self_inner):
                     return self_inner
@@ -41,6 +54,9 @@ def load_wican_module():
                 async def json(self, content_type=None):
                     return {}
 
+                async def read(self):
+                    return b"{}"
+
                 @property
                 def status(self):
                     return 200
@@ -49,11 +65,19 @@ def load_wican_module():
 
     aiohttp_mod.ClientError = ClientError
     aiohttp_mod.ClientTimeout = ClientTimeout
+    aiohttp_mod.TCPConnector = TCPConnector
     aiohttp_mod.ClientSession = ClientSession
     sys.modules["aiohttp"] = aiohttp_mod
 
-    # Load module from file
+    # Create package shells to avoid importing __init__.py
     repo_root = os.path.dirname(os.path.dirname(__file__))
+    cc_pkg = sys.modules.setdefault("custom_components", types.ModuleType("custom_components"))
+    if not hasattr(cc_pkg, "__path__"):
+        cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = sys.modules.setdefault("custom_components.wican", types.ModuleType("custom_components.wican"))
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+
+    # Load module from file
     name = "custom_components.wican.wican"
     file_path = os.path.join(repo_root, "custom_components", "wican", "wican.py")
     spec = importlib.util.spec_from_file_location(name, file_path)
@@ -94,6 +118,124 @@ async def test_get_pid_timeout_returns_false(monkeypatch):
     assert ok is False
 
 
+@pytest.mark.asyncio
+async def test_call_reuses_pooled_session_until_closed():
+    wican_mod = load_wican_module()
+    WiCan = getattr(wican_mod, "WiCan")
+    api = WiCan("1.2.3.4")
+
+    await api.call("/check_status")
+    session = api._session
+    await api.call("/autopid_data")
+    assert api._session is session
+    assert session.get_calls == 2
+    assert session.connector.limit_per_host == wican_mod.CONNECTION_LIMIT_PER_HOST
+
+    await api.async_close()
+    assert session.closed is True
+    assert api._session is None
+
+
+@pytest.mark.asyncio
+async def test_get_pid_fetches_endpoints_concurrently(monkeypatch):
+    wican_mod = load_wican_module()
+    WiCan = getattr(wican_mod, "WiCan")
+    api = WiCan("1.2.3.4")
+
+    in_flight = set()
+    overlapped = []
+
+    async def fake_call(endpoint, *args, **kwargs):
+        in_flight.add(endpoint)
+        await asyncio.sleep(0)
+        overlapped.append(len(in_flight))
+        in_flight.discard(endpoint)
+        resp = types.SimpleNamespace(status=200)
+        if endpoint == "/autopid_data":
+            resp.data = {"SOC": 50}
+        else:
+            resp.data = {"SOC": {"class": "battery", "unit": "%"}}
+        return resp
+
+    monkeypatch.setattr(api, "call", fake_call, raising=True)
+
+    result = await api.get_pid()
+    assert result == {"SOC": {"class": "battery", "unit": "%", "value": 50}}
+    assert max(overlapped) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_pid_cancels_sibling_request_on_failure(monkeypatch):
+    wican_mod = load_wican_module()
+    WiCan = getattr(wican_mod, "WiCan")
+    api = WiCan("1.2.3.4")
+    cancelled = []
+
+    async def fake_call(endpoint, *args, **kwargs):
+        if endpoint == "/autopid_data":
+            raise asyncio.TimeoutError()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(endpoint)
+            raise
+
+    monkeypatch.setattr(api, "call", fake_call, raising=True)
+
+    assert await api.get_pid() is False
+    assert cancelled == ["/load_car_config"]
+
+
+@pytest.mark.asyncio
+async def test_get_pid_caches_car_config_between_polls(monkeypatch):
+    wican_mod = load_wican_module()
+    WiCan = getattr(wican_mod, "WiCan")
+    api = WiCan("1.2.3.4")
+    calls = []
+    values = {"SOC": 50}
+
+    async def fake_call(endpoint, *args, **kwargs):
+        calls.append(endpoint)
+        resp = types.SimpleNamespace(status=200)
+        if endpoint == "/autopid_data":
+            resp.data = dict(values)
+        else:
+            resp.data = {"SOC": {"class": "battery", "unit": "%"}}
+        return resp
+
+    monkeypatch.setattr(api, "call", fake_call, raising=True)
+
+    first = await api.get_pid()
+    assert first["SOC"]["value"] == 50
+    values["SOC"] = 51
+    second = await api.get_pid()
+    assert calls == ["/autopid_data", "/load_car_config", "/autopid_data"]
+    # Values are updated in place in the PID table of the car configuration
+    assert second is first
+    assert second["SOC"] == {"class": "battery", "unit": "%", "value": 51}
+    # Cached metadata is never mutated by merging values
+    assert "value" not in api._car_config["SOC"]
+
+    # Unknown PID reported by the device triggers a config reload
+    calls.clear()
+    values["NEW"] = 1
+    await api.get_pid()
+    assert calls == ["/autopid_data", "/autopid_data", "/load_car_config"]
+
+    # A PID the device keeps reporting without configuring it is not reloaded again
+    calls.clear()
+    await api.get_pid()
+    await api.get_pid()
+    assert calls == ["/autopid_data", "/autopid_data"]
+
+    # Explicit invalidation (e.g. ECU reconnect) downloads the config again
+    calls.clear()
+    del values["NEW"]
+    api.invalidate_car_config()
+    await api.get_pid()
+    assert "/load_car_config" in calls
+
+
 def load_coordinator_module():
     # Minimal HA stubs required by coordinator
     ha_pkg = types.ModuleType("homeassistant")
@@ -145,6 +287,8 @@ def load_coordinator_module():
             return self.data
         async def async_save(self, data):
             self.data = data
+        def async_delay_save(self, data_func, delay=0):
+            self.delayed_save = data_func
     helpers_storage_mod.Store = Store
 
     util_pkg = types.ModuleType("homeassistant.util")
@@ -236,3 +380,31 @@ async def test_coordinator_stale_on_timeout(monkeypatch):
     data2 = await coordinator.get_data()
     assert data2 == coordinator.data
     assert coordinator.stale() is True
+
+
+@pytest.mark.asyncio
+async def test_call_records_latency_bytes_and_outcomes(monkeypatch):
+    wican_mod = load_wican_module()
+    WiCan = getattr(wican_mod, "WiCan")
+    api = WiCan("1.2.3.4")
+
+    await api.call("/check_status")
+    await api.call("/check_status")
+
+    class TimeoutSession:
+        closed = False
+
+        def get(self, *args, **kwargs):
+            raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(api, "_get_session", lambda: TimeoutSession())
+    with pytest.raises(asyncio.TimeoutError):
+        await api.call("/autopid_data")
+
+    metrics = api.metrics.as_dict()
+    assert metrics["counters"] == {"/autopid_data.timeout": 1, "/check_status.success": 2}
+    assert metrics["bytes_received"] == {"/check_status": 4}
+    latency = metrics["timings"]["/check_status.latency"]
+    assert latency["count"] == 2
+    assert {"p50_ms", "p95_ms", "p99_ms"} <= latency.keys()
+    assert metrics["timings"]["/check_status.decode"]["count"] == 2
@@ -106,6 +106,9 @@ class Store:
     async def async_save(self, data):
         return None
 
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_save = data_func
+
 
 helpers_storage_mod.Store = Store
 sys.modules["homeassistant.helpers.storage"] = helpers_storage_mod
@@ -172,9 +175,17 @@ class DummyCoordinator:
     def get_status(self, key):
         return self.data["status"].get(key)
 
-    def get_pid_value(self, key):
+    def pid_table(self):
+        return None
+
+    def get_pid_value(self, key, slot=None):
         return False
 
+    def cycle_view(self):
+        # Rebuilt on every call; the tests change stale / last update between writes
+        CycleView = sys.modules["custom_components.wican.cycle_view"].CycleView
+        return CycleView("wican", self.data["status"], self._stale, self.last_successful_update)
+
     def device_info(self):
         return {
             "identifiers": {("wican", self.data["status"]["device_id"])},
@@ -225,7 +236,7 @@ async def test_entity_updates_on_fresh_data_and_metadata():
     # Fresh update arrives
     coord._stale = False
     coord.last_successful_update = datetime.now(timezone.utc)
-    coord.get_pid_value = lambda k: 55
+    coord.get_pid_value = lambda k, slot=None: 55
     ent._handle_coordinator_update()
     assert ent.state == 55
     attrs = ent.extra_state_attributes
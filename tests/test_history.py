@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def load_history_module():
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    cc_pkg = sys.modules.setdefault("custom_components", types.ModuleType("custom_components"))
+    if not hasattr(cc_pkg, "__path__"):
+        cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = sys.modules.setdefault("custom_components.wican", types.ModuleType("custom_components.wican"))
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+
+    name = "custom_components.wican.history"
+    file_path = os.path.join(repo_root, "custom_components", "wican", "history.py")
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def make_table():
+    PidTable = sys.modules["custom_components.wican.pid_table"].PidTable
+    return PidTable(
+        [
+            ("SOC", {"class": "battery", "unit": "%"}),
+            ("DOOR", {"class": "door", "sensor_type": "binary_sensor"}),
+            ("TEMP", {"class": "temperature", "unit": "°C"}),
+        ]
+    )
+
+
+def test_rolling_statistics_over_ring_buffer():
+    history_mod = load_history_module()
+    table = make_table()
+    history = history_mod.PidHistory(3)
+
+    for second, soc in enumerate([10, 20, 30, 40]):
+        table.update({"SOC": soc, "DOOR": "on", "TEMP": 21 if second == 3 else None})
+        history.record(table, float(second))
+
+    # Only the last 3 samples are kept: 20, 30, 40 at t=1..3
+    assert history.count == 3
+    attrs = history.attributes(table, table.slot("SOC"))
+    assert attrs["history_min"] == 20
+    assert attrs["history_max"] == 40
+    assert attrs["history_mean"] == 30
+    assert attrs["history_stddev"] == pytest.approx(np.std([20, 30, 40]), abs=1e-3)
+    assert attrs["history_rate"] == 10
+    assert attrs["history_samples"] == 3
+
+    # Non-numeric and single-sample PIDs get no statistics
+    assert history.attributes(table, table.slot("DOOR")) == {}
+    assert history.attributes(table, table.slot("TEMP")) == {}
+
+
+def test_partial_sample_only_records_given_slots():
+    history_mod = load_history_module()
+    table = make_table()
+    history = history_mod.PidHistory(5)
+    table.update({"SOC": 10, "TEMP": 20})
+    history.record(table, 0.0)
+    table.update({"SOC": 30, "TEMP": 20})
+    history.record(table, 2.0, [table.slot("SOC")])
+
+    assert history.attributes(table, table.slot("SOC"))["history_rate"] == 10
+    # TEMP was not part of the second sample
+    assert history.attributes(table, table.slot("TEMP")) == {}
+
+
+def test_history_resets_for_new_table_and_resize():
+    history_mod = load_history_module()
+    table = make_table()
+    history = history_mod.PidHistory(5)
+    table.update({"SOC": 1})
+    history.record(table, 0.0)
+    table.update({"SOC": 2})
+    history.record(table, 1.0)
+    assert history.attributes(table, 0)["history_samples"] == 2
+
+    other = make_table()
+    assert history.attributes(other, 0) == {}
+    history.record(other, 2.0)
+    assert history.count == 1
+
+    history.resize(10)
+    assert history.count == 0
+    assert history.attributes(other, 0) == {}
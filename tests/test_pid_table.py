@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import sys
+
+
+def load_pid_table_module():
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    name = "custom_components.wican.pid_table"
+    file_path = os.path.join(repo_root, "custom_components", "wican", "pid_table.py")
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules.setdefault(name, mod)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+LAYOUT = {
+    "SOC": {"class": "battery", "unit": "%"},
+    "SPEED": {"class": "speed", "unit": "km/h"},
+    "DOOR": {"class": "door", "sensor_type": "binary_sensor"},
+}
+
+
+def test_table_is_dict_compatible_and_updated_in_place():
+    PidTable = load_pid_table_module().PidTable
+    table = PidTable(LAYOUT.items())
+    assert list(table) == ["SOC", "SPEED", "DOOR"]
+    assert table.slot("SPEED") == 1
+    assert table.slot("RPM") is None
+
+    table.update({"SOC": 50, "SPEED": False})
+    assert table == {
+        "SOC": {"class": "battery", "unit": "%", "value": 50},
+        "SPEED": {"class": "speed", "unit": "km/h", "value": None},
+        "DOOR": {"class": "door", "sensor_type": "binary_sensor", "value": None},
+    }
+    assert table.value(0) == 50
+    assert table.valid_count() == 1
+    assert table.take_changes() == {"SOC"}
+
+    values = table.values
+    table.update({"SOC": 50, "SPEED": 12, "DOOR": "on"})
+    assert table.values is values
+    # Peeking keeps the changes for take_changes()
+    assert sorted(table.changed_keys()) == ["DOOR", "SPEED"]
+    assert table.take_changes() == {"SPEED", "DOOR"}
+    assert table.changed_keys() == []
+    assert table.take_changes() == set()
+
+    assert table.update_partial({"DOOR": "off", "RPM": 800}) == ["RPM"]
+    assert table["DOOR"]["value"] == "off"
+    assert table.take_changes() == {"DOOR"}
+
+
+def test_table_from_entries():
+    PidTable = load_pid_table_module().PidTable
+    entries = {key: {**meta, "value": None} for key, meta in LAYOUT.items()}
+    entries["SOC"]["value"] = 42
+    table = PidTable.from_entries(entries)
+    assert PidTable.from_entries(table) is table
+    assert table.meta[0] == {"class": "battery", "unit": "%"}
+    assert table["SOC"]["value"] == 42
+    assert table.take_changes() == set()
+    assert table.same_layout(entries)
+    assert not table.same_layout({"SOC": entries["SOC"]})
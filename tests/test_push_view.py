@@ -0,0 +1,207 @@
+import sys
+import types
+import json
+from http import HTTPStatus
+
+import pytest
+import importlib.util
+import os
+
+
+def load_view_module():
+    # Minimal HA stubs required by the push view
+    ha_pkg = sys.modules.setdefault("homeassistant", types.ModuleType("homeassistant"))
+    components_pkg = types.ModuleType("homeassistant.components")
+    http_mod = types.ModuleType("homeassistant.components.http")
+
+    class HomeAssistantView:
+        def json(self, result, status_code=HTTPStatus.OK):
+            return (status_code, result)
+
+        def json_message(self, message, status_code=HTTPStatus.OK):
+            return (status_code, {"message": message})
+
+    http_mod.HomeAssistantView = HomeAssistantView
+    core_mod = types.ModuleType("homeassistant.core")
+    core_mod.HomeAssistant = object
+    core_mod.callback = lambda fn: fn
+
+    sys.modules["homeassistant"] = ha_pkg
+    sys.modules["homeassistant.components"] = components_pkg
+    sys.modules["homeassistant.components.http"] = http_mod
+    sys.modules["homeassistant.core"] = core_mod
+
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    cc_pkg = sys.modules.setdefault("custom_components", types.ModuleType("custom_components"))
+    if not hasattr(cc_pkg, "__path__"):
+        cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = sys.modules.setdefault("custom_components.wican", types.ModuleType("custom_components.wican"))
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+
+    name = "custom_components.wican.view"
+    file_path = os.path.join(repo_root, "custom_components", "wican", "view.py")
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    assert spec and spec.loader
+    spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+    return mod
+
+
+class FakeContent:
+    """Like aiohttp's StreamReader, read(n) returns at most one buffered chunk."""
+
+    CHUNK = 4096
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.offset = 0
+
+    async def read(self, n):
+        chunk = self.body[self.offset : self.offset + min(n, self.CHUNK)]
+        self.offset += len(chunk)
+        return chunk
+
+
+class FakeRequest:
+    def __init__(self, body: bytes, headers=None, query=None, content_length=None):
+        self.content = FakeContent(body)
+        self.headers = headers or {}
+        self.query = query or {}
+        self.content_length = content_length
+
+
+class FakeCoordinator:
+    def __init__(self, push_mode="http", token="secret-token"):
+        self.push_mode = push_mode
+        self.config_entry = types.SimpleNamespace(data={"push_token": token})
+        self.pushed = []
+
+    def async_push_pid_values(self, values):
+        self.pushed.append(values)
+
+
+class FakeHttp:
+    def __init__(self):
+        self.views = []
+
+    def register_view(self, view):
+        self.views.append(view)
+
+
+def make_view(coordinator, **shared):
+    view_mod = load_view_module()
+    hass = types.SimpleNamespace(
+        data={"wican": {"e1": coordinator}, "wican_shared": shared}, http=FakeHttp()
+    )
+    return view_mod, view_mod.WiCanPushView(hass)
+
+
+@pytest.mark.asyncio
+async def test_push_with_bearer_token_feeds_coordinator():
+    coordinator = FakeCoordinator()
+    _, view = make_view(coordinator)
+    request = FakeRequest(
+        json.dumps({"SOC": 50}).encode(),
+        headers={"Authorization": "Bearer secret-token"},
+    )
+
+    status, body = await view.post(request, "e1")
+    assert status == HTTPStatus.OK
+    assert body == {"received": 1}
+    assert coordinator.pushed == [{"SOC": 50}]
+
+
+@pytest.mark.asyncio
+async def test_push_rejects_bad_token_unknown_entry_and_poll_mode():
+    coordinator = FakeCoordinator()
+    _, view = make_view(coordinator)
+
+    status, _ = await view.post(FakeRequest(b"{}", query={"token": "wrong"}), "e1")
+    assert status == HTTPStatus.UNAUTHORIZED
+    status, _ = await view.post(FakeRequest(b"{}", query={"token": "secret-token"}), "other")
+    assert status == HTTPStatus.NOT_FOUND
+
+    coordinator.push_mode = "poll"
+    status, _ = await view.post(FakeRequest(b"{}", query={"token": "secret-token"}), "e1")
+    assert status == HTTPStatus.NOT_FOUND
+    assert coordinator.pushed == []
+
+
+@pytest.mark.asyncio
+async def test_push_rejects_oversized_and_invalid_payloads():
+    coordinator = FakeCoordinator()
+    view_mod, view = make_view(coordinator)
+    auth = {"Authorization": "Bearer secret-token"}
+    limit = view_mod.PUSH_MAX_PAYLOAD_BYTES
+
+    status, _ = await view.post(FakeRequest(b"{}", headers=auth, content_length=limit + 1), "e1")
+    assert status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    # Chunked body without Content-Length is still capped while reading
+    status, _ = await view.post(FakeRequest(b" " * (limit + 10), headers=auth), "e1")
+    assert status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    status, _ = await view.post(FakeRequest(b"not json", headers=auth), "e1")
+    assert status == HTTPStatus.BAD_REQUEST
+    status, _ = await view.post(FakeRequest(b"[1, 2]", headers=auth), "e1")
+    assert status == HTTPStatus.BAD_REQUEST
+    assert coordinator.pushed == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("key", ["push_view", "scheduler"])
+async def test_push_to_reserved_domain_key_is_not_found(key):
+    coordinator = FakeCoordinator()
+    _, view = make_view(coordinator, push_view=True, scheduler=object())
+
+    status, _ = await view.post(
+        FakeRequest(b'{"SOC": 50}', query={"token": "secret-token"}), key
+    )
+    assert status == HTTPStatus.NOT_FOUND
+    assert coordinator.pushed == []
+
+
+@pytest.mark.asyncio
+async def test_push_reads_chunked_body_from_real_server():
+    from conftest import import_real_aiohttp
+
+    web = import_real_aiohttp()
+    from aiohttp.test_utils import TestClient, TestServer
+
+    coordinator = FakeCoordinator()
+    view_mod, view = make_view(coordinator)
+
+    async def handler(request):
+        status, body = await view.post(request, request.match_info["entry_id"])
+        return web.json_response(body, status=status)
+
+    app = web.Application()
+    app.router.add_post(view_mod.PUSH_URL, handler)
+    values = {f"PID_{i}": i for i in range(3000)}
+    payload = json.dumps(values).encode()
+    assert 4096 < len(payload) < view_mod.PUSH_MAX_PAYLOAD_BYTES
+
+    async def chunks(data, size=1000):
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
+
+    async with TestClient(TestServer(app)) as client:
+        auth = {"Authorization": "Bearer secret-token"}
+        resp = await client.post("/api/wican/push/e1", data=chunks(payload), headers=auth)
+        assert resp.status == HTTPStatus.OK
+        assert await resp.json() == {"received": len(values)}
+        assert coordinator.pushed == [values]
+
+        # Chunked bodies over the limit are rejected while reading
+        big = b" " * (view_mod.PUSH_MAX_PAYLOAD_BYTES + 10)
+        resp = await client.post("/api/wican/push/e1", data=chunks(big, 8192), headers=auth)
+        assert resp.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert len(coordinator.pushed) == 1
+
+
+def test_view_registered_once():
+    coordinator = FakeCoordinator()
+    view_mod, view = make_view(coordinator)
+    hass = view.hass
+    view_mod.async_register_push_view(hass)
+    view_mod.async_register_push_view(hass)
+    assert len(hass.http.views) == 1
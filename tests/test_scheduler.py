@@ -0,0 +1,90 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+
+def load_scheduler_module():
+    core_mod = types.ModuleType("homeassistant.core")
+    core_mod.HomeAssistant = object
+    core_mod.callback = lambda fn: fn
+    sys.modules.setdefault("homeassistant", types.ModuleType("homeassistant"))
+    sys.modules["homeassistant.core"] = core_mod
+
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    cc_pkg = types.ModuleType("custom_components")
+    cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = types.ModuleType("custom_components.wican")
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+    sys.modules.setdefault("custom_components", cc_pkg)
+    sys.modules.setdefault("custom_components.wican", wican_pkg)
+
+    name = "custom_components.wican.scheduler"
+    file_path = os.path.join(repo_root, "custom_components", "wican", "scheduler.py")
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_slots_are_reused_and_phases_do_not_move():
+    sched_mod = load_scheduler_module()
+    scheduler = sched_mod.WiCanScheduler()
+    for entry_id in ("a", "b", "c", "d"):
+        scheduler.register(entry_id)
+    assert [sched_mod.slot_phase(scheduler._slots[e]) for e in "abcd"] == [0.0, 0.5, 0.25, 0.75]
+
+    scheduler.unregister("b")
+    scheduler.register("e")
+    assert scheduler._slots["e"] == 1
+    assert scheduler._slots["c"] == 2
+
+
+def test_align_spreads_entries_over_the_interval(monkeypatch):
+    sched_mod = load_scheduler_module()
+    scheduler = sched_mod.WiCanScheduler()
+    for entry_id in ("a", "b", "c", "d"):
+        scheduler.register(entry_id)
+
+    # All entries finish their poll at the same moment
+    monkeypatch.setattr(sched_mod.time, "monotonic", lambda: 1003.0)
+    next_polls = sorted((1003.0 + scheduler.align(e, 30)) % 30 for e in "abcd")
+    assert next_polls == [0.0, 7.5, 15.0, 22.5]
+    assert all(15 <= scheduler.align(e, 30) < 45 for e in "abcd")
+    assert scheduler.align("unknown", 30) == 30
+
+
+@pytest.mark.asyncio
+async def test_poll_slot_caps_concurrency_and_counts_throughput():
+    sched_mod = load_scheduler_module()
+    scheduler = sched_mod.WiCanScheduler(max_concurrent=2)
+    peak = []
+
+    async def poll(pids):
+        async with scheduler.poll_slot():
+            peak.append(scheduler.in_flight)
+            await asyncio.sleep(0.01)
+        scheduler.record_poll(pids > 0, pids)
+
+    await asyncio.gather(*(poll(pids) for pids in (10, 20, 0, 30, 40)))
+
+    assert max(peak) == 2
+    stats = scheduler.throughput()
+    assert stats["polls"] == 5
+    assert stats["failed_polls"] == 1
+    assert stats["pids_received"] == 100
+    assert stats["polls_per_minute"] == 4
+    assert stats["in_flight"] == 0
+    assert stats["max_wait"] > 0
+
+
+def test_scheduler_is_shared_in_hass_data():
+    sched_mod = load_scheduler_module()
+    hass = types.SimpleNamespace(data={})
+    scheduler = sched_mod.async_get_scheduler(hass)
+    assert sched_mod.async_get_scheduler(hass) is scheduler
+    assert hass.data["wican_shared"][sched_mod.DATA_SCHEDULER] is scheduler
@@ -23,7 +23,11 @@ def make_ha_stubs():
         pass
     def callback(fn):
         return fn
+    class ServiceCall:
+        def __init__(self, data):
+            self.data = data
     core_mod.HomeAssistant = HomeAssistant
+    core_mod.ServiceCall = ServiceCall
     core_mod.callback = callback
 
     exceptions_mod = types.ModuleType("homeassistant.exceptions")
@@ -31,6 +35,37 @@ def make_ha_stubs():
         def __init__(self, *args, **kwargs):
             super().__init__(*args)
     exceptions_mod.ConfigEntryNotReady = ConfigEntryNotReady
+    class HomeAssistantError(Exception):
+        pass
+    exceptions_mod.HomeAssistantError = HomeAssistantError
+
+    helpers_event_mod = types.ModuleType("homeassistant.helpers.event")
+    def async_call_later(hass, delay, action):
+        hass.call_later.append((delay, action))
+        return lambda: hass.call_later.remove((delay, action))
+    helpers_event_mod.async_call_later = async_call_later
+
+    # Minimal voluptuous: schemas only apply defaults
+    vol_mod = types.ModuleType("voluptuous")
+    class Optional:
+        def __init__(self, key, default=None):
+            self.key = key
+            self.default = default
+    class Schema:
+        def __init__(self, schema):
+            self.schema = schema
+        def __call__(self, data):
+            result = dict(data)
+            for marker in self.schema:
+                if marker.default is not None:
+                    result.setdefault(marker.key, marker.default)
+            return result
+    vol_mod.Schema = Schema
+    vol_mod.Optional = Optional
+    vol_mod.All = lambda *validators: validators
+    vol_mod.Coerce = lambda type_: type_
+    vol_mod.Range = lambda **kwargs: kwargs
+    sys.modules["voluptuous"] = vol_mod
 
     helpers_pkg = types.ModuleType("homeassistant.helpers")
     helpers_update_coordinator_mod = types.ModuleType("homeassistant.helpers.update_coordinator")
@@ -40,6 +75,11 @@ def make_ha_stubs():
         async def async_config_entry_first_refresh(self):
             if hasattr(self, "_async_update_data"):
                 self.data = await self._async_update_data()
+        async def async_refresh(self):
+            self.data = await self._async_update_data()
+            self.async_update_listeners()
+        def async_update_listeners(self):
+            pass
     class CoordinatorEntity:
         def __init__(self, coordinator):
             self.coordinator = coordinator
@@ -61,6 +101,8 @@ def make_ha_stubs():
             return self.data
         async def async_save(self, data):
             self.data = data
+        def async_delay_save(self, data_func, delay=0):
+            self.delayed_save = data_func
     helpers_storage_mod.Store = Store
 
     util_pkg = types.ModuleType("homeassistant.util")
@@ -88,6 +130,7 @@ def make_ha_stubs():
     sys.modules["homeassistant.helpers"] = helpers_pkg
     sys.modules["homeassistant.helpers.update_coordinator"] = helpers_update_coordinator_mod
     sys.modules["homeassistant.helpers.storage"] = helpers_storage_mod
+    sys.modules["homeassistant.helpers.event"] = helpers_event_mod
     sys.modules["homeassistant.util"] = util_pkg
     sys.modules["homeassistant.util.dt"] = dt_mod
     sys.modules["homeassistant.config_entries"] = config_entries_mod
@@ -111,6 +154,14 @@ def load_modules_with_fakes(wican_api):
             return await wican_api.check_status()
         async def get_pid(self):
             return await wican_api.get_pid()
+        async def fetch_pid_values(self):
+            return await wican_api.get_pid()
+        def merge_pid_values(self, values):
+            return values
+        def invalidate_car_config(self):
+            pass
+        async def async_close(self):
+            self.closed = True
     fake_wican_mod.WiCan = WiCan
     sys.modules["custom_components.wican.wican"] = fake_wican_mod
 
@@ -139,19 +190,71 @@ class DummyEntry:
         self.entry_id = entry_id
         self.data = {"ip_address": ip}
         self.options = {}
+        self.update_listeners = []
+        self.on_unload = []
+    def add_update_listener(self, listener):
+        self.update_listeners.append(listener)
+        return lambda: self.update_listeners.remove(listener)
+    def async_on_unload(self, func):
+        self.on_unload.append(func)
+    def async_create_background_task(self, hass, coro, name):
+        return hass.async_create_task(coro)
 
 
 class FakeConfigEntries:
     def __init__(self):
         self.forwarded = None
+        self.init_mod = None
+        self.hass = None
+        self.entries = {}
+        self.reloads = 0
     async def async_forward_entry_setups(self, entry, platforms):
         self.forwarded = platforms
+    async def async_unload_platforms(self, entry, platforms):
+        return True
+    async def async_reload(self, entry_id):
+        self.reloads += 1
+        entry = self.entries[entry_id]
+        await self.init_mod.async_unload_entry(self.hass, entry)
+        for func in entry.on_unload:
+            func()
+        entry.on_unload = []
+        await self.init_mod.async_setup_entry(self.hass, entry)
+    def async_update_entry(self, entry, data=None, options=None):
+        if data is not None:
+            entry.data = data
+        if options is not None:
+            entry.options = options
+
+
+class FakeServices:
+    def __init__(self):
+        self.handlers = {}
+    def has_service(self, domain, service):
+        return (domain, service) in self.handlers
+    def async_register(self, domain, service, handler, schema=None):
+        self.handlers[(domain, service)] = (handler, schema)
+    async def async_call(self, domain, service, data):
+        handler, schema = self.handlers[(domain, service)]
+        from homeassistant.core import ServiceCall
+        await handler(ServiceCall(schema(data)))
 
 
 class FakeHass:
-    def __init__(self):
+    def __init__(self, config_dir="/config"):
         self.data = {}
         self.config_entries = FakeConfigEntries()
+        self.services = FakeServices()
+        self.config = types.SimpleNamespace(path=lambda name: os.path.join(config_dir, name))
+        self.call_later = []
+        self.tasks = []
+    def async_create_task(self, coro):
+        import asyncio
+        task = asyncio.ensure_future(coro)
+        self.tasks.append(task)
+        return task
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
 
 
 class APIGood:
@@ -181,6 +284,10 @@ async def test_fresh_install_online_succeeds_and_forwards_platforms():
     # Coordinator is stored
     from custom_components.wican.const import DOMAIN
     assert DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]
+    # Entry takes part in the shared poll scheduler
+    scheduler = hass.data["wican_shared"]["scheduler"]
+    assert entry.entry_id in scheduler._slots
+    assert scheduler.polls == 1 and scheduler.pids_received == 1
 
 
 @pytest.mark.asyncio
@@ -214,7 +321,7 @@ async def test_restart_offline_with_snapshot_uses_snapshot_and_forwards():
             }
     sys.modules["homeassistant.helpers.storage"].Store = StoreWithSnapshot
     # Ensure coordinator uses the patched Store symbol
-    coord_mod.Store = StoreWithSnapshot
+    coord_mod.SnapshotStore = StoreWithSnapshot
 
     ok = await init_mod.async_setup_entry(hass, entry)
     assert ok is True
@@ -242,7 +349,7 @@ async def test_device_recovers_after_offline_setup():
                 "timestamp": "2024-01-01T00:00:00+00:00",
             }
     sys.modules["homeassistant.helpers.storage"].Store = StoreWithSnapshot
-    coord_mod.Store = StoreWithSnapshot
+    coord_mod.SnapshotStore = StoreWithSnapshot
 
     ok = await init_mod.async_setup_entry(hass, entry)
     assert ok is True
@@ -259,3 +366,290 @@ async def test_device_recovers_after_offline_setup():
     data = await coord.get_data()
     assert coord.stale() is False
     assert isinstance(coord.last_successful_update, object)
+
+
+@pytest.mark.asyncio
+async def test_setup_generates_push_token_once_for_http_push():
+    make_ha_stubs()
+    hass = FakeHass()
+    entry = DummyEntry("1.2.3.4")
+    init_mod, coord_mod = load_modules_with_fakes(APIGood())
+
+    # Polling only: no token is stored
+    await init_mod.async_setup_entry(hass, entry)
+    assert "push_token" not in entry.data
+
+    http_mod = types.ModuleType("homeassistant.components.http")
+    http_mod.HomeAssistantView = object
+    sys.modules["homeassistant.components"] = types.ModuleType("homeassistant.components")
+    sys.modules["homeassistant.components.http"] = http_mod
+    hass.http = types.SimpleNamespace(views=[], register_view=lambda view: hass.http.views.append(view))
+    entry.options = {"push_mode": "http"}
+    await init_mod.async_setup_entry(hass, entry)
+    assert len(hass.http.views) == 1
+    token = entry.data.get("push_token")
+    assert isinstance(token, str) and len(token) >= 32
+    assert entry.data["ip_address"] == "1.2.3.4"
+
+    await init_mod.async_setup_entry(hass, entry)
+    assert entry.data["push_token"] == token
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics_report_metrics_and_redact_token():
+    make_ha_stubs()
+    diagnostics_stub = types.ModuleType("homeassistant.components.diagnostics")
+
+    def async_redact_data(data, to_redact):
+        return {k: "**REDACTED**" if k in to_redact else v for k, v in data.items()}
+
+    diagnostics_stub.async_redact_data = async_redact_data
+    sys.modules["homeassistant.components"] = types.ModuleType("homeassistant.components")
+    sys.modules["homeassistant.components.diagnostics"] = diagnostics_stub
+    hass = FakeHass()
+    entry = DummyEntry("1.2.3.4")
+    entry.data["push_token"] = "secret-token"
+    init_mod, coord_mod = load_modules_with_fakes(APIGood())
+    await init_mod.async_setup_entry(hass, entry)
+
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    name = "custom_components.wican.diagnostics"
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(repo_root, "custom_components", "wican", "diagnostics.py")
+    )
+    diag_mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = diag_mod
+    spec.loader.exec_module(diag_mod)
+
+    result = await diag_mod.async_get_config_entry_diagnostics(hass, entry)
+    assert result["entry"]["data"]["push_token"] == "**REDACTED**"
+    assert result["pid_count"] == 1
+    assert result["polling"]["ecu_status"] == "online"
+    assert result["polling"]["circuit_breaker"] == "closed"
+    coordinator_metrics = result["metrics"]["coordinator"]
+    assert coordinator_metrics["counters"]["poll.success"] == 1
+    assert coordinator_metrics["counters"]["snapshot.writes"] == 1
+    assert coordinator_metrics["timings"]["poll"]["count"] == 1
+    assert result["scheduler"]["polls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_service_profiles_n_cycles_and_writes_files(tmp_path):
+    make_ha_stubs()
+    hass = FakeHass(str(tmp_path))
+    entry = DummyEntry("1.2.3.4")
+    init_mod, coord_mod = load_modules_with_fakes(APIGood())
+    await init_mod.async_setup_entry(hass, entry)
+    from custom_components.wican.const import DOMAIN
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await hass.services.async_call(DOMAIN, "profile", {"cycles": 2})
+    assert coordinator.profiler is not None
+    with pytest.raises(Exception, match="already running"):
+        await hass.services.async_call(DOMAIN, "profile", {})
+
+    for _ in range(2):
+        coordinator.data = await coordinator._async_update_data()
+        coordinator.async_update_listeners()
+    for task in hass.tasks:
+        await task
+
+    assert coordinator.profiler is None
+    assert "profiler" not in hass.data["wican_shared"]
+    assert hass.call_later == []
+    files = sorted(p.suffix for p in tmp_path.iterdir())
+    assert files == [".prof", ".txt"]
+    summary = next(tmp_path.glob("*.txt")).read_text()
+    # Only the synchronous WiCAN sections are profiled, not the awaiting coroutines
+    assert "_diff_contexts" in summary
+    assert "_async_poll" not in summary
+
+
+@pytest.mark.asyncio
+async def test_profile_cycle_not_ended_by_push_during_poll(tmp_path):
+    import asyncio
+
+    make_ha_stubs()
+    hass = FakeHass(str(tmp_path))
+    entry = DummyEntry("1.2.3.4")
+    answer = asyncio.Event()
+
+    class SlowAPI(APIGood):
+        async def check_status(self):
+            await answer.wait()
+            return await super().check_status()
+
+    init_mod, coord_mod = load_modules_with_fakes(SlowAPI())
+    answer.set()
+    await init_mod.async_setup_entry(hass, entry)
+    from custom_components.wican.const import DOMAIN
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.hass = hass  # the stub base class does not store hass
+    await hass.services.async_call(DOMAIN, "profile", {"cycles": 1})
+    profiler = coordinator.profiler
+
+    answer.clear()
+    poll = asyncio.ensure_future(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    # A push dispatches while the poll waits for the device
+    coordinator.async_push_pid_values({"SOC": 51})
+    assert profiler.remaining == 1
+    assert coordinator.profiler is profiler
+
+    answer.set()
+    coordinator.data = await poll
+    coordinator.async_update_listeners()
+    assert profiler.remaining == 0
+    for task in hass.tasks:
+        await task
+    assert coordinator.profiler is None
+
+
+class BusyProfile:
+    """cProfile stand-in failing like Python 3.12+ when another profiler is active."""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+
+@pytest.mark.asyncio
+async def test_profile_service_ends_when_profiler_cannot_start(tmp_path):
+    make_ha_stubs()
+    hass = FakeHass(str(tmp_path))
+    entry = DummyEntry("1.2.3.4")
+    init_mod, coord_mod = load_modules_with_fakes(APIGood())
+    await init_mod.async_setup_entry(hass, entry)
+    from custom_components.wican.const import DOMAIN
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await hass.services.async_call(DOMAIN, "profile", {"cycles": 2})
+    hass.data["wican_shared"]["profiler"]._profile = BusyProfile()
+
+    # Polling continues; the session ends without writing files
+    data = await coordinator._async_update_data()
+    assert data["status"]
+    coordinator.data = data
+    coordinator.async_update_listeners()
+    assert coordinator.profiler is None
+    assert "profiler" not in hass.data["wican_shared"]
+    assert hass.call_later == []
+    assert list(tmp_path.iterdir()) == []
+
+
+class CountingAPIGood(APIGood):
+    def __init__(self):
+        self.status_calls = 0
+    async def check_status(self):
+        self.status_calls += 1
+        return await super().check_status()
+
+
+def _loaded_entry(hass, init_mod, entry):
+    hass.config_entries.hass = hass
+    hass.config_entries.init_mod = init_mod
+    hass.config_entries.entries[entry.entry_id] = entry
+
+
+@pytest.mark.asyncio
+async def test_options_applied_to_running_coordinator_without_reload():
+    make_ha_stubs()
+    hass = FakeHass()
+    entry = DummyEntry("1.2.3.4")
+    init_mod, coord_mod = load_modules_with_fakes(APIGood())
+    _loaded_entry(hass, init_mod, entry)
+    await init_mod.async_setup_entry(hass, entry)
+    from custom_components.wican.const import DOMAIN
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    refreshes = []
+
+    async def request_refresh():
+        refreshes.append(True)
+
+    coordinator.async_request_refresh = request_refresh
+    assert entry.update_listeners == [init_mod.async_update_options]
+
+    entry.options = {"scan_interval": 10, "failure_threshold": 7}
+    await init_mod.async_update_options(hass, entry)
+
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert hass.config_entries.reloads == 0
+    assert coordinator.interval_ecu_online == 10
+    assert coordinator._breaker.failure_threshold == 7
+    assert refreshes == [True]
+
+
+@pytest.mark.asyncio
+async def test_options_needing_reload_hand_off_warm_coordinator():
+    make_ha_stubs()
+    hass = FakeHass()
+    entry = DummyEntry("1.2.3.4")
+    api = CountingAPIGood()
+    init_mod, coord_mod = load_modules_with_fakes(api)
+    _loaded_entry(hass, init_mod, entry)
+    await init_mod.async_setup_entry(hass, entry)
+    from custom_components.wican.const import DOMAIN
+    old = hass.data[DOMAIN][entry.entry_id]
+    assert api.status_calls == 1
+
+    entry.options = {"diagnostic_sensors": True}
+    await init_mod.async_update_options(hass, entry)
+
+    new = hass.data[DOMAIN][entry.entry_id]
+    assert hass.config_entries.reloads == 1
+    assert new is not old
+    assert new.diagnostic_sensors is True
+    # Warm handoff: same data and session, no first refresh against the device
+    assert new.data is old.data
+    assert new.api is old.api
+    assert not getattr(new.api, "closed", False)
+    assert api.status_calls == 1
+    assert new.last_successful_update == old.last_successful_update
+    assert "e1" not in hass.data["wican_shared"]["handoff"]
+    assert len(entry.update_listeners) == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_start_from_snapshot_refreshes_in_background(monkeypatch):
+    import asyncio
+
+    make_ha_stubs()
+    hass = FakeHass()
+    entry = DummyEntry("1.2.3.4")
+    answer = asyncio.Event()
+
+    class SlowAPI(CountingAPIGood):
+        async def check_status(self):
+            await answer.wait()
+            return await super().check_status()
+
+    api = SlowAPI()
+    init_mod, coord_mod = load_modules_with_fakes(api)
+    store = sys.modules["homeassistant.helpers.storage"].Store
+
+    class StoreWithSnapshot(store):
+        async def async_load(self):
+            return {
+                "device_id": "devS",
+                "status": {"device_id": "devS", "ecu_status": "online", "hw_version": "1", "sta_ip": "1.2.3.4", "fw_version": "1"},
+                "car_config": {"fingerprint": "f", "pids": {"SOC": {"class": "none", "unit": "%"}}},
+                "values": {"SOC": 33},
+                "timestamp": "2024-01-01T00:00:00+00:00",
+            }
+
+    monkeypatch.setattr(coord_mod, "SnapshotStore", StoreWithSnapshot)
+
+    # Setup completes without waiting for the device
+    assert await init_mod.async_setup_entry(hass, entry) is True
+    from custom_components.wican.const import DOMAIN
+    coord = hass.data[DOMAIN][entry.entry_id]
+    assert hass.config_entries.forwarded == ["binary_sensor", "sensor"]
+    assert coord.stale() is True
+    assert coord.get_pid_value("SOC") == 33
+    assert api.status_calls == 0
+
+    answer.set()
+    for task in hass.tasks:
+        await task
+    assert api.status_calls == 1
+    assert coord.stale() is False
+    assert coord.get_pid_value("SOC") == 50
@@ -0,0 +1,94 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+from conftest import import_real_aiohttp
+
+
+def load_real_wican_module():
+    # Exercise the real HTTP path: load wican.py against the installed aiohttp
+    import_real_aiohttp()
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    cc_pkg = sys.modules.setdefault("custom_components", types.ModuleType("custom_components"))
+    if not hasattr(cc_pkg, "__path__"):
+        cc_pkg.__path__ = [os.path.join(repo_root, "custom_components")]
+    wican_pkg = sys.modules.setdefault("custom_components.wican", types.ModuleType("custom_components.wican"))
+    wican_pkg.__path__ = [os.path.join(repo_root, "custom_components", "wican")]
+    name = "custom_components.wican.wican"
+    file_path = os.path.join(repo_root, "custom_components", "wican", "wican.py")
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.mark.asyncio
+async def test_get_pid_over_http(wican_simulator):
+    wican_mod = load_real_wican_module()
+    api = wican_mod.WiCan(wican_simulator.host)
+    try:
+        assert await api.test() is True
+        pid = await api.get_pid()
+        assert len(pid) == len(wican_simulator.car_config)
+        assert pid["PID_0"] == {"class": "none", "unit": "%", "sensor_type": "sensor", "value": 0}
+
+        # Car config is cached: the second poll only fetches values
+        await api.get_pid()
+        assert wican_simulator.requests["/load_car_config"] == 1
+        assert wican_simulator.requests["/autopid_data"] == 2
+    finally:
+        await api.async_close()
+
+
+@pytest.mark.asyncio
+async def test_latency_beyond_timeout_is_reported_unreachable(wican_simulator):
+    wican_mod = load_real_wican_module()
+    api = wican_mod.WiCan(wican_simulator.host)
+    wican_simulator.latency["/check_status"] = 0.5
+    try:
+        assert await api.check_status(timeout_total=0.1) is False
+        assert (await api.check_status(timeout_total=2.0))["protocol"] == "auto_pid"
+    finally:
+        await api.async_close()
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_and_slow_body(wican_simulator):
+    wican_mod = load_real_wican_module()
+    api = wican_mod.WiCan(wican_simulator.host)
+    try:
+        # aiohttp retries an idempotent request once on a dropped connection
+        wican_simulator.drop_next(2)
+        assert await api.check_status() is False
+        assert await api.check_status() is not False
+
+        wican_simulator.slow_body = 0.5
+        assert await api.check_status(timeout_total=0.1) is False
+    finally:
+        await api.async_close()
+
+
+@pytest.mark.asyncio
+async def test_sleep_wake_transitions(wican_simulator):
+    wican_mod = load_real_wican_module()
+    api = wican_mod.WiCan(wican_simulator.host)
+    try:
+        wican_simulator.sleep()
+        assert await api.check_status() is False
+        assert await api.get_pid() is False
+
+        wican_simulator.wake()
+        wican_simulator.ecu_online = False
+        status = await api.check_status()
+        assert status["ecu_status"] == "offline"
+
+        wican_simulator.cycle_sleep(awake_for=0.05, asleep_for=10)
+        await asyncio.sleep(0.1)
+        assert wican_simulator.awake is False
+    finally:
+        await api.async_close()
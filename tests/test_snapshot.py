@@ -79,6 +79,9 @@ class Store:  # will be monkeypatched in tests
     async def async_save(self, data):
         return None
 
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_save = data_func
+
 
 helpers_storage_mod.Store = Store
 
@@ -173,6 +176,9 @@ class FakeStore:
         self.save_calls += 1
         self.data = data
 
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_save = data_func
+
 
 class DummyEntry:
     def __init__(self, entry_id: str = "test_entry") -> None:
@@ -186,6 +192,7 @@ class FakeAPI:
         self._status = status
         self._pid = pid
         self.ip = ip
+        self.car_config_invalidations = 0
 
     async def check_status(self):
         return self._status
@@ -193,6 +200,15 @@ class FakeAPI:
     async def get_pid(self):
         return self._pid
 
+    async def fetch_pid_values(self):
+        return self._pid
+
+    def merge_pid_values(self, values):
+        return values
+
+    def invalidate_car_config(self):
+        self.car_config_invalidations += 1
+
 
 @pytest.fixture
 def hass():
@@ -202,7 +218,7 @@ def hass():
 @pytest.mark.asyncio
 async def test_persist_snapshot_on_successful_refresh(hass: HomeAssistant, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     status = {
         "device_id": "dev123",
         "ecu_status": "online",
@@ -224,7 +240,10 @@ async def test_persist_snapshot_on_successful_refresh(hass: HomeAssistant, monke
     assert isinstance(store.data, dict)
     assert store.data["device_id"] == "dev123"
     assert store.data["status"] == status
-    assert store.data["pid"] == pid
+    # Compact layout: metadata stored once, separate from the value table
+    assert store.data["car_config"]["pids"] == {"SOC_BMS": {"class": "battery", "unit": "%"}}
+    assert isinstance(store.data["car_config"]["fingerprint"], str)
+    assert store.data["values"] == {"SOC_BMS": 42}
     # Timestamp is ISO8601
     assert isinstance(store.data["timestamp"], str)
     assert dt_util.parse_datetime(store.data["timestamp"]) is not None
@@ -236,7 +255,7 @@ async def test_persist_snapshot_on_successful_refresh(hass: HomeAssistant, monke
 @pytest.mark.asyncio
 async def test_offline_uses_snapshot(hass: HomeAssistant, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     snapshot = {
         "device_id": "dev999",
         "status": {"device_id": "dev999", "ecu_status": "offline"},
@@ -260,7 +279,7 @@ async def test_offline_uses_snapshot(hass: HomeAssistant, monkeypatch):
 @pytest.mark.asyncio
 async def test_corrupted_snapshot_logs_and_fallback(hass: HomeAssistant, monkeypatch, caplog):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
 
     coordinator = WiCanCoordinator(hass, DummyEntry(), FakeAPI(False, False))
@@ -278,7 +297,7 @@ async def test_corrupted_snapshot_logs_and_fallback(hass: HomeAssistant, monkeyp
 @pytest.mark.asyncio
 async def test_debounced_writes(hass: HomeAssistant, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     status = {"device_id": "debounce", "ecu_status": "online"}
     pid = {"Y": {"class": "none", "unit": "none", "value": 1}}
 
@@ -291,3 +310,117 @@ async def test_debounced_writes(hass: HomeAssistant, monkeypatch):
 
     store: FakeStore = coordinator._store  # type: ignore[attr-defined]
     assert store.save_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_dedupes_and_flushes(hass: HomeAssistant, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    status = {"device_id": "wb", "ecu_status": "online"}
+    api = FakeAPI(status, {"Y": {"class": "none", "unit": "none", "value": 1}})
+
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    store: FakeStore = coordinator._store  # type: ignore[attr-defined]
+
+    # First snapshot is written immediately
+    await coordinator.get_data()
+    assert store.save_calls == 1
+
+    # Changed content schedules exactly one delayed write, storage is never re-read
+    api._pid = {"Y": {"class": "none", "unit": "none", "value": 2}}
+    await coordinator.get_data()
+    api._pid = {"Y": {"class": "none", "unit": "none", "value": 3}}
+    await coordinator.get_data()
+    assert store.save_calls == 1
+    assert store.load_calls == 0
+    delayed = store.delayed_save
+    assert delayed()["values"]["Y"] == 3
+
+    # Flushing with nothing pending does not write
+    await coordinator.async_flush_snapshot()
+    assert store.save_calls == 1
+
+    # Pending change is written on flush (entry unload)
+    api._pid = {"Y": {"class": "none", "unit": "none", "value": 4}}
+    await coordinator.get_data()
+    await coordinator.async_flush_snapshot()
+    assert store.save_calls == 2
+    assert store.data["values"]["Y"] == 4
+
+
+@pytest.mark.asyncio
+async def test_last_good_index_fills_missing_values(hass: HomeAssistant, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    status = {"device_id": "lg", "ecu_status": "online"}
+    api = FakeAPI(status, {"A": {"class": "none", "unit": "none", "value": 7}})
+
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    store: FakeStore = coordinator._store  # type: ignore[attr-defined]
+    coordinator.data = await coordinator.get_data()
+
+    # Reading goes missing: live data shows unknown, snapshot keeps last good value
+    api._pid = {"A": {"class": "none", "unit": "none", "value": None}}
+    coordinator.data = await coordinator.get_data()
+    assert coordinator.get_pid_value("A") is None
+    await coordinator.async_flush_snapshot()
+    assert store.data["values"]["A"] == 7
+    # Unchanged index: no new write is scheduled
+    assert not coordinator._persist_scheduled
+
+    # Offline: stale data serves the last good value
+    api._status = False
+    coordinator.data = await coordinator.get_data()
+    assert coordinator.stale() is True
+    assert coordinator.get_pid_value("A") == 7
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reuses_api_car_config_fingerprint(hass: HomeAssistant, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+
+    def no_hashing(pid):
+        raise AssertionError("car configuration hashed again")
+
+    monkeypatch.setattr(coordinator_mod, "pid_fingerprint", no_hashing)
+    status = {"device_id": "fp", "ecu_status": "online"}
+    api = FakeAPI(status, {"A": {"class": "none", "unit": "none", "value": 1}})
+    api.car_config_fingerprint = "from-api"
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+
+    await coordinator.get_data()
+    store: FakeStore = coordinator._store  # type: ignore[attr-defined]
+    assert store.data["car_config"]["fingerprint"] == "from-api"
+
+
+@pytest.mark.asyncio
+async def test_compact_snapshot_round_trip_and_v1_migration(hass: HomeAssistant, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    snapshot_store = coordinator_mod.SnapshotStore(hass, 2, "wican_mig_snapshot")
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    v1 = {
+        "device_id": "mig",
+        "status": {"device_id": "mig", "ecu_status": "online"},
+        "pid": {
+            "A": {"class": "none", "unit": "none", "value": 0},
+            "B": {"class": "speed", "unit": "km/h", "value": None},
+        },
+        "timestamp": dt_util.utcnow().isoformat(),
+    }
+
+    migrated = await snapshot_store._async_migrate_func(1, 1, v1)
+    assert migrated["values"] == {"A": 0}
+    assert migrated["car_config"]["pids"]["B"] == {"class": "speed", "unit": "km/h"}
+    assert coordinator_mod.expand_snapshot(migrated)["pid"] == v1["pid"]
+
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    coordinator = WiCanCoordinator(hass, DummyEntry(), FakeAPI(False, False))
+    store: FakeStore = coordinator._store  # type: ignore[attr-defined]
+    store.load_return = migrated
+    assert await coordinator.async_preload_snapshot() is True
+    assert coordinator.data["pid"] == v1["pid"]
+    assert coordinator.data["status"] == v1["status"]
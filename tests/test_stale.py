@@ -79,6 +79,9 @@ class Store:  # will be monkeypatched in tests
     async def async_save(self, data):
         return None
 
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_save = data_func
+
 
 helpers_storage_mod.Store = Store
 
@@ -163,6 +166,9 @@ class FakeStore:
         self.save_calls += 1
         self.data = data
 
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_save = data_func
+
 
 class DummyEntry:
     def __init__(self, entry_id: str = "test_entry") -> None:
@@ -176,13 +182,23 @@ class FakeAPI:
         self._status = status
         self._pid = pid
         self.ip = ip
+        self.car_config_invalidations = 0
 
     async def check_status(self):
         return self._status
 
     async def get_pid(self):
+        return self.merge_pid_values(await self.fetch_pid_values())
+
+    async def fetch_pid_values(self):
         return self._pid
 
+    def merge_pid_values(self, values):
+        return values
+
+    def invalidate_car_config(self):
+        self.car_config_invalidations += 1
+
 
 @pytest.fixture
 def hass():
@@ -192,7 +208,7 @@ def hass():
 @pytest.mark.asyncio
 async def test_memory_data_offline_sets_stale(hass, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
 
     # First success
@@ -214,7 +230,7 @@ async def test_memory_data_offline_sets_stale(hass, monkeypatch):
 @pytest.mark.asyncio
 async def test_snapshot_used_when_no_memory_offline(hass, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
 
     snapshot = {
@@ -238,7 +254,7 @@ async def test_snapshot_used_when_no_memory_offline(hass, monkeypatch):
 @pytest.mark.asyncio
 async def test_first_run_offline_no_snapshot_raises(hass, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
 
     api = FakeAPI(False, False)
@@ -252,7 +268,7 @@ async def test_first_run_offline_no_snapshot_raises(hass, monkeypatch):
 @pytest.mark.asyncio
 async def test_recovery_clears_stale_and_updates_timestamp(hass, monkeypatch):
     coordinator_mod = load_coordinator_module()
-    monkeypatch.setattr(coordinator_mod, "Store", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
     WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
 
     # Start with snapshot path
@@ -276,3 +292,631 @@ async def test_recovery_clears_stale_and_updates_timestamp(hass, monkeypatch):
     await coordinator.get_data()
     assert coordinator.stale() is False
     assert coordinator.last_successful_update is not None
+
+
+@pytest.mark.asyncio
+async def test_ecu_reconnect_invalidates_car_config(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    api = FakeAPI({"device_id": "dev1", "ecu_status": "online"}, {})
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    coordinator.data = await coordinator.get_data()
+    coordinator.data = await coordinator.get_data()
+    assert api.car_config_invalidations == 1
+
+    api._status = {"device_id": "dev1", "ecu_status": "offline"}
+    coordinator.data = await coordinator.get_data()
+    api._status = {"device_id": "dev1", "ecu_status": "online"}
+    coordinator.data = await coordinator.get_data()
+    assert api.car_config_invalidations == 2
+
+
+class SlowAPI(FakeAPI):
+    """Like WiCan, raw values are merged in place into one PID table."""
+
+    def __init__(self, status, pid) -> None:
+        super().__init__(status, pid)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.table = None
+
+    async def _track(self, result):
+        import asyncio
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return result
+
+    async def check_status(self):
+        return await self._track(self._status)
+
+    async def fetch_pid_values(self):
+        return await self._track({key: entry["value"] for key, entry in self._pid.items()})
+
+    def merge_pid_values(self, values):
+        if self.table is None:
+            PidTable = sys.modules["custom_components.wican.pid_table"].PidTable
+            self.table = PidTable(
+                (key, {k: v for k, v in entry.items() if k != "value"})
+                for key, entry in self._pid.items()
+            )
+        self.table.update(values)
+        return self.table
+
+
+@pytest.mark.asyncio
+async def test_pipelined_poll_when_ecu_known_online(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    status = {"device_id": "dev1", "ecu_status": "online"}
+    pid = {"X": {"class": "none", "unit": "none", "value": 1}}
+    api = SlowAPI(status, pid)
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+
+    # First cycle is sequential: ECU state is not known yet
+    first = await coordinator.get_data()
+    assert api.max_in_flight == 1
+    coordinator.data = first
+
+    # ECU known online: status and PIDs are requested together, same result
+    second = await coordinator.get_data()
+    assert api.max_in_flight == 2
+    assert second == first
+
+    # Status fails while pipelined: PID results are dropped, memory is served
+    coordinator.data = second
+    api._status = False
+    api._pid = {"X": {"class": "none", "unit": "none", "value": 99}}
+    third = await coordinator.get_data()
+    assert third["pid"]["X"]["value"] == 1
+    # The shared PID table is untouched by the dropped values
+    assert third["pid"] is api.table
+    assert api.table.value(api.table.slot("X")) == 1
+    assert coordinator.stale() is True
+
+
+@pytest.mark.asyncio
+async def test_adaptive_poll_interval_follows_device_state(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    monkeypatch.setattr(coordinator_mod.random, "uniform", lambda a, b: 1.0)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    entry = DummyEntry()
+    entry.options = {
+        "scan_interval": 5,
+        "scan_interval_ecu_offline": 60,
+        "scan_interval_unreachable": 30,
+        "backoff_max_interval": 100,
+        "failure_threshold": 10,
+    }
+    api = FakeAPI({"device_id": "dev1", "ecu_status": "online"}, {})
+    coordinator = WiCanCoordinator(hass, entry, api)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 5
+
+    api._status = {"device_id": "dev1", "ecu_status": "offline"}
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 60
+
+    # Unreachable: exponential backoff capped at the configured maximum
+    api._status = False
+    intervals = []
+    for _ in range(4):
+        await coordinator._async_update_data()
+        intervals.append(coordinator.update_interval.total_seconds())
+    assert intervals == [30, 60, 100, 100]
+
+    # Reachable again resets the backoff
+    api._status = {"device_id": "dev1", "ecu_status": "online"}
+    await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 5
+
+
+class ProbeAPI(FakeAPI):
+    def __init__(self, status, pid) -> None:
+        super().__init__(status, pid)
+        self.status_calls = []
+
+    async def check_status(self, **kwargs):
+        self.status_calls.append(kwargs)
+        return self._status
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_skips_calls_and_probes(hass, monkeypatch, caplog):
+    coordinator_mod = load_coordinator_module()
+    breaker_mod = sys.modules["custom_components.wican.circuit_breaker"]
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    clock = [1000.0]
+    monkeypatch.setattr(breaker_mod.time, "monotonic", lambda: clock[0])
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    entry = DummyEntry()
+    entry.options = {"failure_threshold": 2}
+    api = ProbeAPI({"device_id": "dev1", "ecu_status": "online"}, {})
+    coordinator = WiCanCoordinator(hass, entry, api)
+    coordinator.data = await coordinator.get_data()
+
+    api._status = False
+    with caplog.at_level("DEBUG"):
+        for _ in range(4):
+            await coordinator.get_data()
+    # Two failures open the circuit; further polls send no request at all
+    assert len(api.status_calls) == 3
+    warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 2  # first stale poll + circuit opened
+
+    # After the reset timeout a single short probe is sent
+    clock[0] += coordinator_mod.BREAKER_RESET_TIMEOUT
+    api._status = {"device_id": "dev1", "ecu_status": "online"}
+    await coordinator.get_data()
+    assert api.status_calls[-1] == {"timeout_total": coordinator_mod.PROBE_TIMEOUT}
+    assert coordinator.stale() is False
+
+    # Circuit closed again: regular requests without probe timeout
+    await coordinator.get_data()
+    assert api.status_calls[-1] == {}
+
+
+class RaisingProbeAPI(ProbeAPI):
+    def __init__(self, status, pid) -> None:
+        super().__init__(status, pid)
+        self.error = None
+
+    async def check_status(self, **kwargs):
+        self.status_calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return self._status
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [ValueError("not JSON"), "cancelled"])
+async def test_circuit_breaker_recovers_after_probe_raises(hass, monkeypatch, error):
+    import asyncio
+
+    coordinator_mod = load_coordinator_module()
+    breaker_mod = sys.modules["custom_components.wican.circuit_breaker"]
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    clock = [1000.0]
+    monkeypatch.setattr(breaker_mod.time, "monotonic", lambda: clock[0])
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    entry = DummyEntry()
+    entry.options = {"failure_threshold": 1}
+    api = RaisingProbeAPI({"device_id": "dev1", "ecu_status": "online"}, {})
+    coordinator = WiCanCoordinator(hass, entry, api)
+    coordinator.data = await coordinator.get_data()
+
+    api._status = False
+    await coordinator.get_data()
+    assert coordinator._breaker.state == breaker_mod.STATE_OPEN
+
+    # The probe raises: the breaker opens again instead of staying half open
+    clock[0] += coordinator_mod.BREAKER_RESET_TIMEOUT
+    api.error = asyncio.CancelledError() if error == "cancelled" else error
+    if error == "cancelled":
+        with pytest.raises(asyncio.CancelledError):
+            await coordinator.get_data()
+    else:
+        await coordinator.get_data()
+    assert coordinator._breaker.state == breaker_mod.STATE_OPEN
+
+    # Device recovered: the next probe is sent and closes the circuit
+    clock[0] += coordinator_mod.BREAKER_RESET_TIMEOUT
+    api.error = None
+    api._status = {"device_id": "dev1", "ecu_status": "online"}
+    calls = len(api.status_calls)
+    await coordinator.get_data()
+    assert len(api.status_calls) == calls + 1
+    assert coordinator._breaker.state == breaker_mod.STATE_CLOSED
+    assert coordinator.stale() is False
+
+
+class TaskHass(HomeAssistant):
+    def __init__(self) -> None:
+        self.tasks = []
+
+    def async_create_task(self, coro):
+        self.tasks.append(coro)
+        return coro
+
+
+class CountingAPI(FakeAPI):
+    def __init__(self, status, pid) -> None:
+        super().__init__(status, pid)
+        self.pid_calls = 0
+
+    async def fetch_pid_values(self):
+        self.pid_calls += 1
+        return self._pid
+
+
+@pytest.mark.asyncio
+async def test_mqtt_push_updates_pid_values_and_skips_http_pid_poll(monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    hass = TaskHass()
+    entry = DummyEntry()
+    entry.options = {"push_mode": "mqtt"}
+    status = {"device_id": "dev1", "ecu_status": "online"}
+    pid = {
+        "SOC": {"class": "battery", "unit": "%", "value": 40},
+        "SPEED": {"class": "speed", "unit": "km/h", "value": 0},
+    }
+    api = CountingAPI(status, pid)
+    _install_listener_base(monkeypatch, WiCanCoordinator)
+    _install_refresh_base(monkeypatch, WiCanCoordinator)
+    coordinator = WiCanCoordinator(hass, entry, api)
+    coordinator.hass = hass  # not every shared stub base class stores hass
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+    coordinator.data = await coordinator.get_data()
+    assert api.pid_calls == 1
+
+    coordinator._async_mqtt_message(
+        types.SimpleNamespace(topic="wican/dev1/autopid", payload='{"SOC": 41}')
+    )
+    assert len(updates) == 1
+    assert coordinator.data["pid"]["SOC"] == {"class": "battery", "unit": "%", "value": 41}
+    # PIDs missing from the push keep their value
+    assert coordinator.data["pid"]["SPEED"]["value"] == 0
+    assert coordinator.push_fresh() is True
+    for task in hass.tasks:
+        await task
+
+    # While pushes are fresh, polls only check status over HTTP
+    data = await coordinator.get_data()
+    assert api.pid_calls == 1
+    assert data["pid"]["SOC"]["value"] == 41
+
+    # Malformed payloads are ignored
+    coordinator._async_mqtt_message(
+        types.SimpleNamespace(topic="wican/dev1/autopid", payload="not json")
+    )
+    assert len(updates) == 1
+
+    # A PID outside the car configuration triggers one config reload only
+    invalidations = api.car_config_invalidations
+    for _ in range(2):
+        coordinator._async_mqtt_message(
+            types.SimpleNamespace(topic="wican/dev1/autopid", payload='{"SOC": 42, "EXTRA": 1}')
+        )
+    assert api.car_config_invalidations == invalidations + 1
+    assert coordinator.push_fresh() is True
+    assert coordinator.data["pid"]["SOC"]["value"] == 42
+    for task in hass.tasks[-2:]:
+        await task
+
+
+@pytest.mark.asyncio
+async def test_steady_pushes_do_not_postpone_the_status_poll(monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    _install_listener_base(monkeypatch, WiCanCoordinator)
+    clock = _install_refresh_base(monkeypatch, WiCanCoordinator)
+
+    hass = TaskHass()
+    entry = DummyEntry()
+    entry.options = {"push_mode": "mqtt"}
+    api = CountingAPI(
+        {"device_id": "dev1", "ecu_status": "online"},
+        {"SOC": {"class": "battery", "unit": "%", "value": 40}},
+    )
+    coordinator = WiCanCoordinator(hass, entry, api)
+    coordinator.hass = hass
+    coordinator.async_add_listener(lambda: None)
+    coordinator.data = await coordinator._async_update_data()
+    coordinator._schedule_refresh()
+    interval = coordinator.update_interval.total_seconds()
+
+    # Pushes arrive three times per poll interval for two intervals
+    status_calls = 0
+    for step in range(1, 7):
+        clock[0] = step * interval / 3
+        coordinator._async_mqtt_message(
+            types.SimpleNamespace(topic="wican/dev1/autopid", payload=f'{{"SOC": {40 + step}}}')
+        )
+        if clock[0] >= coordinator.refresh_at:
+            # The scheduled refresh fires like HA's timer would
+            api._status = {**api._status, "batt_voltage": f"{step}V"}
+            coordinator.async_set_updated_data(await coordinator._async_update_data())
+            status_calls += 1
+    for task in hass.tasks:
+        await task
+
+    assert status_calls == 2
+    assert coordinator.data["status"]["batt_voltage"] == "6V"
+    assert coordinator.data["pid"]["SOC"]["value"] == 46
+    # PID values came from the pushes only
+    assert api.pid_calls == 1
+
+
+def _install_refresh_base(monkeypatch, coordinator_cls):
+    """Give the stub base class HA's refresh timer: setting data reschedules the poll.
+
+    Returns the fake clock as a one-element list.
+    """
+    base = coordinator_cls.__mro__[1]
+    clock = [0.0]
+
+    def _schedule_refresh(self):
+        self.refresh_at = clock[0] + self.update_interval.total_seconds()
+
+    def async_set_updated_data(self, data):
+        self.data = data
+        self._schedule_refresh()
+        self.async_update_listeners()
+
+    monkeypatch.setattr(base, "_schedule_refresh", _schedule_refresh, raising=False)
+    monkeypatch.setattr(base, "async_set_updated_data", async_set_updated_data, raising=False)
+    return clock
+
+
+def _install_listener_base(monkeypatch, coordinator_cls):
+    """Give the stub base class HA-like listener bookkeeping."""
+    base = coordinator_cls.__mro__[1]
+
+    def async_add_listener(self, update_callback, context=None):
+        listeners = self.__dict__.setdefault("_listeners", {})
+
+        def remove_listener():
+            listeners.pop(remove_listener)
+
+        listeners[remove_listener] = (update_callback, context)
+        return remove_listener
+
+    def async_update_listeners(self):
+        for update_callback, _ in list(self._listeners.values()):
+            update_callback()
+
+    monkeypatch.setattr(base, "async_add_listener", async_add_listener, raising=False)
+    monkeypatch.setattr(base, "async_update_listeners", async_update_listeners, raising=False)
+
+
+@pytest.mark.asyncio
+async def test_changed_only_dispatch(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    _install_listener_base(monkeypatch, WiCanCoordinator)
+
+    status = {"device_id": "dev1", "ecu_status": "online", "batt_voltage": "12.5V"}
+    pid = {
+        "A": {"class": "none", "unit": "none", "value": 1},
+        "B": {"class": "none", "unit": "none", "value": 2},
+    }
+    api = FakeAPI(status, pid)
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    calls = []
+    for context in [("pid", "A"), ("pid", "B"), ("status", "batt_voltage"), coordinator_mod.CONTEXT_ANY_STATUS, None]:
+        coordinator.async_add_listener(lambda c=context: calls.append(c), context)
+
+    async def refresh():
+        coordinator.data = await coordinator._async_update_data()
+        coordinator.async_update_listeners()
+
+    # First update notifies everyone
+    await refresh()
+    assert len(calls) == 5
+
+    # Nothing changed: only the untargeted listener runs
+    calls.clear()
+    await refresh()
+    assert calls == [None]
+
+    # One PID changed
+    calls.clear()
+    api._pid = {**pid, "B": {"class": "none", "unit": "none", "value": 3}}
+    await refresh()
+    assert sorted(calls, key=str) == sorted([None, ("pid", "B")], key=str)
+
+    # Status change wakes the key and the attribute listeners
+    calls.clear()
+    api._status = {**status, "batt_voltage": "12.6V"}
+    await refresh()
+    assert set(calls) == {None, ("status", "batt_voltage"), coordinator_mod.CONTEXT_ANY_STATUS}
+
+    # Going stale notifies everyone once
+    calls.clear()
+    api._status = False
+    await refresh()
+    assert len(calls) == 5
+    calls.clear()
+    await refresh()
+    assert calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_poll_metrics_for_diagnostic_sensors(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    entry = DummyEntry()
+    entry.options = {"failure_threshold": 10, "diagnostic_sensors": True}
+    pid = {
+        "A": {"class": "none", "unit": "none", "value": 1},
+        "B": {"class": "none", "unit": "none", "value": None},
+    }
+    api = FakeAPI({"device_id": "dev1", "ecu_status": "online"}, pid)
+    coordinator = WiCanCoordinator(hass, entry, api)
+    assert coordinator.diagnostic_sensors is True
+    assert coordinator.get_metric("poll_duration") is None
+    assert coordinator.get_metric("data_age") is None
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.get_metric("poll_duration") >= 0
+    assert coordinator.get_metric("poll_duration_p95") >= 0
+    assert coordinator.get_metric("pids_per_poll") == 1
+    assert coordinator.get_metric("data_age") == 0
+
+    api._status = False
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+    assert coordinator.get_metric("consecutive_failures") == 2
+    assert coordinator.metrics.timing("poll").count == 3
+
+
+@pytest.mark.asyncio
+async def test_entity_plan_shared_and_rebuilt_on_config_change(hass, monkeypatch, caplog):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    pid = {
+        "SPEED": {"class": "speed", "unit": "km/h", "value": 10},
+        "DOOR": {"class": "door", "sensor_type": "binary_sensor", "value": "on"},
+        "RAW": {"value": 3},
+    }
+    api = FakeAPI({"device_id": "dev1", "ecu_status": "online"}, pid)
+    api.car_config_fingerprint = "abc"
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    coordinator.data = await coordinator.get_data()
+
+    plan = coordinator.entity_plan()
+    assert coordinator.entity_plan() is plan
+    speed, raw = plan.pids["sensor"]
+    assert (speed.key, speed.device_class, speed.unit) == ("SPEED", "speed", "km/h")
+    assert (raw.key, raw.device_class, raw.unit) == ("RAW", None, None)
+    assert [(d.key, d.device_class) for d in plan.pids["binary_sensor"]] == [("DOOR", "door")]
+
+    # New fingerprint with the same entities: plan replaced silently
+    api.car_config_fingerprint = "def"
+    coordinator.data = await coordinator.get_data()
+    assert coordinator.entity_plan() is not plan
+    assert "car configuration changed" not in caplog.text
+    # Descriptions of identical PIDs are shared, not rebuilt
+    assert coordinator.entity_plan().pids["sensor"][0] is speed
+
+    api._pid = {**pid, "RPM": {"class": "none", "unit": "rpm", "value": 800}}
+    api.car_config_fingerprint = "ghi"
+    coordinator.data = await coordinator.get_data()
+    assert "car configuration changed" in caplog.text
+    assert [d.key for d in coordinator.entity_plan().pids["sensor"]] == ["SPEED", "RAW", "RPM"]
+
+
+@pytest.mark.asyncio
+async def test_cycle_view_shared_until_next_update(hass, monkeypatch):
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+    _install_listener_base(monkeypatch, WiCanCoordinator)
+
+    status = {
+        "device_id": "dev1",
+        "ecu_status": "online",
+        "hw_version": "1",
+        "sta_ip": "1.2.3.4",
+        "fw_version": "2",
+        "sleep_volt": "12.0",
+    }
+    api = FakeAPI(status, {})
+    coordinator = WiCanCoordinator(hass, DummyEntry(), api)
+    views = []
+    coordinator.async_add_listener(lambda: views.append(coordinator.cycle_view()))
+
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.async_update_listeners()
+    view = views[-1]
+    assert coordinator.cycle_view() is view
+    assert coordinator.device_info() is coordinator.device_info()
+    assert coordinator.device_info()["configuration_url"] == "http://1.2.3.4"
+    assert view.freshness["wican_data_stale"] is False
+    attributes = (("voltage", "sleep_volt"),)
+    assert view.status_attributes(attributes) is view.status_attributes(attributes)
+    assert view.status_attributes(attributes)["voltage"] == "12.0"
+    assert view.status_attributes(None) is view.freshness
+
+    api._status = False
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.async_update_listeners()
+    assert views[-1] is not view
+    assert views[-1].freshness["wican_data_stale"] is True
+
+
+@pytest.mark.asyncio
+async def test_pid_history_attributes(hass, monkeypatch):
+    pytest.importorskip("numpy")
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    entry = DummyEntry()
+    entry.options = {"history_samples": 10}
+    api = FakeAPI({"device_id": "dev1", "ecu_status": "online"}, {"SOC": {"class": "none", "unit": "%", "value": 50}})
+    coordinator = WiCanCoordinator(hass, entry, api)
+    assert coordinator.history is not None
+
+    coordinator.data = await coordinator.get_data()
+    api._pid = {"SOC": {"class": "none", "unit": "%", "value": 48}}
+    coordinator.data = await coordinator.get_data()
+    slot = coordinator.pid_table().slot("SOC")
+    attrs = coordinator.get_pid_history(slot)
+    assert (attrs["history_min"], attrs["history_max"], attrs["history_samples"]) == (48, 50, 2)
+
+    # Unchanged values still get their history attributes rewritten
+    _install_listener_base(monkeypatch, WiCanCoordinator)
+    calls = []
+    coordinator.async_add_listener(lambda: calls.append("SOC"), ("pid", "SOC"))
+    for _ in range(2):
+        coordinator.data = await coordinator._async_update_data()
+        coordinator.async_update_listeners()
+    assert calls == ["SOC", "SOC"]
+    assert coordinator.get_pid_history(slot)["history_samples"] == 4
+
+    # Disabled by default
+    assert WiCanCoordinator(hass, DummyEntry(), api).history is None
+
+
+@pytest.mark.asyncio
+async def test_pid_history_survives_failed_fetch_and_samples_pushed_pids_only(monkeypatch):
+    pytest.importorskip("numpy")
+    coordinator_mod = load_coordinator_module()
+    monkeypatch.setattr(coordinator_mod, "SnapshotStore", FakeStore, raising=True)
+    WiCanCoordinator = getattr(coordinator_mod, "WiCanCoordinator")
+
+    hass = TaskHass()
+    entry = DummyEntry()
+    entry.options = {"history_samples": 10}
+    meta = {"class": "none", "unit": "none"}
+    api = SlowAPI(
+        {"device_id": "dev1", "ecu_status": "online"},
+        {"SOC": {**meta, "value": 50}, "SPEED": {**meta, "value": 10}},
+    )
+    coordinator = WiCanCoordinator(hass, entry, api)
+    coordinator.hass = hass
+    coordinator.data = await coordinator.get_data()
+
+    # Status succeeds but the PID request fails: no sample, history kept
+    async def failing_fetch():
+        return False
+
+    api.fetch_pid_values = failing_fetch
+    coordinator.data = await coordinator.get_data()
+    assert coordinator.history.count == 1
+    del api.fetch_pid_values
+
+    api._pid = {"SOC": {**meta, "value": 48}, "SPEED": {**meta, "value": 10}}
+    coordinator.data = await coordinator.get_data()
+    table = coordinator.pid_table()
+    assert coordinator.get_pid_history(table.slot("SOC"))["history_samples"] == 2
+
+    # A push samples the pushed PIDs only
+    coordinator.async_push_pid_values({"SOC": 46})
+    for task in hass.tasks:
+        await task
+    assert coordinator.history.count == 3
+    assert coordinator.get_pid_history(table.slot("SOC"))["history_samples"] == 3
+    assert coordinator.get_pid_history(table.slot("SPEED"))["history_samples"] == 2
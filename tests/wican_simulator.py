@@ -0,0 +1,252 @@
+"""Local fake WiCAN device for load-testing polling, timeouts and backoff.
+
+Serves ``/check_status``, ``/autopid_data`` and ``/load_car_config`` like the
+device firmware, with a configurable profile size, per-endpoint latency and
+jitter, dropped connections, slow bodies and sleep/wake transitions.
+
+Used by the ``wican_simulator`` fixture in ``tests/conftest.py`` and runnable
+on its own, e.g.:
+
+    python tests/wican_simulator.py --pids 500 --latency 0.2 --jitter 0.1 --drop-rate 0.05
+
+and then pointing the integration at the printed host:port.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+ENDPOINTS = ("/check_status", "/autopid_data", "/load_car_config")
+
+
+def synthetic_car_config(size: int) -> dict:
+    """Return a car configuration with ``size`` PIDs, every tenth one a binary sensor."""
+    config = {}
+    for i in range(size):
+        if i % 10 == 9:
+            config[f"PID_{i}"] = {"class": "none", "unit": "none", "sensor_type": "binary_sensor"}
+        else:
+            config[f"PID_{i}"] = {"class": "none", "unit": "%", "sensor_type": "sensor"}
+    return config
+
+
+class WiCanSimulator:
+    """Fake WiCAN HTTP API.
+
+    Attributes
+    ----------
+    latency : dict
+        Base response delay in seconds per endpoint.
+    jitter : float
+        Maximum random delay in seconds added on top of the latency.
+    drop_rate : float
+        Probability that a request has its connection dropped without a response.
+    slow_body : float
+        Seconds spent trickling each response body to the client.
+    awake : bool
+        False while the device sleeps; every connection is dropped.
+    ecu_online : bool
+        ECU status reported by ``/check_status``; ``/autopid_data`` is empty while offline.
+    requests : dict
+        Number of requests received per endpoint.
+
+    """
+
+    def __init__(
+        self,
+        profile_size: int = 10,
+        latency: float | dict = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        slow_body: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the simulator; nothing is served before ``start``."""
+        self.car_config = synthetic_car_config(profile_size)
+        if isinstance(latency, dict):
+            self.latency = {endpoint: latency.get(endpoint, 0.0) for endpoint in ENDPOINTS}
+        else:
+            self.latency = dict.fromkeys(ENDPOINTS, latency)
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.slow_body = slow_body
+        self.awake = True
+        self.ecu_online = True
+        self.requests = dict.fromkeys(ENDPOINTS, 0)
+        self.host = ""
+        self._drop_next = 0
+        self._cycle = 0
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._transitions: asyncio.Task | None = None
+
+    def sleep(self) -> None:
+        """Put the device to sleep: it stops answering."""
+        self.awake = False
+
+    def wake(self) -> None:
+        """Wake the device up again."""
+        self.awake = True
+
+    def drop_next(self, count: int = 1) -> None:
+        """Drop the connection of the next ``count`` requests.
+
+        aiohttp retries an idempotent request once after a disconnect, so a
+        client call only fails when two consecutive requests are dropped.
+        """
+        self._drop_next += count
+
+    def status(self) -> dict:
+        """Return the ``/check_status`` payload."""
+        return {
+            "device_id": "simulator01",
+            "ecu_status": "online" if self.ecu_online else "offline",
+            "hw_version": "WiCAN-OBD-SIM",
+            "fw_version": "4.0",
+            "git_version": "simulator",
+            "sta_ip": self.host.split(":")[0],
+            "batt_voltage": "12.6V",
+            "protocol": "auto_pid",
+            "ble_status": "disable",
+            "sleep_status": "enable",
+            "sleep_volt": "13.1",
+            "batt_alert": "disable",
+            "batt_alert_ssid": "",
+            "batt_alert_volt": "11.0",
+            "batt_alert_url": "",
+            "batt_alert_port": "1883",
+            "batt_mqtt_user": "",
+            "mqtt_en": "disable",
+            "mqtt_url": "",
+            "mqtt_port": "1883",
+            "mqtt_user": "",
+        }
+
+    def autopid_data(self) -> dict:
+        """Return the ``/autopid_data`` payload; a tenth of the values change per poll."""
+        if not self.ecu_online:
+            return {}
+        self._cycle += 1
+        changed = self._cycle % 10
+        data = {}
+        for i, (key, meta) in enumerate(self.car_config.items()):
+            if meta["sensor_type"] == "binary_sensor":
+                data[key] = (i + self._cycle) % 2
+            else:
+                data[key] = i + (self._cycle if i % 10 == changed else 0)
+        return data
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        endpoint = request.path
+        self.requests[endpoint] += 1
+
+        delay = self.latency[endpoint]
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if not self.awake or self._drop_next or self._random.random() < self.drop_rate:
+            self._drop_next = max(self._drop_next - 1, 0)
+            request.transport.close()
+            return web.Response(status=500)
+
+        if endpoint == "/check_status":
+            payload = self.status()
+        elif endpoint == "/autopid_data":
+            payload = self.autopid_data()
+        else:
+            payload = self.car_config
+        body = json.dumps(payload).encode()
+
+        if not self.slow_body:
+            return web.Response(body=body, content_type="application/json")
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunks = 10
+        step = max(len(body) // chunks, 1)
+        for start in range(0, len(body), step):
+            await response.write(body[start : start + step])
+            await asyncio.sleep(self.slow_body / chunks)
+        await response.write_eof()
+        return response
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the ``host:port`` to configure as the device address."""
+        app = web.Application()
+        for endpoint in ENDPOINTS:
+            app.router.add_get(endpoint, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.host = f"{host}:{bound_port}"
+        return self.host
+
+    def cycle_sleep(self, awake_for: float, asleep_for: float) -> None:
+        """Keep alternating between awake and asleep in the background."""
+
+        async def transitions():
+            while True:
+                await asyncio.sleep(awake_for)
+                self.sleep()
+                await asyncio.sleep(asleep_for)
+                self.wake()
+
+        self._transitions = asyncio.ensure_future(transitions())
+
+    async def stop(self) -> None:
+        """Stop serving and cancel background sleep/wake transitions."""
+        if self._transitions is not None:
+            self._transitions.cancel()
+            self._transitions = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = WiCanSimulator(
+        profile_size=args.pids,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        slow_body=args.slow_body,
+        seed=args.seed,
+    )
+    host = await simulator.start(args.host, args.port)
+    if args.awake_for and args.asleep_for:
+        simulator.cycle_sleep(args.awake_for, args.asleep_for)
+    print(f"Fake WiCAN with {args.pids} PIDs listening on {host}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake WiCAN device.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pids", type=int, default=50, help="number of PIDs in the car profile")
+    parser.add_argument("--latency", type=float, default=0.0, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay in seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of dropping a connection")
+    parser.add_argument("--slow-body", type=float, default=0.0, help="seconds spent sending each body")
+    parser.add_argument("--awake-for", type=float, default=0.0, help="seconds awake per sleep cycle")
+    parser.add_argument("--asleep-for", type=float, default=0.0, help="seconds asleep per sleep cycle")
+    parser.add_argument("--seed", type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()